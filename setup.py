@@ -27,7 +27,11 @@ REQUIRED = [
 
 # What packages are optional?
 EXTRAS = {
-    'tests': ['pytest']
+    'tests': ['pytest'],
+    'async': ['httpx'],
+    'numpy': ['numpy'],
+    'brotli': ['brotli'],
+    'stream': ['ijson']
 }
 
 # The rest you shouldn't have to touch too much :)
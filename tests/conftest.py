@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 import os
 import uuid
@@ -39,3 +40,20 @@ def fake_client():
         client = TickTickClient(user, passw, oauth)
 
     yield client
+
+
+@pytest.fixture
+def run_async():
+    """
+    Runs a coroutine in a new event loop like asyncio.run, which needs Python 3.7
+    """
+    def run(coroutine):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    return run
@@ -12,6 +12,7 @@ from ticktick.managers.habits import HabitManager
 from ticktick.managers.pomo import PomoManager
 from ticktick.managers.settings import SettingsManager
 from ticktick.managers.tags import TagsManager
+from ticktick.api import TickTickClient
 from ticktick.oauth2 import OAuth2
 from unittest.mock import patch
 
@@ -182,6 +183,226 @@ class TestSync:
         fake_client.inbox_id = ''
         fake_client.reset_local_state()
 
+    def test_sync_uses_checkpoint(self, fake_client):
+        """
+        Tests the checkpoint of the previous sync is sent with the next one
+        """
+        full = {
+            'checkPoint': 1234,
+            'inboxId': 'inbox1',
+            'projectGroups': [],
+            'projectProfiles': [],
+            'syncTaskBean': {'update': []},
+            'tags': []
+        }
+        with patch('ticktick.api.TickTickClient.http_get', return_value=full) as mock_get:
+            fake_client.sync()
+            assert mock_get.call_args[0][0].endswith('batch/check/0')
+            fake_client.sync()
+            assert mock_get.call_args[0][0].endswith('batch/check/1234')
+            fake_client.sync(full=True)
+            assert mock_get.call_args[0][0].endswith('batch/check/0')
+
+        fake_client.inbox_id = ''
+        fake_client.reset_local_state()
+
+    def test_sync_merges_delta(self, fake_client):
+        """
+        Tests a delta sync updates, adds and removes objects in place
+        """
+        kept = {'id': 'kept', 'projectId': 'p1', 'status': 0, 'etag': 'a'}
+        changed = {'id': 'changed', 'projectId': 'p1', 'status': 0, 'title': 'Old', 'etag': 'b'}
+        deleted = {'id': 'deleted', 'projectId': 'p1', 'status': 0, 'etag': 'c'}
+        completed = {'id': 'completed', 'projectId': 'p1', 'status': 0, 'etag': 'd'}
+        full = {
+            'checkPoint': 1,
+            'inboxId': 'inbox1',
+            'projectGroups': [],
+            'projectProfiles': [{'id': 'p1', 'name': 'Old Project'}],
+            'syncTaskBean': {'update': [kept, changed, deleted, completed]},
+            'tags': [{'name': 'tag', 'color': '#000000'}]
+        }
+        delta = {
+            'checkPoint': 2,
+            'projectGroups': None,
+            'projectProfiles': [{'id': 'p1', 'name': 'New Project'}, {'id': 'p2', 'name': 'Added'}],
+            'syncTaskBean': {'update': [{'id': 'changed', 'projectId': 'p1', 'status': 0, 'title': 'New',
+                                         'etag': 'e'},
+                                        {'id': 'completed', 'projectId': 'p1', 'status': 2, 'etag': 'f'},
+                                        {'id': 'added', 'projectId': 'p2', 'status': 0, 'etag': 'g'}],
+                             'delete': [{'taskId': 'deleted', 'projectId': 'p1'}]},
+            'tags': [{'name': 'tag', 'color': '#ffffff'}]
+        }
+        with patch('ticktick.api.TickTickClient.http_get', return_value=full):
+            fake_client.sync()
+        tasks = fake_client.state['tasks']
+        with patch('ticktick.api.TickTickClient.http_get', return_value=delta):
+            fake_client.sync()
+
+        assert fake_client.state['tasks'] is tasks
+        assert [task['id'] for task in tasks] == ['kept', 'changed', 'added']
+        assert changed['title'] == 'New'
+        assert fake_client.get_by_etag('e', search='tasks') is changed
+        assert not fake_client.get_by_etag('b', search='tasks')
+        assert not fake_client.get_by_id('deleted', search='tasks')
+        assert not fake_client.get_by_id('completed', search='tasks')
+        assert fake_client.get_by_id('p1', search='projects')['name'] == 'New Project'
+        assert fake_client.get_by_id('p2', search='projects')
+        assert len(fake_client.state['tags']) == 1
+        assert fake_client.state['tags'][0]['color'] == '#ffffff'
+        assert fake_client.inbox_id == 'inbox1'
+
+        fake_client.inbox_id = ''
+        fake_client.reset_local_state()
+
+
+class TestBatch:
+
+    def test_batch_defers_sync(self, fake_client):
+        """
+        Tests syncs inside a batch block are sent once when the block exits
+        """
+        response = {
+            'inboxId': 'inbox1',
+            'projectGroups': [],
+            'projectProfiles': [],
+            'syncTaskBean': {'update': []},
+            'tags': []
+        }
+        with patch('ticktick.api.TickTickClient.http_get', return_value=response) as mock_get:
+            with fake_client.batch():
+                fake_client.sync()
+                with fake_client.batch():
+                    fake_client.sync()
+                assert mock_get.call_count == 0
+            assert mock_get.call_count == 1
+
+        fake_client.inbox_id = ''
+        fake_client.reset_local_state()
+
+    def test_batch_without_sync(self, fake_client):
+        """
+        Tests nothing is sent if nothing inside the block asked for a sync
+        """
+        with patch('ticktick.api.TickTickClient.http_get') as mock_get:
+            with fake_client.batch():
+                pass
+            assert mock_get.call_count == 0
+
+    def test_batch_syncs_on_error(self, fake_client):
+        """
+        Tests the held back sync is still sent when the block raises
+        """
+        with patch('ticktick.api.TickTickClient.http_get', return_value={'checkPoint': 5}) as mock_get:
+            with pytest.raises(ValueError):
+                with fake_client.batch():
+                    fake_client._checkpoint = 4
+                    fake_client.sync()
+                    raise ValueError
+            assert mock_get.call_count == 1
+            assert mock_get.call_args[0][0].endswith('batch/check/4')
+
+        fake_client.reset_local_state()
+
+
+class TestSnapshot:
+
+    @staticmethod
+    def full_sync():
+        return {'checkPoint': 7, 'inboxId': 'inbox', 'projectGroups': [], 'projectProfiles': [],
+                'tags': [], 'syncTaskBean': {'update': [{'id': 't1', 'projectId': 'inbox', 'status': 0}]}}
+
+    def test_warm_start_from_snapshot(self, fake_client, tmp_path):
+        """
+        Tests a client started from a snapshot skips the login and only sends a delta sync
+        """
+        path = str(tmp_path / 'snapshot.json')
+        settings = {'timeZone': 'US/Pacific', 'id': 'profile'}
+        with patch('ticktick.api.TickTickClient.http_post', return_value={'token': 'token'}) as mock_post, \
+                patch('ticktick.api.TickTickClient.http_get', side_effect=[settings, self.full_sync()]):
+            cold = TickTickClient('user', 'pass', fake_client.oauth_manager, snapshot_path=path)
+        assert mock_post.call_count == 1
+
+        delta = {'checkPoint': 8, 'syncTaskBean': {'update': [{'id': 't2', 'projectId': 'inbox', 'status': 0}]}}
+        with patch('ticktick.api.TickTickClient.http_post') as mock_post, \
+                patch('ticktick.api.TickTickClient.http_get', return_value=delta) as mock_get:
+            warm = TickTickClient('user', 'pass', fake_client.oauth_manager, snapshot_path=path)
+        assert not mock_post.called
+        assert mock_get.call_count == 1
+        assert mock_get.call_args[0][0].endswith('batch/check/7')
+        assert warm.cookies == cold.cookies
+        assert (warm.inbox_id, warm.time_zone, warm.profile_id) == ('inbox', 'US/Pacific', 'profile')
+        assert warm.get_by_id('t1', search='tasks')
+        assert warm.get_by_id('t2', search='tasks')
+        assert warm._checkpoint == 8
+
+    def test_snapshot_of_other_account_ignored(self, fake_client, tmp_path):
+        """
+        Tests a snapshot saved for another username is not used
+        """
+        path = str(tmp_path / 'snapshot.json')
+        settings = {'timeZone': 'US/Pacific', 'id': 'profile'}
+        for username in ('first', 'second'):
+            with patch('ticktick.api.TickTickClient.http_post', return_value={'token': 'token'}) as mock_post, \
+                    patch('ticktick.api.TickTickClient.http_get', side_effect=[settings, self.full_sync()]):
+                TickTickClient(username, 'pass', fake_client.oauth_manager, snapshot_path=path)
+            assert mock_post.call_count == 1
+
+    def test_expired_snapshot_session_logs_in(self, fake_client, tmp_path):
+        """
+        Tests the client logs in again when the saved session is rejected
+        """
+        path = str(tmp_path / 'snapshot.json')
+        settings = {'timeZone': 'US/Pacific', 'id': 'profile'}
+        with patch('ticktick.api.TickTickClient.http_post', return_value={'token': 'old'}), \
+                patch('ticktick.api.TickTickClient.http_get', side_effect=[settings, self.full_sync()]):
+            TickTickClient('user', 'pass', fake_client.oauth_manager, snapshot_path=path)
+
+        with patch('ticktick.api.TickTickClient.http_post', return_value={'token': 'new'}), \
+                patch('ticktick.api.TickTickClient.http_get', side_effect=[RuntimeError, {'checkPoint': 9}]):
+            warm = TickTickClient('user', 'pass', fake_client.oauth_manager, snapshot_path=path)
+        assert warm.access_token == 'new'
+        assert warm._checkpoint == 9
+        assert warm.get_by_id('t1', search='tasks')
+
+    def test_save_snapshot_requires_path(self, fake_client):
+        """
+        Tests saving without a snapshot path raises RuntimeError
+        """
+        with pytest.raises(RuntimeError):
+            fake_client.save_snapshot()
+
+
+class TestDeleteAllFromLocalState:
+
+    def test_delete_all_from_local_state(self, fake_client):
+        """
+        Tests all objects matching one of the values are deleted in place
+        """
+        project_id = str(uuid.uuid4())
+        other = {'id': str(uuid.uuid4()), 'projectId': str(uuid.uuid4())}
+        first = {'id': str(uuid.uuid4()), 'projectId': project_id}
+        second = {'id': str(uuid.uuid4()), 'projectId': project_id}
+        tasks = fake_client.state['tasks']
+        tasks.extend([first, other, second])
+        assert fake_client.get_by_id(first['id'], search='tasks')
+
+        deleted = fake_client.delete_all_from_local_state('tasks', 'projectId', [project_id])
+
+        assert deleted == [first, second]
+        assert fake_client.state['tasks'] is tasks
+        assert not fake_client.get_by_id(first['id'], search='tasks')
+        assert not fake_client.get_by_id(second['id'], search='tasks')
+        assert fake_client.get_by_id(other['id'], search='tasks') is other
+        fake_client.delete_from_local_state(id=other['id'], search='tasks')
+
+    def test_delete_all_from_local_state_search_key_wrong(self, fake_client):
+        """
+        Tests raises an exception when search key doesn't exist
+        """
+        with pytest.raises(KeyError):
+            fake_client.delete_all_from_local_state(str(uuid.uuid4()), 'id', [])
+
 
 class TestParseMethods:
 
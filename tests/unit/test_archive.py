@@ -0,0 +1,75 @@
+"""
+Module for testing archive.py
+"""
+
+import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ticktick.archive import CompletedArchive
+
+
+def completed(task_id, when, project='p1'):
+    return {'id': task_id, 'projectId': project, 'completedTime': when.strftime('%Y-%m-%dT%H:%M:%S.000+0000')}
+
+
+@pytest.fixture
+def archive(fake_client, tmp_path):
+    with CompletedArchive(fake_client, str(tmp_path / 'completed.db')) as opened:
+        yield opened
+
+
+class TestCompletedArchive:
+
+    def test_second_request_reads_from_disk(self, archive):
+        """
+        Tests a range that was already downloaded is answered without any requests
+        """
+        day = datetime.datetime(2020, 12, 14, 12)
+        tasks = [completed('a', day), completed('b', day + datetime.timedelta(hours=1), project='p2')]
+        with patch('ticktick.api.TickTickClient.http_get', return_value=tasks) as mock_get:
+            first = archive.get_completed(datetime.datetime(2020, 12, 14), tz='UTC')
+            second = archive.get_completed(datetime.datetime(2020, 12, 14), tz='UTC')
+            only_p1 = archive.get_completed(datetime.datetime(2020, 12, 14), tz='UTC', project='p1')
+        assert mock_get.call_count == 1
+        assert [task['id'] for task in first] == ['b', 'a']
+        assert second == first
+        assert only_p1 == [tasks[0]]
+
+    def test_only_missing_ranges_are_fetched(self, archive):
+        """
+        Tests extending a downloaded range only asks for the new part
+        """
+        with patch('ticktick.api.TickTickClient.http_get', return_value=[]) as mock_get:
+            archive.get_completed(datetime.datetime(2020, 12, 10), datetime.datetime(2020, 12, 12), tz='UTC')
+            archive.get_completed(datetime.datetime(2020, 12, 8), datetime.datetime(2020, 12, 14), tz='UTC')
+        requested = [(call[1]['params']['from'], call[1]['params']['to']) for call in mock_get.call_args_list]
+        assert requested == [('2020-12-10 00:00:00', '2020-12-12 23:59:59'),
+                             ('2020-12-08 00:00:00', '2020-12-09 23:59:59'),
+                             ('2020-12-13 00:00:00', '2020-12-14 23:59:59')]
+        assert archive.missing(datetime.datetime(2020, 12, 8), datetime.datetime(2020, 12, 14, 23, 59, 59)) == []
+
+    def test_future_is_not_covered(self, archive):
+        """
+        Tests the part of a range after the download time is fetched again next time
+        """
+        start = datetime.datetime.now() - datetime.timedelta(days=1)
+        end = datetime.datetime.now() + datetime.timedelta(days=1)
+        with patch('ticktick.api.TickTickClient.http_get', return_value=[]) as mock_get:
+            archive.get_completed(start, end, tz='UTC')
+            archive.get_completed(start, end, tz='UTC')
+        assert mock_get.call_count == 2
+
+    def test_async_client_rejected(self, tmp_path):
+        """
+        Tests an async client raises TypeError instead of handing back unawaited coroutines
+        """
+        pytest.importorskip('httpx')
+        from ticktick.managers.async_tasks import AsyncTaskManager
+
+        client = Mock()
+        client.task = AsyncTaskManager.__new__(AsyncTaskManager)
+        with CompletedArchive(client, str(tmp_path / 'completed.db')) as archive:
+            with pytest.raises(TypeError):
+                archive.get_completed(datetime.datetime(2020, 12, 14), tz='UTC')
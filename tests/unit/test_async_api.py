@@ -0,0 +1,284 @@
+"""
+Module for testing async_api.py
+"""
+
+import asyncio
+import datetime
+import gzip
+import json
+import uuid
+import warnings
+from unittest.mock import patch
+
+import pytest
+
+httpx = pytest.importorskip('httpx')
+
+from ticktick.async_api import AsyncTickTickClient
+from ticktick.oauth2 import OAuth2
+from ticktick.retry import RetryPolicy
+
+
+class FakeTickTick:
+    """
+    Minimal stand in for the TickTick endpoints the async client talks to.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.checkpoint = 0
+        self.completed = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        await asyncio.sleep(0)  # Let other coroutines run like a real round trip would
+        path = request.url.path
+        if path.endswith('user/signin'):
+            return httpx.Response(200, json={'token': 'token'})
+        if path.endswith('user/preferences/settings'):
+            return httpx.Response(200, json={'timeZone': 'US/Pacific', 'id': 'profile'})
+        if '/batch/check/' in path:
+            self.checkpoint += 1
+            return httpx.Response(200, json={'checkPoint': self.checkpoint, 'inboxId': 'inbox',
+                                             'projectProfiles': [], 'projectGroups': [], 'tags': [],
+                                             'syncTaskBean': {'update': [], 'delete': []}})
+        if path.endswith('batch/task') or path.endswith('batch/projectGroup'):
+            return httpx.Response(200, json={'id2etag': {}, 'id2error': {}})
+        if path.endswith('tag/merge'):
+            return httpx.Response(200)
+        if path.endswith('project/all/completed'):
+            return httpx.Response(200, json=self.completed_page(request.url.params))
+        return httpx.Response(404)
+
+    def completed_page(self, params) -> list:
+        # '2020-12-14T10:00:00.000+0000' -> '2020-12-14 10:00:00' compares like the from and to parameters
+        tasks = [task for task in self.completed
+                 if params['from'] <= task['completedTime'][:19].replace('T', ' ') <= params['to']]
+        tasks.sort(key=lambda task: task['completedTime'], reverse=True)
+        return tasks[:int(params['limit'])]
+
+    def paths(self, fragment: str) -> list:
+        return [request for request in self.requests if fragment in request.url.path]
+
+
+def make_client(server: FakeTickTick, username=None, password=None) -> AsyncTickTickClient:
+    with patch('ticktick.oauth2.OAuth2.get_access_token'):
+        oauth = OAuth2(client_id=str(uuid.uuid4()), client_secret=str(uuid.uuid4()), redirect_uri=str(uuid.uuid4()))
+    oauth.access_token_info = {'access_token': 'fake'}
+    return AsyncTickTickClient(username if username is not None else str(uuid.uuid4()),
+                               password if password is not None else str(uuid.uuid4()),
+                               oauth, transport=httpx.MockTransport(server))
+
+
+def test_open_prepares_session(run_async):
+    """
+    Tests entering the client logs in, loads the settings and syncs the state
+    """
+    server = FakeTickTick()
+
+    async def run():
+        async with make_client(server) as client:
+            return client
+
+    client = run_async(run())
+    assert client.access_token == 'token'
+    assert client.time_zone == 'US/Pacific'
+    assert client.inbox_id == 'inbox'
+    assert client._checkpoint == 1
+    assert server.paths('/batch/check/')[0].headers['Cookie'] == 't=token'
+
+
+def test_concurrent_syncs_coalesce(run_async):
+    """
+    Tests syncs requested while another sync is running share one request
+    """
+    server = FakeTickTick()
+
+    async def run():
+        async with make_client(server) as client:
+            await asyncio.gather(*(client.sync() for _ in range(5)))
+            return client
+
+    client = run_async(run())
+    # One sync from open(), then one for the first call and one covering the rest
+    assert len(server.paths('/batch/check/')) == 3
+    assert server.paths('/batch/check/')[-1].url.path.endswith('/batch/check/2')
+    assert client._checkpoint == 3
+
+
+def test_batch_defers_sync(run_async):
+    """
+    Tests syncs inside batch() are held back until it exits
+    """
+    server = FakeTickTick()
+
+    async def run():
+        async with make_client(server) as client:
+            async with client.batch():
+                for _ in range(3):
+                    await client.sync()
+                assert len(server.paths('/batch/check/')) == 1
+
+    run_async(run())
+    assert len(server.paths('/batch/check/')) == 2
+
+
+def test_delete_updates_state_without_sync(run_async):
+    """
+    Tests deleting in chunks removes the tasks from the state without syncing
+    """
+    server = FakeTickTick()
+    tasks = [{'id': str(uuid.uuid4()), 'projectId': 'inbox'} for _ in range(5)]
+
+    async def run():
+        async with make_client(server) as client:
+            client._upsert_into_local_state('tasks', 'id', tasks)
+            results = await client.task.bulk_delete(tasks, chunk_size=2, workers=2)
+            return client, results
+
+    client, results = run_async(run())
+    assert [result['ids'] for result in results] == [[tasks[0]['id'], tasks[1]['id']],
+                                                    [tasks[2]['id'], tasks[3]['id']], [tasks[4]['id']]]
+    assert len(server.paths('batch/task')) == 3
+    assert len(server.paths('/batch/check/')) == 1
+    assert client.state['tasks'] == []
+
+
+def test_merge_and_folder_delete_update_state(run_async):
+    """
+    Tests merged tags and deleted folders leave the state, since the delta sync after them doesn't report them
+    """
+    server = FakeTickTick()
+    tags = [{'name': name, 'label': name.title()} for name in ('work', 'school')]
+    folders = [{'id': 'g1', 'name': 'Work'}, {'id': 'g2', 'name': 'Home'}]
+
+    async def run():
+        async with make_client(server) as client:
+            client._upsert_into_local_state('tags', 'name', tags)
+            client._upsert_into_local_state('project_folders', 'id', folders)
+            await client.tag.merge('School', 'Work')
+            deleted = await client.project.delete_folder('g1')
+            return client, deleted
+
+    client, deleted = run_async(run())
+    assert [tag['name'] for tag in client.state['tags']] == ['work']
+    assert deleted == folders[0]
+    assert client.state['project_folders'] == [folders[1]]
+
+
+def test_failed_request_raises(run_async):
+    """
+    Tests a non 200 response raises RuntimeError
+    """
+    server = FakeTickTick()
+
+    async def run():
+        async with make_client(server) as client:
+            await client.http_get(client.BASE_URL + 'missing')
+
+    with pytest.raises(RuntimeError):
+        run_async(run())
+
+
+def test_oauth_mode_without_credentials(run_async):
+    """
+    Tests the client does not log in without a username and password
+    """
+    server = FakeTickTick()
+    client = make_client(server, username='', password='')
+
+    async def run():
+        async with client:
+            pass
+
+    run_async(run())
+    assert client.OAuth_Mode
+    assert not server.requests
+
+
+def test_requires_httpx():
+    """
+    Tests a helpful ImportError is raised when httpx is missing
+    """
+    with patch('ticktick.async_api.httpx', None):
+        with pytest.raises(ImportError):
+            make_client(FakeTickTick())
+
+
+def test_completed_pages(run_async):
+    """
+    Tests completed tasks are paged with awaited requests, lazily and with several windows at a time
+    """
+    server = FakeTickTick()
+    server.completed = [{'id': str(number), 'completedTime': f'2020-12-{1 + number // 30:02d}T10:00:00.000+0000'}
+                        for number in range(250)]
+    start = datetime.datetime(2020, 12, 1)
+    end = datetime.datetime(2020, 12, 31)
+
+    async def run():
+        async with make_client(server) as client:
+            client.task.COMPLETED_PAGE_SIZE = 40
+            first = []
+            async for task in client.task.iter_completed(start, end, tz='UTC'):
+                first.append(task['id'])
+                if len(first) == 10:
+                    break
+            pages = len(server.paths('project/all/completed'))
+            windowed = await client.task.get_completed(start, end, tz='UTC', window=datetime.timedelta(days=3),
+                                                       workers=3)
+            return first, pages, windowed
+
+    first, pages, windowed = run_async(run())
+    assert pages == 1
+    assert len(first) == 10
+    assert sorted(task['id'] for task in windowed) == sorted(task['id'] for task in server.completed)
+    times = [task['completedTime'] for task in windowed]
+    assert times == sorted(times, reverse=True)
+
+
+def test_retried_request_reported_once(run_async):
+    """
+    Tests a request retried once reaches the hooks as one event counting the retry
+    """
+    server = FakeTickTick()
+    statuses = [502, 200]
+
+    async def flaky(request):
+        if request.url.path.endswith('user/status'):
+            return httpx.Response(statuses.pop(0), json={})
+        return await server(request)
+
+    with patch('ticktick.oauth2.OAuth2.get_access_token'):
+        oauth = OAuth2(client_id=str(uuid.uuid4()), client_secret=str(uuid.uuid4()), redirect_uri=str(uuid.uuid4()))
+    client = AsyncTickTickClient(str(uuid.uuid4()), str(uuid.uuid4()), oauth, transport=httpx.MockTransport(flaky),
+                                 retry_policy=RetryPolicy(backoff=0))
+    events = []
+
+    async def run():
+        async with client:
+            client.hooks.add(events.append)
+            await client.http_get(client.BASE_URL + 'user/status')
+
+    run_async(run())
+    assert [(event.status, event.retries) for event in events] == [(200, 1)]
+
+
+def test_compressed_body_sent_as_content(run_async):
+    """
+    Tests large bodies reach the server gzipped without the httpx data deprecation
+    """
+    server = FakeTickTick()
+    client = make_client(server, username='', password='')
+    client.compress_requests = 10
+    payload = {'add': [{'title': 'Compressed'}]}
+
+    async def run():
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', DeprecationWarning)
+            await client.http_post(client.BASE_URL + 'batch/task', json=payload)
+        await client.aclose()
+
+    run_async(run())
+    request = server.paths('batch/task')[0]
+    assert request.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(request.content)) == payload
@@ -4,7 +4,12 @@ Tests the cache.py module
 
 import json
 import os
-from ticktick.cache import CacheHandler
+import stat
+import sys
+
+import pytest
+
+from ticktick.cache import CacheHandler, SnapshotHandler
 
 
 class TestInitMethod:
@@ -68,3 +73,48 @@ class TestGetToken:
         cache = CacheHandler(path)
 
         assert cache.get_cached_token() is None
+
+
+class TestSnapshot:
+
+    def test_save_and_load_snapshot(self, tmp_path):
+        """
+        Tests a saved snapshot is loaded back
+        """
+        path = str(tmp_path / 'snapshot.json')
+        snapshot = SnapshotHandler(path)
+        snapshot.save({'checkpoint': 5, 'state': {'tasks': []}})
+        assert snapshot.load() == {'checkpoint': 5, 'state': {'tasks': []}, 'version': SnapshotHandler.VERSION}
+        assert not os.path.exists(path + '.tmp')
+
+    @pytest.mark.skipif(sys.platform == 'win32', reason='Windows has no owner only file modes')
+    def test_snapshot_only_readable_by_owner(self, tmp_path):
+        """
+        Tests the snapshot, which holds the access token, is written with owner only permissions
+        """
+        path = str(tmp_path / 'snapshot.json')
+        with open(path + '.tmp', 'w') as f:
+            f.write('left over')
+        os.chmod(path + '.tmp', 0o644)
+        old_umask = os.umask(0)
+        try:
+            SnapshotHandler(path).save({'checkpoint': 5})
+        finally:
+            os.umask(old_umask)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    def test_load_unusable_snapshot(self, tmp_path):
+        """
+        Tests missing, corrupt and outdated snapshots load as None
+        """
+        path = str(tmp_path / 'snapshot.json')
+        snapshot = SnapshotHandler(path)
+        assert snapshot.load() is None
+
+        with open(path, 'w') as f:
+            f.write('{not json')
+        assert snapshot.load() is None
+
+        with open(path, 'w') as f:
+            json.dump({'version': SnapshotHandler.VERSION + 1}, f)
+        assert snapshot.load() is None
@@ -0,0 +1,170 @@
+"""
+Module for testing circuit_breaker.py
+"""
+
+import asyncio
+import uuid
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from ticktick.circuit_breaker import CircuitBreaker, CircuitBreakers, CircuitOpenError, family
+from ticktick.oauth2 import OAuth2
+
+
+def make_response(status: int) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = b'{}'
+    return response
+
+
+@pytest.fixture
+def breakers(fake_client):
+    """
+    Gives the fake client breakers that open after two failures and puts the old ones back afterwards
+    """
+    old = fake_client.circuit_breakers
+    fake_client.circuit_breakers = CircuitBreakers(failure_threshold=2, reset_timeout=30)
+    yield fake_client.circuit_breakers
+    fake_client.circuit_breakers = old
+
+
+class TestCircuitBreaker:
+
+    def test_opens_and_probes(self):
+        """
+        Tests the circuit opens after the threshold, lets one probe through once half open and closes on success
+        """
+        with patch('ticktick.circuit_breaker.time.monotonic', return_value=0.0) as mock_time:
+            breaker = CircuitBreaker('batch', failure_threshold=2, reset_timeout=10)
+            breaker.before_request()
+            breaker.record(failed=True)
+            assert breaker.state == 'closed'
+            breaker.record(failed=True)
+            assert breaker.state == 'open'
+            mock_time.return_value = 4.0
+            with pytest.raises(CircuitOpenError) as error:
+                breaker.before_request()
+            assert (error.value.family, error.value.retry_in) == ('batch', 6)
+
+            mock_time.return_value = 10.0
+            assert breaker.state == 'half_open'
+            breaker.before_request()
+            with pytest.raises(CircuitOpenError):
+                breaker.before_request()
+            breaker.record(failed=False)
+            assert breaker.state == 'closed'
+            assert breaker.failures == 0
+
+    def test_failed_probe_reopens(self):
+        """
+        Tests a failed probe keeps the circuit open for another reset timeout
+        """
+        with patch('ticktick.circuit_breaker.time.monotonic', return_value=0.0) as mock_time:
+            breaker = CircuitBreaker('tag', failure_threshold=1, reset_timeout=10)
+            breaker.record(failed=True)
+            mock_time.return_value = 12.0
+            breaker.before_request()
+            breaker.record(failed=True)
+            assert breaker.state == 'open'
+            mock_time.return_value = 21.0
+            assert breaker.state == 'open'
+            mock_time.return_value = 22.0
+            assert breaker.state == 'half_open'
+
+    def test_families(self):
+        """
+        Tests urls are grouped by endpoint family
+        """
+        assert family('https://api.ticktick.com/api/v2/batch/check/0') == 'batch'
+        assert family('https://api.ticktick.com/api/v2/tag/rename') == 'tag'
+        assert family('https://api.ticktick.com/api/v2/project/all/completed/?from=') == 'completed'
+        assert family('https://api.ticktick.com/open/v1/project/abc/task/def') == 'open'
+        assert family('https://api.ticktick.com/api/v2/user/status') == 'other'
+
+
+class TestClientCircuit:
+
+    def test_fails_fast_per_family(self, fake_client, breakers):
+        """
+        Tests failing batch requests open the batch circuit without blocking the other families
+        """
+        with patch.object(fake_client._session, 'post', return_value=make_response(503)) as mock_post:
+            for _ in range(2):
+                with pytest.raises(RuntimeError):
+                    fake_client.http_post(fake_client.BASE_URL + 'batch/task', json={})
+            with pytest.raises(CircuitOpenError):
+                fake_client.http_post(fake_client.BASE_URL + 'batch/task', json={})
+        assert mock_post.call_count == 2
+        assert breakers.states()['batch'] == 'open'
+
+        with patch.object(fake_client._session, 'get', return_value=make_response(200)):
+            assert fake_client.http_get(fake_client.BASE_URL + 'tags') == {}
+        assert breakers.states()['tag'] == 'closed'
+
+    def test_client_errors_are_successes(self, fake_client, breakers):
+        """
+        Tests responses like 404 and raised connection errors are counted correctly
+        """
+        with patch.object(fake_client._session, 'get', return_value=make_response(404)):
+            for _ in range(3):
+                with pytest.raises(RuntimeError):
+                    fake_client.http_get(fake_client.BASE_URL + 'user/status')
+        assert breakers['other'].state == 'closed'
+
+        with patch.object(fake_client._session, 'get', side_effect=requests.ConnectionError('down')):
+            for _ in range(2):
+                with pytest.raises(requests.ConnectionError):
+                    fake_client.http_get(fake_client.BASE_URL + 'user/status')
+        assert breakers['other'].state == 'open'
+        breakers.reset()
+        assert set(breakers.states().values()) == {'closed'}
+
+    def test_interrupted_probe_released(self, fake_client, breakers):
+        """
+        Tests an interrupted half open probe lets the next probe through
+        """
+        breakers['batch'].reset_timeout = 0
+        breakers['batch'].record(failed=True)
+        breakers['batch'].record(failed=True)
+        with patch.object(fake_client._session, 'post', side_effect=KeyboardInterrupt):
+            with pytest.raises(KeyboardInterrupt):
+                fake_client.http_post(fake_client.BASE_URL + 'batch/task', json={})
+        with patch.object(fake_client._session, 'post', return_value=make_response(200)):
+            assert fake_client.http_post(fake_client.BASE_URL + 'batch/task', json={}) == {}
+        assert breakers['batch'].state == 'closed'
+
+    def test_cancelled_async_probe_released(self, run_async):
+        """
+        Tests a half open probe cancelled by a timeout doesn't keep the async client's circuit open
+        """
+        httpx = pytest.importorskip('httpx')
+        from ticktick.async_api import AsyncTickTickClient
+
+        calls = []
+
+        async def server(request):
+            calls.append(request)
+            if len(calls) == 1:
+                await asyncio.sleep(10)
+            return httpx.Response(200, json={})
+
+        with patch('ticktick.oauth2.OAuth2.get_access_token'):
+            oauth = OAuth2(client_id=str(uuid.uuid4()), client_secret=str(uuid.uuid4()),
+                           redirect_uri=str(uuid.uuid4()))
+        client = AsyncTickTickClient(None, None, oauth, transport=httpx.MockTransport(server))
+        client.circuit_breakers = CircuitBreakers(failure_threshold=1, reset_timeout=0)
+        client.circuit_breakers['batch'].record(failed=True)
+        url = client.BASE_URL + 'batch/task'
+
+        async def run():
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.http_post(url, json={}), 0.05)
+            result = await client.http_post(url, json={})
+            await client.aclose()
+            return result
+
+        assert run_async(run()) == {}
+        assert client.circuit_breakers['batch'].state == 'closed'
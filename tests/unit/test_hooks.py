@@ -0,0 +1,190 @@
+"""
+Module for testing hooks.py
+"""
+
+import datetime
+import gzip
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+import requests
+from urllib3.response import HTTPResponse
+
+from ticktick.helpers.compression import ACCEPT_ENCODING
+from ticktick.helpers.concurrency import ordered_map
+from ticktick.hooks import ByteCounter, RequestHooks, endpoint_template, find_caller
+from ticktick.oauth2 import requests_retry_session
+
+
+def make_response(status: int = 200, content: bytes = b'[]', body: bytes = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = content
+    response.request = requests.Request('POST', 'https://api.ticktick.com/api/v2/batch/task', data=body).prepare()
+    return response
+
+
+@pytest.fixture
+def events(fake_client):
+    received = []
+    hook = fake_client.hooks.add(received.append)
+    yield received
+    fake_client.hooks.remove(hook)
+
+
+class TestEndpointTemplate:
+
+    def test_ids_and_numbers_replaced(self):
+        """
+        Tests object ids and checkpoints are replaced in the endpoint
+        """
+        assert endpoint_template('https://api.ticktick.com/api/v2/batch/check/1234') == '/api/v2/batch/check/{n}'
+        assert endpoint_template('https://api.ticktick.com/open/v1/project/5ff24e4b8f08904035b304d9/task/'
+                                 'inbox115781412/complete') == '/open/v1/project/{id}/task/{id}/complete'
+        assert endpoint_template('https://api.ticktick.com/api/v2/tag?name=x') == '/api/v2/tag'
+
+
+class TestClientHooks:
+
+    def test_event_reported(self, fake_client, events):
+        """
+        Tests a request reports method, endpoint, status, sizes and the manager method that sent it
+        """
+        body = b'{"delete": [{"projectId": "p", "taskId": "t"}]}'
+        response = make_response(content=b'[]', body=body)
+        with patch.object(fake_client._session, 'post', return_value=response):
+            fake_client.task.delete({'id': 't', 'projectId': 'p'})
+        event = events[-1]
+        assert event.method == 'POST'
+        assert event.endpoint == '/api/v2/batch/task'
+        assert event.status == 200
+        assert event.bytes_sent == len(body)
+        assert event.bytes_received == 2
+        assert event.retries == 0
+        assert event.caller == 'TaskManager.delete'
+        assert event.elapsed >= 0
+
+    def test_failed_request_reported(self, fake_client, events):
+        """
+        Tests requests that raise are reported with the error
+        """
+        with patch.object(fake_client._session, 'get', side_effect=requests.ConnectionError('down')):
+            with pytest.raises(requests.ConnectionError):
+                fake_client.http_get(fake_client.BASE_URL + 'project/all/completed')
+        assert events[-1].status is None
+        assert isinstance(events[-1].error, requests.ConnectionError)
+        assert events[-1].caller == 'TickTickClient.http_get'
+
+    def test_broken_hook_does_not_break_request(self, fake_client):
+        """
+        Tests an exception in a hook is not raised to the caller
+        """
+        def broken(event):
+            raise ValueError
+
+        fake_client.hooks.add(broken)
+        try:
+            with patch.object(fake_client._session, 'get', return_value=make_response(content=b'{"a": 1}')):
+                assert fake_client.http_get(fake_client.BASE_URL + 'anything') == {'a': 1}
+        finally:
+            fake_client.hooks.remove(broken)
+
+    def test_threads_keep_caller(self, fake_client, events):
+        """
+        Tests requests sent from worker threads report the method that started them
+        """
+        with patch.object(fake_client._session, 'get', return_value=make_response()):
+            fake_client.task.get_completed(datetime.datetime(2020, 12, 1), datetime.datetime(2020, 12, 10),
+                                           tz='UTC', window=datetime.timedelta(days=2), workers=3)
+        assert len(events) == 5
+        assert {event.caller for event in events} == {'TaskManager.get_completed'}
+
+    def test_shared_with_oauth(self, fake_client, events):
+        """
+        Tests the client reports through the registry of its OAuth2 manager
+        """
+        assert fake_client.hooks is fake_client.oauth_manager.hooks
+        with patch.object(fake_client.oauth_manager.session, 'post', return_value=make_response(content=b'{}')):
+            fake_client.oauth_manager._post(fake_client.oauth_manager.OBTAIN_TOKEN_URL)
+        assert events[-1].endpoint == '/oauth/token'
+
+
+class TestRequestHooks:
+
+    def test_nothing_measured_without_hooks(self):
+        """
+        Tests no work is done when no hook is registered
+        """
+        hooks = RequestHooks()
+        assert hooks.started() is None
+        hooks.finished(None, 'GET', 'https://api.ticktick.com/')
+
+    def test_ordered_map_outside_library(self):
+        """
+        Tests the caller is None when the work did not come from the library
+        """
+        assert list(ordered_map(lambda item: find_caller(), [1, 2], workers=2)) == [None, None]
+
+
+class TestCompression:
+
+    def test_large_bodies_compressed(self, fake_client, events):
+        """
+        Tests json bodies over the threshold are sent gzipped and reported with both sizes
+        """
+        payload = {'add': [{'title': 'Task ' + str(number)} for number in range(100)]}
+        raw = json.dumps(payload).encode()
+
+        def post(url, **kwargs):
+            request = requests.Request('POST', url, data=kwargs.get('data'), json=kwargs.get('json'),
+                                       headers=kwargs.get('headers')).prepare()
+            response = make_response(content=b'{}')
+            response.request = request
+            return response
+
+        fake_client.compress_requests = 1024
+        try:
+            with patch.object(fake_client._session, 'post', side_effect=post) as mock_post:
+                fake_client.http_post(fake_client.BASE_URL + 'batch/task', json=payload, headers={'a': 'b'})
+                fake_client.http_post(fake_client.BASE_URL + 'batch/task', json={'add': []})
+        finally:
+            fake_client.compress_requests = None
+
+        compressed, small = mock_post.call_args_list
+        assert compressed[1]['headers'] == {'a': 'b', 'Content-Type': 'application/json', 'Content-Encoding': 'gzip'}
+        assert json.loads(gzip.decompress(compressed[1]['data'])) == payload
+        # Small bodies are sent as the bytes already serialized instead of json
+        assert 'json' not in small[1]
+        assert small[1]['headers'] == {'Content-Type': 'application/json'}
+        assert json.loads(small[1]['data']) == {'add': []}
+        assert events[-2].bytes_sent == len(raw)
+        assert events[-2].wire_bytes_sent == len(compressed[1]['data']) < len(raw)
+        assert events[-1].bytes_sent == events[-1].wire_bytes_sent
+
+    def test_byte_counter(self, fake_client):
+        """
+        Tests the counter adds up decoded and wire sizes of compressed responses
+        """
+        content = json.dumps({'tasks': ['x' * 10] * 500}).encode()
+        wire = gzip.compress(content)
+        response = make_response()
+        response._content = False
+        response.raw = HTTPResponse(body=io.BytesIO(wire), headers={'Content-Encoding': 'gzip'}, status=200,
+                                    preload_content=False)
+
+        counter = fake_client.hooks.add(ByteCounter())
+        try:
+            with patch.object(fake_client._session, 'get', return_value=response):
+                fake_client.http_get(fake_client.BASE_URL + 'batch/check/0')
+        finally:
+            fake_client.hooks.remove(counter)
+        assert counter.as_dict() == {'sent': 0, 'wire_sent': 0, 'received': len(content),
+                                     'wire_received': len(wire)}
+
+    def test_session_accepts_compression(self):
+        """
+        Tests the session asks for every response encoding it can decode
+        """
+        assert requests_retry_session().headers['Accept-Encoding'] == ACCEPT_ENCODING
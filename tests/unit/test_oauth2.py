@@ -6,7 +6,9 @@ import os
 import uuid
 import time
 
-from ticktick.oauth2 import OAuth2, requests_retry_session
+import requests
+
+from ticktick.oauth2 import OAuth2, TimeoutHTTPAdapter, requests_retry_session
 from ticktick.cache import CacheHandler
 from unittest.mock import patch
 
@@ -319,3 +321,39 @@ class TestValidateToken:
 
         # asserts the original dictionary is returned if the token dict is not expired
         assert oauth_client_fake.validate_token(token_dict) == token_dict
+
+
+class TestSession:
+
+    def test_pool_and_timeout(self):
+        """
+        Tests the pool sizes and default timeout are set on the mounted adapter
+        """
+        session = requests_retry_session(pool_connections=4, pool_maxsize=32, timeout=(3, 7))
+        adapter = session.get_adapter('https://api.ticktick.com')
+        assert isinstance(adapter, TimeoutHTTPAdapter)
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 32
+        assert adapter.timeout == (3, 7)
+        assert adapter.max_retries.total == 3
+
+    def test_default_timeout_applied(self):
+        """
+        Tests requests without a timeout get the default, and a per call timeout wins
+        """
+        adapter = TimeoutHTTPAdapter(timeout=(3, 7))
+        request = requests.Request('GET', 'https://api.ticktick.com/').prepare()
+        with patch('requests.adapters.HTTPAdapter.send') as mock_send:
+            adapter.send(request, timeout=None)
+            assert mock_send.call_args[1]['timeout'] == (3, 7)
+            adapter.send(request, timeout=1)
+            assert mock_send.call_args[1]['timeout'] == 1
+
+    def test_custom_adapter(self):
+        """
+        Tests a transport adapter passed to OAuth2 is mounted as is
+        """
+        adapter = requests.adapters.HTTPAdapter()
+        with patch('ticktick.oauth2.OAuth2.get_access_token'):
+            auth = OAuth2(client_id='id', client_secret='secret', redirect_uri='uri', adapter=adapter)
+        assert auth.session.get_adapter('https://ticktick.com') is adapter
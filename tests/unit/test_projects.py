@@ -0,0 +1,71 @@
+"""
+Unit test module for projects.py
+"""
+
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture
+def projects(fake_client):
+    """
+    Adds two projects with tasks to the fake client's state and removes everything afterwards
+    """
+    first = {'id': str(uuid.uuid4()), 'name': 'First'}
+    second = {'id': str(uuid.uuid4()), 'name': 'Second'}
+    fake_client._upsert_into_local_state('projects', 'id', [first, second])
+    tasks = [{'id': str(uuid.uuid4()), 'projectId': project['id']} for project in (first, second, first)]
+    fake_client._upsert_into_local_state('tasks', 'id', tasks)
+    yield first, second, tasks
+    fake_client.delete_all_from_local_state('projects', 'id', [first['id'], second['id']])
+    fake_client.delete_all_from_local_state('tasks', 'id', [task['id'] for task in tasks])
+
+
+class TestDelete:
+
+    def test_delete_removes_tasks_locally(self, fake_client, projects):
+        """
+        Tests deleting a project removes it and only its tasks from the state
+        """
+        first, second, tasks = projects
+        with patch('ticktick.api.TickTickClient.http_post', return_value={}):
+            assert fake_client.project.delete(first['id']) == first
+
+        assert not fake_client.get_by_id(first['id'], search='projects')
+        assert fake_client.get_by_id(second['id'], search='projects') == second
+        assert fake_client.get_by_fields(projectId=first['id'], search='tasks') == []
+        assert fake_client.get_by_fields(projectId=second['id'], search='tasks') == tasks[1]
+
+    def test_delete_multiple_keeps_order(self, fake_client, projects):
+        """
+        Tests deleting several projects returns them in the order of the ids
+        """
+        first, second, tasks = projects
+        with patch('ticktick.api.TickTickClient.http_post', return_value={}):
+            assert fake_client.project.delete([second['id'], first['id']]) == [second, first]
+
+        assert not any(fake_client.get_by_id(task['id'], search='tasks') for task in tasks)
+
+
+class TestDeleteFolder:
+
+    def test_delete_folder_removes_it_locally(self, fake_client):
+        """
+        Tests deleted folders are removed from the state and returned in the order of the ids
+        """
+        folders = [{'id': str(uuid.uuid4()), 'name': name} for name in ('Work', 'Hobbies', 'Kept')]
+        fake_client._upsert_into_local_state('project_folders', 'id', folders)
+        try:
+            with patch('ticktick.api.TickTickClient.http_post', return_value={}), \
+                    patch('ticktick.api.TickTickClient.sync') as mock_sync:
+                deleted = fake_client.project.delete_folder([folders[1]['id'], folders[0]['id']])
+
+            assert deleted == [folders[1], folders[0]]
+            mock_sync.assert_called_once()
+            assert not fake_client.get_by_id(folders[0]['id'], search='project_folders')
+            assert not fake_client.get_by_id(folders[1]['id'], search='project_folders')
+            assert fake_client.get_by_id(folders[2]['id'], search='project_folders') == folders[2]
+        finally:
+            fake_client.delete_all_from_local_state('project_folders', 'id', [folder['id'] for folder in folders])
@@ -0,0 +1,148 @@
+"""
+Module for testing records.py
+"""
+
+import copy
+import datetime
+import json
+import pickle
+from unittest.mock import patch
+
+import pytest
+
+from ticktick.records import TaskRecord, TagRecord, _SHARED_INTS, to_plain, to_record
+
+
+def example_task():
+    return {'id': '5ff24e4b8f08904035b304d9', 'projectId': 'inbox416323287', 'title': 'Get Groceries',
+            'timeZone': 'America/Los_Angeles', 'reminders': [], 'tags': ['errands'], 'status': 0,
+            'creator': 359368200, 'someNewField': {'nested': True}}
+
+
+class TestRecord:
+
+    def test_behaves_like_dict(self):
+        """
+        Tests records support the dictionary operations the library uses
+        """
+        task = example_task()
+        record = TaskRecord(task)
+        assert record == task
+        assert dict(record) == task
+        assert len(record) == len(task)
+        assert set(record) == set(task)
+        assert record['title'] == 'Get Groceries'
+        assert record.get('parentId') is None
+        assert 'parentId' not in record
+        assert 'someNewField' in record
+
+        record['parentId'] = 'parent'
+        assert record['parentId'] == 'parent'
+        del record['parentId']
+        with pytest.raises(KeyError):
+            record['parentId']
+        with pytest.raises(KeyError):
+            del record['missing']
+
+        record.clear()
+        assert record == {}
+
+    def test_empty_lists_created_on_read(self):
+        """
+        Tests an empty list read from a record can be changed in place
+        """
+        record = TaskRecord(example_task())
+        record['reminders'].append('TRIGGER:PT0S')
+        assert record['reminders'] == ['TRIGGER:PT0S']
+        assert TaskRecord(example_task())['reminders'] == []
+
+    def test_shared_values(self):
+        """
+        Tests enum-like values are shared between records
+        """
+        first = TaskRecord(json.loads(json.dumps(example_task())))
+        second = TaskRecord(json.loads(json.dumps(example_task())))
+        assert first['timeZone'] is second['timeZone']
+        assert first['creator'] is second['creator']
+
+    def test_shared_ints_bounded(self):
+        """
+        Tests the table of shared ints stops growing once full
+        """
+        with patch.dict('ticktick.records._SHARED_INTS', clear=True), patch('ticktick.records.MAX_SHARED_INTS', 2):
+            records = [TaskRecord({'creator': int(str(10 ** 6 + number))}) for number in range(4)]
+            assert len(_SHARED_INTS) == 2
+            assert TaskRecord({'creator': 10 ** 6})['creator'] is records[0]['creator']
+
+    def test_to_plain(self):
+        """
+        Tests records nested in a request body are converted to dictionaries
+        """
+        record = TaskRecord(example_task())
+        body = {'update': [record], 'tag': TagRecord({'name': 'errands', 'label': 'Errands'})}
+        plain = to_plain(body)
+        assert type(plain['update'][0]) is dict
+        assert json.loads(json.dumps(plain)) == {'update': [example_task()],
+                                                 'tag': {'name': 'errands', 'label': 'Errands'}}
+
+    def test_copy_and_pickle(self):
+        """
+        Tests records can be copied and pickled
+        """
+        record = TaskRecord(example_task())
+        assert record.copy() == record and record.copy() is not record
+        assert copy.deepcopy(record) == record
+        assert pickle.loads(pickle.dumps(record)) == record
+
+    def test_parsed_dates(self):
+        """
+        Tests task records parse their dates on access
+        """
+        record = TaskRecord(example_task(), dueDate='2021-06-17T01:44:07.000+0000', startDate='')
+        assert record.due_dt == datetime.datetime(2021, 6, 17, 1, 44, 7)
+        assert record.start_dt is None
+        assert record.completed_dt is None
+        record['dueDate'] = '2021-06-18T01:44:07.000+0000'
+        assert record.due_dt == datetime.datetime(2021, 6, 18, 1, 44, 7)
+
+    def test_to_record_leaves_other_lists(self):
+        """
+        Tests objects of lists without a record type are left alone
+        """
+        settings = {'timeZone': 'UTC'}
+        assert to_record('user_settings', settings) is settings
+        assert isinstance(to_record('tasks', example_task()), TaskRecord)
+
+
+class TestCompactClient:
+
+    def test_sync_stores_records(self, fake_client):
+        """
+        Tests a compact client stores records and searches them like dictionaries
+        """
+        response = {'checkPoint': 3, 'inboxId': 'inbox', 'projectGroups': [], 'tags': [],
+                    'projectProfiles': [{'id': 'p1', 'name': 'Work'}],
+                    'syncTaskBean': {'update': [example_task()]}}
+        fake_client.compact = True
+        try:
+            with patch('ticktick.api.TickTickClient.http_get', return_value=response):
+                fake_client.sync(full=True)
+            task = fake_client.get_by_id(example_task()['id'], search='tasks')
+            assert isinstance(task, TaskRecord)
+            assert fake_client.get_by_fields(projectId='inbox416323287', search='tasks') is task
+            assert fake_client.get_by_fields(name='Work', search='projects')['id'] == 'p1'
+
+            delta = {'checkPoint': 4, 'syncTaskBean': {'update': [{'id': 'new', 'projectId': 'p1', 'status': 0}]}}
+            with patch('ticktick.api.TickTickClient.http_get', return_value=delta):
+                fake_client.sync()
+            assert isinstance(fake_client.get_by_id('new', search='tasks'), TaskRecord)
+
+            with patch('ticktick.api.TickTickClient.sync'), \
+                    patch.object(fake_client._session, 'post') as mock_post:
+                mock_post.return_value.status_code = 200
+                mock_post.return_value.json.return_value = {}
+                fake_client.task.delete(task)
+            assert type(mock_post.call_args[1]['json']['delete'][0]) is dict
+        finally:
+            fake_client.compact = False
+            fake_client.reset_local_state()
@@ -0,0 +1,192 @@
+"""
+Module for testing retry.py
+"""
+
+import email.utils
+import io
+import time
+import uuid
+from unittest.mock import patch
+
+import pytest
+from urllib3.response import HTTPResponse
+from urllib3.util.retry import Retry
+
+from ticktick.oauth2 import OAuth2, TimeoutHTTPAdapter, requests_retry_session
+from ticktick.retry import RetryPolicy, TokenBucket
+
+
+class TestRetryPolicy:
+
+    def test_full_jitter_bounds(self):
+        """
+        Tests the backoff is between 0 and the exponential cap
+        """
+        policy = RetryPolicy(backoff=0.5, max_backoff=3, jitter=True)
+        with patch('ticktick.retry.random.uniform', side_effect=lambda low, high: high) as mock_uniform:
+            assert [policy.backoff_time(attempt) for attempt in range(5)] == [0.5, 1, 2, 3, 3]
+        assert all(call[0][0] == 0 for call in mock_uniform.call_args_list)
+        assert all(0 <= policy.backoff_time(2) <= 2 for _ in range(100))
+
+    def test_default_matches_urllib3(self):
+        """
+        Tests the default policy retries the statuses and waits of the old Retry(backoff_factor=1) session
+        """
+        policy = RetryPolicy()
+        assert policy.status_forcelist == {405, 500, 502, 504}
+        retry = Retry(total=5, backoff_factor=1)
+        waits = []
+        for attempt in range(5):
+            retry = retry.increment('GET', '/', error=ConnectionError())
+            waits.append(retry.get_backoff_time())
+        assert [policy.backoff_time(attempt) for attempt in range(5)] == waits
+        assert not policy.is_retry('GET', 429)
+        assert policy.is_retry('GET', 429, has_retry_after=True)
+
+    def test_retry_after(self):
+        """
+        Tests seconds and http dates are read from Retry-After and capped
+        """
+        policy = RetryPolicy(max_retry_after=60)
+        assert policy.retry_after({'Retry-After': '7'}) == 7
+        assert policy.retry_after({'Retry-After': '600'}) == 60
+        assert policy.retry_after({'Retry-After': 'soon'}) is None
+        assert policy.retry_after({}) is None
+        date = email.utils.formatdate(time.time() + 20, usegmt=True)
+        assert 15 < policy.retry_after({'Retry-After': date}) <= 20
+
+    def test_retry_delay_records_stats(self):
+        """
+        Tests rate limited retries wait for Retry-After and are counted apart from backoff
+        """
+        policy = RetryPolicy(jitter=True)
+        assert policy.retry_delay(0, 429, {'Retry-After': '2'}) == 2
+        with patch('ticktick.retry.random.uniform', return_value=0.25):
+            assert policy.retry_delay(1, 500, {'Retry-After': '9'}) == 0.25
+        assert policy.stats.as_dict() == {'retries': 2, 'rate_limited': 1, 'backoff_time': 0.25,
+                                          'throttled_time': 2}
+
+    def test_is_retry(self):
+        """
+        Tests statuses are retried when listed or when the server asked for a retry
+        """
+        policy = RetryPolicy(status_forcelist=(500,), allowed_methods=['GET'])
+        assert policy.is_retry('get', 500)
+        assert not policy.is_retry('PATCH', 500)
+        assert not policy.is_retry('GET', 429)
+        assert policy.is_retry('GET', 429, has_retry_after=True)
+
+
+class TestTokenBucket:
+
+    def test_waits_after_burst(self):
+        """
+        Tests the burst is free and later requests are spaced by the rate
+        """
+        with patch('ticktick.retry.time.monotonic', return_value=100.0):
+            bucket = TokenBucket(rate=2, burst=2)
+            waits = [bucket.reserve() for _ in range(4)]
+        assert waits == [0, 0, 0.5, 1.0]
+
+    def test_refills(self):
+        """
+        Tests tokens come back with time
+        """
+        with patch('ticktick.retry.time.monotonic', side_effect=[0.0, 0.0, 0.0, 2.0]):
+            bucket = TokenBucket(rate=1)
+            assert bucket.reserve() == 0
+            assert bucket.reserve() == 1
+            assert bucket.reserve() == 0
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestSessionRetries:
+
+    def test_429_waits_for_retry_after(self):
+        """
+        Tests the session retries a 429 after the time in Retry-After and records it
+        """
+        policy = RetryPolicy(retries=2)
+        session = requests_retry_session(policy=policy)
+        adapter = session.get_adapter('https://api.ticktick.com')
+        assert isinstance(adapter, TimeoutHTTPAdapter)
+        responses = [HTTPResponse(body=io.BytesIO(b''), status=429, headers={'Retry-After': '3'}, preload_content=False),
+                     HTTPResponse(body=io.BytesIO(b'{}'), status=200, preload_content=False)]
+
+        with patch.object(adapter, 'get_connection_with_tls_context') as mock_connection, \
+                patch('ticktick.retry.time.sleep') as mock_sleep:
+            mock_connection.return_value.urlopen.side_effect = \
+                lambda method, url, **kwargs: _urlopen(responses, method, url, kwargs['retries'])
+            response = session.get('https://api.ticktick.com/api/v2/user/status')
+
+        assert response.status_code == 200
+        mock_sleep.assert_called_once_with(3)
+        assert policy.stats.rate_limited == 1
+        assert policy.stats.throttled_time == 3
+
+    def test_oauth_shares_policy(self):
+        """
+        Tests OAuth2 sets up a default policy and uses a passed one
+        """
+        with patch('ticktick.oauth2.OAuth2.get_access_token'):
+            auth = OAuth2(client_id='id', client_secret='secret', redirect_uri='uri')
+            assert isinstance(auth.retry_policy, RetryPolicy)
+            policy = RetryPolicy(rate=5)
+            auth = OAuth2(client_id='id', client_secret='secret', redirect_uri='uri', retry_policy=policy)
+        assert auth.retry_policy is policy
+        assert auth.session.get_adapter('https://ticktick.com').max_retries.policy is policy
+
+
+def _urlopen(responses, method, url, retries):
+    """
+    Plays the responses the way urllib3 does, retrying through the Retry object it was given.
+    """
+    while True:
+        response = responses.pop(0)
+        if not retries.is_retry(method, response.status, 'Retry-After' in response.headers):
+            return response
+        retries = retries.increment(method, url, response=response)
+        retries.sleep(response)
+
+
+class TestAsyncRetries:
+
+    def test_retries_until_success(self, run_async):
+        """
+        Tests the async client retries a 502 and a 429, waiting as told, with the wait recorded
+        """
+        httpx = pytest.importorskip('httpx')
+        from ticktick.async_api import AsyncTickTickClient
+
+        statuses = [502, 429, 200]
+        sent = []
+
+        def server(request):
+            sent.append(request)
+            status = statuses.pop(0)
+            headers = {'Retry-After': '1'} if status == 429 else {}
+            return httpx.Response(status, headers=headers, json={'ok': status == 200})
+
+        with patch('ticktick.oauth2.OAuth2.get_access_token'):
+            oauth = OAuth2(client_id=str(uuid.uuid4()), client_secret=str(uuid.uuid4()),
+                           redirect_uri=str(uuid.uuid4()))
+        client = AsyncTickTickClient(None, None, oauth, transport=httpx.MockTransport(server))
+        assert client.retry_policy is oauth.retry_policy
+        waits = []
+
+        async def sleep(delay):
+            waits.append(delay)
+
+        async def run():
+            with patch('ticktick.async_api.asyncio.sleep', side_effect=sleep):
+                return await client.http_get('https://api.ticktick.com/api/v2/user/status')
+
+        assert run_async(run()) == {'ok': True}
+        assert len(sent) == 3
+        # The first retry is sent straight away, like urllib3 does
+        assert waits == [0, 1]
+        assert client.retry_policy.stats.as_dict() == {'retries': 2, 'rate_limited': 1, 'backoff_time': 0,
+                                                       'throttled_time': 1}
@@ -0,0 +1,221 @@
+"""
+Module for testing state_index.py
+"""
+
+import datetime
+import random
+import uuid
+
+
+class TestLookup:
+
+    def test_lookup_after_append(self, fake_client):
+        """
+        Tests objects appended directly to a state list are found
+        """
+        obj = {'id': str(uuid.uuid4()), 'etag': str(uuid.uuid4())}
+        fake_client.state['tasks'].append(obj)
+        assert fake_client._index.lookup('tasks', 'id', obj['id']) is obj
+        assert fake_client._index.lookup('tasks', 'etag', obj['etag']) is obj
+        fake_client.delete_from_local_state(id=obj['id'], search='tasks')
+
+    def test_lookup_after_delete(self, fake_client):
+        """
+        Tests deleted objects are no longer found
+        """
+        obj = {'id': str(uuid.uuid4()), 'etag': str(uuid.uuid4())}
+        fake_client.state['tasks'].append(obj)
+        assert fake_client.get_by_id(obj['id'], search='tasks')
+        fake_client.delete_from_local_state(id=obj['id'], search='tasks')
+        assert fake_client._index.lookup('tasks', 'id', obj['id']) is None
+        assert fake_client._index.lookup('tasks', 'etag', obj['etag']) is None
+
+    def test_lookup_after_replacing_list(self, fake_client):
+        """
+        Tests the tables are rebuilt when a state list is replaced
+        """
+        obj = {'id': str(uuid.uuid4())}
+        fake_client.state['tasks'].append(obj)
+        assert fake_client.get_by_id(obj['id'], search='tasks')
+        replacement = {'id': str(uuid.uuid4())}
+        fake_client.state['tasks'] = [replacement]
+        assert not fake_client.get_by_id(obj['id'], search='tasks')
+        assert fake_client.get_by_id(replacement['id'], search='tasks') is replacement
+        fake_client.reset_local_state()
+
+    def test_lookup_after_id_edited(self, fake_client):
+        """
+        Tests an object whose id was edited in place is found by its new id
+        """
+        obj = {'id': str(uuid.uuid4())}
+        fake_client.state['projects'].append(obj)
+        old_id = obj['id']
+        assert fake_client.get_by_id(old_id, search='projects')
+        obj['id'] = str(uuid.uuid4())
+        assert not fake_client.get_by_id(old_id, search='projects')
+        assert fake_client.get_by_id(obj['id'], search='projects') is obj
+        fake_client.delete_from_local_state(id=obj['id'], search='projects')
+
+    def test_untracked_append_survives_tracked_delete(self, fake_client):
+        """
+        Tests a direct append followed by a tracked deletion does not hide the appended object
+        """
+        first = {'id': str(uuid.uuid4())}
+        second = {'id': str(uuid.uuid4())}
+        fake_client.state['tags'].append(first)
+        assert fake_client.get_by_id(first['id'], search='tags')
+        fake_client.state['tags'].append(second)
+        fake_client.delete_from_local_state(id=first['id'], search='tags')
+        assert fake_client.get_by_id(second['id'], search='tags') is second
+        fake_client.delete_from_local_state(id=second['id'], search='tags')
+
+    def test_first_duplicate_wins(self, fake_client):
+        """
+        Tests the first object with a duplicated id is returned, like a linear search
+        """
+        obj_id = str(uuid.uuid4())
+        first = {'id': obj_id, 'title': 'first'}
+        second = {'id': obj_id, 'title': 'second'}
+        fake_client.state['tasks'].extend([first, second])
+        assert fake_client.get_by_id(obj_id, search='tasks') is first
+        fake_client.reset_local_state()
+
+
+class TestCandidates:
+
+    def test_get_by_fields_uses_index(self, fake_client):
+        """
+        Tests get_by_fields finds objects by an indexed field in list order
+        """
+        project = str(uuid.uuid4())
+        first = {'id': str(uuid.uuid4()), 'projectId': project, 'status': 0}
+        other = {'id': str(uuid.uuid4()), 'projectId': str(uuid.uuid4()), 'status': 0}
+        second = {'id': str(uuid.uuid4()), 'projectId': project, 'status': 0}
+        fake_client.state['tasks'].extend([first, other, second])
+        assert fake_client._index.candidates('tasks', {'projectId': project}) == [first, second]
+        assert fake_client.get_by_fields(projectId=project, search='tasks') == [first, second]
+        assert fake_client.get_by_fields(projectId=project, status=0, search='tasks') == [first, second]
+        fake_client.reset_local_state()
+
+    def test_index_follows_changes(self, fake_client):
+        """
+        Tests the value tables follow tracked appends, deletions and replacements
+        """
+        project = str(uuid.uuid4())
+        first = {'id': str(uuid.uuid4()), 'projectId': project}
+        fake_client.state['tasks'].append(first)
+        assert fake_client.get_by_fields(projectId=project, search='tasks') is first
+
+        second = {'id': str(uuid.uuid4()), 'projectId': project}
+        fake_client._upsert_into_local_state('tasks', 'id', [second])
+        assert fake_client.get_by_fields(projectId=project, search='tasks') == [first, second]
+
+        moved = str(uuid.uuid4())
+        fake_client._upsert_into_local_state('tasks', 'id', [{'id': first['id'], 'projectId': moved}])
+        assert fake_client.get_by_fields(projectId=project, search='tasks') is second
+        assert fake_client.get_by_fields(projectId=moved, search='tasks') is first
+
+        fake_client.delete_from_local_state(id=second['id'], search='tasks')
+        assert fake_client.get_by_fields(projectId=project, search='tasks') == []
+        fake_client.reset_local_state()
+
+    def test_changes_keep_value_tables(self, fake_client):
+        """
+        Tests replacing and removing objects patches the value tables in list order instead of dropping them
+        """
+        project = str(uuid.uuid4())
+        tasks = [{'id': str(uuid.uuid4()), 'projectId': project if number % 2 else 'other'} for number in range(10)]
+        fake_client._upsert_into_local_state('tasks', 'id', tasks)
+        assert fake_client.get_by_fields(projectId=project, search='tasks') == tasks[1::2]
+        table = fake_client._index._tables['tasks']
+        buckets = table.secondary['projectId']
+
+        fake_client.patch_local_state('tasks', tasks[2], {'projectId': project})
+        fake_client.patch_local_state('tasks', tasks[5], {'title': 'Renamed'})
+        assert table.secondary['projectId'] is buckets
+        assert fake_client.get_by_fields(projectId=project, search='tasks') == [tasks[1], tasks[2], tasks[3],
+                                                                                 tasks[5], tasks[7], tasks[9]]
+
+        fake_client.delete_all_from_local_state('tasks', 'id', [tasks[1]['id'], tasks[7]['id'], tasks[8]['id']])
+        assert fake_client._index._tables['tasks'] is table
+        assert table.secondary['projectId'] is buckets
+        assert fake_client.get_by_fields(projectId=project, search='tasks') == [tasks[2], tasks[3], tasks[5],
+                                                                                 tasks[9]]
+        assert fake_client.get_by_fields(projectId='other', search='tasks') == [tasks[0], tasks[4], tasks[6]]
+        fake_client.reset_local_state()
+
+    def test_multi_valued_field(self, fake_client):
+        """
+        Tests list fields like tags still match by equality
+        """
+        tagged = {'id': str(uuid.uuid4()), 'tags': ['a', 'b']}
+        partial = {'id': str(uuid.uuid4()), 'tags': ['a']}
+        untagged = {'id': str(uuid.uuid4()), 'tags': []}
+        missing = {'id': str(uuid.uuid4())}
+        fake_client.state['tasks'].extend([tagged, partial, untagged, missing])
+        assert fake_client.get_by_fields(tags=['a', 'b'], search='tasks') is tagged
+        assert fake_client.get_by_fields(tags=['a'], search='tasks') is partial
+        assert fake_client.get_by_fields(tags=[], search='tasks') is untagged
+        assert fake_client.get_by_fields(tags='a', search='tasks') == []
+        fake_client.reset_local_state()
+
+    def test_unhashable_values_fall_back_to_scan(self, fake_client):
+        """
+        Tests fields holding unhashable values are searched without an index
+        """
+        obj = {'id': str(uuid.uuid4()), 'status': {'nested': True}}
+        fake_client.state['tasks'].append(obj)
+        assert fake_client._index.candidates('tasks', {'status': {'nested': True}}) is None
+        assert fake_client.get_by_fields(status={'nested': True}, search='tasks') is obj
+        fake_client.reset_local_state()
+
+
+class TestOverlapping:
+
+    def test_matches_scan(self, fake_client):
+        """
+        Tests the interval index finds the same tasks as checking every task
+        """
+        rng = random.Random(7)
+        base = datetime.datetime(2021, 1, 1)
+        tasks = []
+        for number in range(500):
+            start = base + datetime.timedelta(hours=rng.randrange(24 * 60))
+            task = {'id': f'interval-{number}', 'startDate': start.strftime('%Y-%m-%dT%H:%M:%S.000+0000')}
+            if rng.random() < 0.7:
+                due = start + datetime.timedelta(hours=rng.randrange(24 * 10))
+                task['dueDate'] = due.strftime('%Y-%m-%dT%H:%M:%S.000+0000')
+            tasks.append(task)
+        tasks.append({'id': 'interval-undated'})
+        fake_client._upsert_into_local_state('tasks', 'id', tasks)
+        try:
+            for _ in range(50):
+                low = base + datetime.timedelta(hours=rng.randrange(24 * 60))
+                high = low + datetime.timedelta(hours=rng.randrange(24 * 5))
+                expected = []
+                for task in tasks[:-1]:
+                    start = datetime.datetime.strptime(task['startDate'], '%Y-%m-%dT%H:%M:%S.000+0000')
+                    due = datetime.datetime.strptime(task.get('dueDate', task['startDate']),
+                                                     '%Y-%m-%dT%H:%M:%S.000+0000')
+                    if start <= high and due >= low:
+                        expected.append(task)
+                found = fake_client._index.overlapping('tasks', low, high)
+                assert sorted(task['id'] for task in found) == sorted(task['id'] for task in expected)
+                starts = [task['startDate'] for task in found]
+                assert starts == sorted(starts)
+        finally:
+            fake_client.delete_all_from_local_state('tasks', 'id', [task['id'] for task in tasks])
+
+    def test_rebuilt_after_changes(self, fake_client):
+        """
+        Tests added, patched and deleted tasks are seen by the next query
+        """
+        low, high = datetime.datetime(2030, 1, 1), datetime.datetime(2030, 1, 2)
+        task = {'id': str(uuid.uuid4()), 'startDate': '2030-01-01T10:00:00.000+0000'}
+        assert fake_client._index.overlapping('tasks', low, high) == []
+        fake_client._upsert_into_local_state('tasks', 'id', [task])
+        assert fake_client._index.overlapping('tasks', low, high) == [task]
+        fake_client.patch_local_state('tasks', task, {'startDate': '2030-02-01T10:00:00.000+0000'})
+        assert fake_client._index.overlapping('tasks', low, high) == []
+        fake_client.delete_all_from_local_state('tasks', 'id', [task['id']])
+        assert fake_client._index.overlapping('tasks', datetime.datetime(2030, 2, 1), high.replace(month=2)) == []
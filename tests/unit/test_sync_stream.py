@@ -0,0 +1,172 @@
+"""
+Module for testing sync_stream.py
+"""
+
+import io
+import json
+import uuid
+from unittest.mock import patch
+
+import pytest
+import requests
+from urllib3.response import HTTPResponse
+
+ijson = pytest.importorskip('ijson')
+
+from ticktick.api import TickTickClient
+from ticktick.helpers.sync_stream import SyncStreamParser
+from ticktick.oauth2 import OAuth2
+from ticktick.records import TaskRecord, to_plain
+
+SYNC = {
+    'checkPoint': 42,
+    'inboxId': 'inbox123',
+    'projectGroups': [{'id': 'group', 'name': 'Group'}],
+    'projectProfiles': [{'id': 'project', 'name': 'Project', 'groupId': 'group'}],
+    'syncTaskBean': {'update': [{'id': 'task1', 'projectId': 'project', 'title': 'One', 'progress': 0.5,
+                                 'items': [{'id': 'item', 'title': 'Sub', 'status': 0}], 'tags': ['home']},
+                                {'id': 'task2', 'projectId': 'project', 'title': 'Two "quoted"'}],
+                     'delete': [], 'add': [], 'empty': False},
+    'tags': [{'name': 'home', 'label': 'Home'}],
+    'filters': [{'id': 'filter', 'rule': '{}'}],
+    'checks': None
+}
+BODY = json.dumps(SYNC).encode()
+
+
+def feed(parser: SyncStreamParser, body: bytes, size: int) -> dict:
+    for start in range(0, len(body), size):
+        parser.feed(body[start:start + size])
+    return parser.close()
+
+
+def make_response(body: bytes, status: int = 200) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.raw = HTTPResponse(body=io.BytesIO(body), status=status, preload_content=False)
+    return response
+
+
+@pytest.fixture
+def streaming_client():
+    with patch('ticktick.oauth2.OAuth2.get_access_token'):
+        oauth = OAuth2(client_id=str(uuid.uuid4()), client_secret=str(uuid.uuid4()), redirect_uri=str(uuid.uuid4()))
+    with patch('ticktick.api.TickTickClient._prepare_session'):
+        yield TickTickClient(str(uuid.uuid4()), str(uuid.uuid4()), oauth, stream_sync=True)
+
+
+class TestSyncStreamParser:
+
+    @pytest.mark.parametrize('size', [1, 7, len(BODY)])
+    def test_matches_json(self, size):
+        """
+        Tests the streamed lists and top level values match the parsed body whatever the chunk size
+        """
+        parser = SyncStreamParser()
+        response = feed(parser, BODY, size)
+        assert response['checkPoint'] == 42
+        assert response['inboxId'] == 'inbox123'
+        assert response['checks'] is None
+        assert 'filters' not in response
+        for key in ('projectGroups', 'projectProfiles', 'tags'):
+            assert response[key] == SYNC[key]
+        assert response['syncTaskBean'] == {'update': SYNC['syncTaskBean']['update']}
+        assert parser.bytes_read == len(BODY)
+
+    def test_convert(self):
+        """
+        Tests objects are converted as soon as they are built
+        """
+        parser = SyncStreamParser(convert=lambda search, obj: (search, obj.get('id', obj.get('name'))))
+        response = feed(parser, BODY, 16)
+        assert response['syncTaskBean']['update'] == [('tasks', 'task1'), ('tasks', 'task2')]
+        assert response['tags'] == [('tags', 'home')]
+
+    def test_truncated_body(self):
+        with pytest.raises(ijson.JSONError):
+            feed(SyncStreamParser(), BODY[:-20], 64)
+
+
+class TestStreamedSync:
+
+    def test_sync_fills_state(self, streaming_client):
+        """
+        Tests a full sync streams the body into state and later syncs load deltas normally
+        """
+        with patch.object(streaming_client._session, 'get', return_value=make_response(BODY)) as mock_get:
+            streaming_client.sync()
+        assert mock_get.call_args[1]['stream'] is True
+        assert streaming_client.inbox_id == 'inbox123'
+        assert streaming_client._checkpoint == 42
+        assert streaming_client.state['tasks'] == SYNC['syncTaskBean']['update']
+        assert streaming_client.state['project_folders'] == SYNC['projectGroups']
+        assert streaming_client.get_by_fields(name='home', search='tags') == SYNC['tags'][0]
+
+        delta = {'checkPoint': 43, 'syncTaskBean': {'update': [], 'delete': [{'taskId': 'task2'}]}}
+        with patch('ticktick.api.TickTickClient.http_get', return_value=delta):
+            streaming_client.sync()
+        assert [task['id'] for task in streaming_client.state['tasks']] == ['task1']
+
+    def test_failed_sync_closes_response(self, streaming_client):
+        """
+        Tests a non 200 full sync raises with the response read and closed
+        """
+        response = make_response(b'{"errorCode": "unknown"}', status=500)
+        with patch.object(streaming_client._session, 'get', return_value=response):
+            with pytest.raises(RuntimeError):
+                streaming_client.sync()
+        assert response.raw.closed
+        assert response.content == b'{"errorCode": "unknown"}'
+
+    def test_failed_parse_closes_response(self, streaming_client):
+        """
+        Tests the response is closed when parsing the streamed body fails
+        """
+        response = make_response(b'{"checkPoint": ]' + BODY)
+        with patch.object(streaming_client._session, 'get', return_value=response):
+            with pytest.raises(ijson.JSONError):
+                streaming_client.sync()
+        assert response.raw.closed
+
+    def test_compact_records(self, streaming_client):
+        """
+        Tests a compact client stores records built while streaming
+        """
+        streaming_client.compact = True
+        with patch.object(streaming_client._session, 'get', return_value=make_response(BODY)):
+            streaming_client.sync()
+        assert isinstance(streaming_client.state['tasks'][0], TaskRecord)
+        assert to_plain(streaming_client.state['tasks']) == SYNC['syncTaskBean']['update']
+
+    def test_bytes_reported(self, streaming_client):
+        """
+        Tests the hooks get the size of the streamed body
+        """
+        events = []
+        streaming_client.hooks.add(events.append)
+        with patch.object(streaming_client._session, 'get', return_value=make_response(BODY)):
+            streaming_client.sync()
+        assert events[-1].bytes_received == len(BODY)
+        assert events[-1].wire_bytes_received == len(BODY)
+
+    def test_async_sync(self, run_async):
+        """
+        Tests the async client streams a full sync
+        """
+        httpx = pytest.importorskip('httpx')
+        from ticktick.async_api import AsyncTickTickClient
+
+        with patch('ticktick.oauth2.OAuth2.get_access_token'):
+            oauth = OAuth2(client_id=str(uuid.uuid4()), client_secret=str(uuid.uuid4()),
+                           redirect_uri=str(uuid.uuid4()))
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=BODY))
+        client = AsyncTickTickClient(str(uuid.uuid4()), str(uuid.uuid4()), oauth, transport=transport,
+                                     stream_sync=True)
+
+        async def run():
+            response = await client.sync()
+            await client.aclose()
+            return response
+
+        assert run_async(run())['checkPoint'] == 42
+        assert client.state['tasks'] == SYNC['syncTaskBean']['update']
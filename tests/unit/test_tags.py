@@ -0,0 +1,170 @@
+"""
+Unit test module for tags.py
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture
+def tags(fake_client):
+    """
+    Adds tags to the fake client's state and removes them afterwards
+    """
+    objects = [{'name': name, 'label': name.title(), 'etag': name + '-etag'}
+               for name in ('work', 'school', 'hobbies', 'movies')]
+    fake_client._upsert_into_local_state('tags', 'name', objects)
+    yield objects
+    fake_client.delete_all_from_local_state('tags', 'name', [obj['name'] for obj in objects])
+
+
+class TestDelete:
+
+    def test_delete_concurrently_with_one_sync(self, fake_client, tags):
+        """
+        Tests tags are deleted with several requests in flight and the state is synced once
+        """
+        in_flight = []
+        most = []
+        lock = threading.Lock()
+
+        def delete(url, **kwargs):
+            with lock:
+                in_flight.append(kwargs['params']['name'])
+                most.append(len(in_flight))
+            time.sleep(0.05)
+            with lock:
+                in_flight.remove(kwargs['params']['name'])
+            return {}
+
+        with patch('ticktick.api.TickTickClient.http_delete', side_effect=delete), \
+                patch('ticktick.api.TickTickClient.sync') as mock_sync:
+            deleted = fake_client.tag.delete(['Work', 'School', 'Hobbies'], workers=2)
+
+        assert deleted == tags[:3]
+        assert max(most) == 2
+        mock_sync.assert_called_once()
+        assert not fake_client.get_by_fields(name='work', search='tags')
+        assert fake_client.get_by_fields(name='movies', search='tags') == tags[3]
+
+    def test_bulk_delete_reports_failures(self, fake_client, tags):
+        """
+        Tests a failed request is reported for its tag and the tag is kept in the state
+        """
+        error = RuntimeError('Could Not Complete Request')
+
+        with patch('ticktick.api.TickTickClient.http_delete', side_effect=[{}, error]), \
+                patch('ticktick.api.TickTickClient.sync'):
+            results = fake_client.tag.bulk_delete(['Work', 'School'])
+
+        assert results == [{'tag': tags[0], 'error': None}, {'tag': tags[1], 'error': error}]
+        assert not fake_client.get_by_fields(name='work', search='tags')
+        assert fake_client.get_by_fields(name='school', search='tags') == tags[1]
+
+        with patch('ticktick.api.TickTickClient.http_delete', side_effect=error), \
+                patch('ticktick.api.TickTickClient.sync'):
+            with pytest.raises(RuntimeError):
+                fake_client.tag.delete('School')
+
+
+class TestMerge:
+
+    def test_merge_results(self, fake_client, tags):
+        """
+        Tests every merged tag gets a result and the state is synced once
+        """
+        with patch('ticktick.api.TickTickClient.http_put', return_value={}) as mock_put, \
+                patch('ticktick.api.TickTickClient.sync') as mock_sync:
+            results = fake_client.tag.bulk_merge(['School', 'Hobbies', 'Movies'], 'Work', workers=3)
+
+        assert [result['tag']['name'] for result in results] == ['school', 'hobbies', 'movies']
+        assert all(result['error'] is None for result in results)
+        assert sorted(call[1]['json']['name'] for call in mock_put.call_args_list) == ['hobbies', 'movies', 'school']
+        mock_sync.assert_called_once()
+
+    def test_merge_removes_merged_tags(self, fake_client, tags):
+        """
+        Tests merged tags are removed from the state and a tag that failed to merge is kept
+        """
+        with patch('ticktick.api.TickTickClient.http_put', side_effect=[{}, RuntimeError('Failed')]), \
+                patch('ticktick.api.TickTickClient.sync'):
+            fake_client.tag.bulk_merge(['School', 'Hobbies'], 'Work')
+
+        assert not fake_client.get_by_fields(name='school', search='tags')
+        assert fake_client.get_by_fields(name='hobbies', search='tags') == tags[2]
+        assert fake_client.get_by_fields(name='work', search='tags') == tags[0]
+
+    def test_merge_raises_failure(self, fake_client, tags):
+        """
+        Tests merge raises when one of the requests failed
+        """
+        with patch('ticktick.api.TickTickClient.http_put', side_effect=[{}, RuntimeError('Failed')]), \
+                patch('ticktick.api.TickTickClient.sync'):
+            with pytest.raises(RuntimeError):
+                fake_client.tag.merge(['School', 'Hobbies'], 'Work')
+
+
+class TestLocalPatching:
+
+    def test_color_sets_etag_without_sync(self, fake_client, tags):
+        """
+        Tests changing the color patches the tag in the state with the returned etag
+        """
+        with patch('ticktick.api.TickTickClient.http_post', return_value={'id2etag': {'work': 'new-etag'},
+                                                                          'id2error': {}}), \
+                patch('ticktick.api.TickTickClient.sync') as mock_sync:
+            updated = fake_client.tag.color('Work', '#134397')
+
+        mock_sync.assert_not_called()
+        assert updated is tags[0]
+        assert updated['color'] == '#134397'
+        assert fake_client.get_by_etag('new-etag', search='tags') is updated
+        assert not fake_client.get_by_etag('work-etag', search='tags')
+
+    def test_sync_when_not_confirmed(self, fake_client, tags):
+        """
+        Tests a response without the new etag falls back to a sync
+        """
+        with patch('ticktick.api.TickTickClient.http_post', return_value={'id2etag': {}, 'id2error': {}}), \
+                patch('ticktick.api.TickTickClient.sync') as mock_sync:
+            updated = fake_client.tag.sorting('Work', 1)
+
+        mock_sync.assert_called_once()
+        assert updated['sortType'] == 'dueDate'
+
+    def test_nesting_updates_parent_index(self, fake_client, tags):
+        """
+        Tests nesting patches both tags and the child can be found by its new parent
+        """
+        response = {'id2etag': {'work': 'work-2', 'school': 'school-2'}, 'id2error': {}}
+        with patch('ticktick.api.TickTickClient.http_post', return_value=response), \
+                patch('ticktick.api.TickTickClient.sync') as mock_sync:
+            child = fake_client.tag.nesting('School', 'Work')
+
+        mock_sync.assert_not_called()
+        assert child['etag'] == 'school-2'
+        assert fake_client.get_by_fields(parent='work', search='tags') is child
+
+    def test_rename_updates_tags_and_tasks(self, fake_client, tags):
+        """
+        Tests renaming patches the tag, its nested tags and the tags of the tasks
+        """
+        task = {'id': 'renamed-tag-task', 'tags': ['school', 'work']}
+        fake_client._upsert_into_local_state('tasks', 'id', [task])
+        fake_client.patch_local_state('tags', tags[2], {'parent': 'school'})
+
+        with patch('ticktick.api.TickTickClient.http_put', return_value=''), \
+                patch('ticktick.api.TickTickClient.sync') as mock_sync:
+            renamed = fake_client.tag.rename('School', 'Classes')
+
+        mock_sync.assert_not_called()
+        assert renamed is tags[1]
+        assert (renamed['name'], renamed['label']) == ('classes', 'Classes')
+        assert tags[2]['parent'] == 'classes'
+        assert task['tags'] == ['classes', 'work']
+        assert fake_client.get_by_fields(name='classes', search='tags') is renamed
+        fake_client.delete_all_from_local_state('tags', 'name', ['classes'])
+        fake_client.delete_all_from_local_state('tasks', 'id', [task['id']])
@@ -6,7 +6,7 @@ import pytest
 import uuid
 import datetime
 
-from ticktick.helpers.time_methods import convert_date_to_tick_tick_format
+from ticktick.helpers.time_methods import convert_date_to_tick_tick_format, convert_dates_to_tick_tick_format
 from ticktick.managers.tasks import TaskManager
 from unittest.mock import patch
 
@@ -248,6 +248,70 @@ class TestDelete:
         with patch('ticktick.api.TickTickClient.http_post', return_value={}):
             assert task_client.delete(tasks) == tasks
 
+    def test_bulk_delete_chunks_and_updates_state(self, task_client):
+        """
+        Tests tasks are deleted in chunks and removed from the local state without syncing
+        """
+        tasks = [{'id': str(uuid.uuid4()), 'projectId': 'p'} for _ in range(5)]
+        task_client._client._upsert_into_local_state('tasks', 'id', tasks)
+        failed = {'id2error': {tasks[4]['id']: 'TASK_NOT_FOUND'}}
+
+        with patch('ticktick.api.TickTickClient.http_post', side_effect=[{}, {}, failed]) as mock_post, \
+                patch('ticktick.api.TickTickClient.sync') as mock_sync:
+            results = task_client.bulk_delete(tasks, chunk_size=2, workers=2)
+
+        assert [len(call[1]['json']['delete']) for call in mock_post.call_args_list] == [2, 2, 1]
+        assert [result['ids'] for result in results] == [[tasks[0]['id'], tasks[1]['id']],
+                                                        [tasks[2]['id'], tasks[3]['id']], [tasks[4]['id']]]
+        assert results[2]['id2error'] == failed['id2error']
+        mock_sync.assert_not_called()
+        # The task TickTick reported an error for is kept
+        assert task_client._client.get_by_id(tasks[4]['id'], search='tasks') == tasks[4]
+        assert all(not task_client._client.get_by_id(task['id'], search='tasks') for task in tasks[:4])
+        task_client._client.delete_all_from_local_state('tasks', 'id', [tasks[4]['id']])
+
+    def test_delete_failed_chunk(self, task_client):
+        """
+        Tests the other chunks are still deleted locally when one request fails, and the error is raised
+        """
+        tasks = [{'id': str(uuid.uuid4()), 'projectId': 'p'} for _ in range(2)]
+        task_client._client._upsert_into_local_state('tasks', 'id', tasks)
+
+        with patch('ticktick.api.TickTickClient.http_post', side_effect=[RuntimeError('Failed'), {}]):
+            with pytest.raises(RuntimeError):
+                task_client.delete(tasks, chunk_size=1)
+
+        assert task_client._client.get_by_id(tasks[0]['id'], search='tasks') == tasks[0]
+        assert not task_client._client.get_by_id(tasks[1]['id'], search='tasks')
+        task_client._client.delete_all_from_local_state('tasks', 'id', [tasks[0]['id']])
+
+    def test_bulk_delete_evicts_subtasks(self, task_client):
+        """
+        Tests deleting a parent also removes its subtasks at any depth from the local state
+        """
+        parent = {'id': str(uuid.uuid4()), 'projectId': 'p'}
+        child = {'id': str(uuid.uuid4()), 'projectId': 'p', 'parentId': parent['id']}
+        grandchild = {'id': str(uuid.uuid4()), 'projectId': 'p', 'parentId': child['id']}
+        other = {'id': str(uuid.uuid4()), 'projectId': 'p'}
+        task_client._client._upsert_into_local_state('tasks', 'id', [parent, child, grandchild, other])
+
+        with patch('ticktick.api.TickTickClient.http_post', return_value={}):
+            task_client.bulk_delete([parent])
+
+        assert all(not task_client._client.get_by_id(task['id'], search='tasks')
+                   for task in (parent, child, grandchild))
+        assert task_client._client.get_by_id(other['id'], search='tasks') == other
+        task_client._client.delete_all_from_local_state('tasks', 'id', [other['id']])
+
+    def test_bulk_delete_bad_arguments(self, task_client):
+        """
+        Tests the chunk size and tasks are checked
+        """
+        with pytest.raises(ValueError):
+            task_client.bulk_delete([], chunk_size=0)
+        with pytest.raises(TypeError):
+            task_client.bulk_delete(['id'])
+
 
 class TestBuilder:
 
@@ -469,3 +533,232 @@ class TestGetCompleted:
         tz = 'THIS AINT IT CHIEF'
         with pytest.raises(KeyError):
             fake_client.task.get_completed(start, end, tz=tz)
+
+    def test_get_completed_pages_until_exhausted(self, fake_client):
+        """
+        Tests get_completed keeps asking for older pages until one comes back short, dropping repeated tasks
+        """
+        def completed(number, hour):
+            return {'id': str(number), 'completedTime': f'2020-12-14T{hour:02d}:00:00.000+0000'}
+
+        first = [completed(number, 20) for number in range(99)] + [completed(99, 10)]
+        second = [completed(99, 10)] + [completed(number, 5) for number in range(100, 120)]
+        with patch('ticktick.api.TickTickClient.http_get', side_effect=[first, second]) as mock_get:
+            tasks = fake_client.task.get_completed(datetime.datetime(2020, 12, 14), tz='UTC')
+        assert [task['id'] for task in tasks] == [str(number) for number in range(120)]
+        assert mock_get.call_count == 2
+        assert mock_get.call_args_list[1][1]['params']['to'] == '2020-12-14 10:00:00'
+
+    def test_get_completed_full_second_warns(self, fake_client, caplog):
+        """
+        Tests a full page completed in one second moves past that second with a warning
+        """
+        page = [{'id': str(number), 'completedTime': '2020-12-14T10:00:00.000+0000'} for number in range(100)]
+        with patch('ticktick.api.TickTickClient.http_get', side_effect=[page, page, []]) as mock_get:
+            tasks = fake_client.task.get_completed(datetime.datetime(2020, 12, 14), tz='UTC')
+        assert len(tasks) == 100
+        assert mock_get.call_args_list[2][1]['params']['to'] == '2020-12-14 09:59:59'
+        assert 'skipped' in caplog.text
+
+    def test_get_completed_windows(self, fake_client):
+        """
+        Tests long ranges are split into windows fetched newest first, in parallel when asked
+        """
+        requested = []
+
+        def fake_get(url, params, **kwargs):
+            requested.append((params['from'], params['to']))
+            return [{'id': params['to'], 'completedTime': '2020-12-14T10:00:00.000+0000'}]
+
+        start = datetime.datetime(2020, 12, 1)
+        end = datetime.datetime(2020, 12, 10)
+        with patch('ticktick.api.TickTickClient.http_get', side_effect=fake_get):
+            tasks = fake_client.task.get_completed(start, end, tz='UTC', window=datetime.timedelta(days=4),
+                                                   workers=3)
+        assert sorted(requested, reverse=True) == [('2020-12-06 23:59:59', '2020-12-10 23:59:59'),
+                                                   ('2020-12-02 23:59:58', '2020-12-06 23:59:58'),
+                                                   ('2020-12-01 00:00:00', '2020-12-02 23:59:57')]
+        assert [task['id'] for task in tasks] == [to for _, to in sorted(requested, reverse=True)]
+
+    def test_get_completed_invalid_window(self, fake_client):
+        """
+        Tests a non positive window or worker count raises ValueError
+        """
+        start = datetime.datetime(2020, 12, 14)
+        with pytest.raises(ValueError):
+            fake_client.task.get_completed(start, window=datetime.timedelta(0))
+        with pytest.raises(ValueError):
+            fake_client.task.get_completed(start, workers=0)
+
+
+class TestBulkCreate:
+
+    @patch('ticktick.api.TickTickClient.sync')
+    def test_bulk_create_chunks(self, mock_sync, fake_client):
+        """
+        Tests tasks are sent in chunks through batch/task, results are merged and state is synced once
+        """
+        tasks = [{'title': str(number)} for number in range(5)] + [{'id': 'given', 'projectId': 'inbox'}]
+
+        def fake_post(url, json, **kwargs):
+            ids = [task['id'] for task in json['add']]
+            return {'id2etag': {task_id: 'etag' for task_id in ids[1:]}, 'id2error': {ids[0]: 'EXCEED_QUOTA'}}
+
+        with patch('ticktick.api.TickTickClient.http_post', side_effect=fake_post) as mock_post:
+            result = fake_client.task.bulk_create(tasks, chunk_size=4, workers=2)
+        assert mock_post.call_count == 2
+        assert mock_sync.call_count == 1
+        sent = [task for call in mock_post.call_args_list for task in call[1]['json']['add']]
+        assert mock_post.call_args[0][0].endswith('batch/task')
+        assert [task.get('title') for task in sent] == [task.get('title') for task in tasks]
+        assert all(len(task['id']) == 24 for task in sent[:5])
+        assert sent[5]['id'] == 'given'
+        assert {task['projectId'] for task in sent} == {fake_client.inbox_id}
+        assert 'id' not in tasks[0]
+        assert len(result['id2etag']) == 4
+        assert set(result['id2error']) == {sent[0]['id'], sent[4]['id']}
+
+    def test_bulk_create_failed_chunk_error_kept(self, fake_client):
+        """
+        Tests the error of a failed chunk is raised even when the sync after it fails too
+        """
+        error = RuntimeError('Could Not Complete Request')
+        with patch('ticktick.api.TickTickClient.http_post', side_effect=[{}, error]), \
+                patch('ticktick.api.TickTickClient.sync', side_effect=RuntimeError('Sync Failed')) as mock_sync:
+            with pytest.raises(RuntimeError) as raised:
+                fake_client.task.bulk_create([{'title': 'one'}, {'title': 'two'}], chunk_size=1)
+        assert raised.value is error
+        mock_sync.assert_called_once()
+
+    def test_bulk_create_invalid_arguments(self, fake_client):
+        """
+        Tests bad arguments raise before anything is sent
+        """
+        with pytest.raises(TypeError):
+            fake_client.task.bulk_create({'title': 'not a list'})
+        with pytest.raises(ValueError):
+            fake_client.task.bulk_create([{'title': 'task'}], chunk_size=0)
+
+
+class TestHierarchy:
+
+    @pytest.fixture
+    def tree(self, task_client):
+        """
+        Adds the tree root -> (a -> a1), (b -> b1 -> b2) to the state and removes it afterwards
+        """
+        ids = ['root', 'a', 'a1', 'b', 'b1', 'b2']
+        parents = {'a': 'root', 'a1': 'a', 'b': 'root', 'b1': 'b', 'b2': 'b1'}
+        tasks = {task_id: {'id': task_id, 'title': task_id} for task_id in ids}
+        for task_id, parent in parents.items():
+            tasks[task_id]['parentId'] = parent
+        # Listed out of outline order on purpose
+        task_client._client._upsert_into_local_state('tasks', 'id', [tasks[i] for i in ('b2', 'a', 'root', 'b1',
+                                                                                        'a1', 'b')])
+        yield tasks
+        task_client._client.delete_all_from_local_state('tasks', 'id', ids)
+
+    def test_children(self, task_client, tree):
+        """
+        Tests children returns the direct subtasks in state order
+        """
+        assert task_client.children('root') == [tree['a'], tree['b']]
+        assert task_client.children('a1') == []
+
+    def test_descendants_outline_order(self, task_client, tree):
+        """
+        Tests descendants returns each task right before its own subtasks
+        """
+        assert [task['id'] for task in task_client.descendants('root')] == ['a', 'a1', 'b', 'b1', 'b2']
+
+    def test_ancestors(self, task_client, tree):
+        """
+        Tests ancestors walks up to the top level task
+        """
+        assert [task['id'] for task in task_client.ancestors('b2')] == ['b1', 'b', 'root']
+        assert task_client.ancestors('root') == []
+
+    def test_index_follows_patches(self, task_client, tree):
+        """
+        Tests moving a subtask through a local patch is seen by the next query
+        """
+        task_client._client.patch_local_state('tasks', tree['b1'], {'parentId': 'a'})
+        assert task_client.children('a') == [tree['b1'], tree['a1']]
+        assert task_client.children('b') == []
+
+    def test_cycle_and_missing_task(self, task_client, tree):
+        """
+        Tests a parentId cycle doesn't loop forever and unknown ids raise
+        """
+        task_client._client.patch_local_state('tasks', tree['root'], {'parentId': 'b2'})
+        assert len(task_client.descendants('root')) == 5
+        assert [task['id'] for task in task_client.ancestors('b')] == ['root', 'b2', 'b1']
+        with pytest.raises(ValueError):
+            task_client.children('missing')
+        with pytest.raises(TypeError):
+            task_client.descendants(None)
+
+
+class TestBulkDates:
+
+    def test_matches_dates(self, task_client):
+        """
+        Tests bulk_dates returns what dates returns for each pair
+        """
+        starts = [datetime.datetime(2027, 3, 27), datetime.datetime(2027, 12, 31), datetime.datetime(2027, 1, 5, 14)]
+        dues = [datetime.datetime(2027, 3, 31), None, datetime.datetime(2027, 1, 5, 15)]
+        expected = [task_client.dates(start, due, 'US/Pacific') for start, due in zip(starts, dues)]
+        assert task_client.bulk_dates(starts, dues, 'US/Pacific') == expected
+        with patch('ticktick.managers.tasks.numpy', None):
+            assert task_client.bulk_dates(starts, dues, 'US/Pacific') == expected
+
+    def test_converted_as_array(self, task_client):
+        """
+        Tests the dates are converted as one datetime64 array when numpy is installed
+        """
+        numpy = pytest.importorskip('numpy')
+        starts = [datetime.datetime(2027, 1, 5, 14, 30, 15, 999), datetime.datetime(2027, 7, 5, 9)]
+        with patch('ticktick.managers.tasks.convert_dates_to_tick_tick_format',
+                   wraps=convert_dates_to_tick_tick_format) as mock_convert:
+            dates = task_client.bulk_dates(starts, tz='US/Pacific')
+        converted = mock_convert.call_args[0][0]
+        assert isinstance(converted, numpy.ndarray) and converted.dtype == numpy.dtype('datetime64[s]')
+        assert dates == [task_client.dates(start, tz='US/Pacific') for start in starts]
+
+    def test_dues_length(self, task_client):
+        """
+        Tests dues must pair up with the starts
+        """
+        with pytest.raises(ValueError):
+            task_client.bulk_dates([datetime.datetime(2027, 3, 27)], [], 'US/Pacific')
+
+
+class TestBetween:
+
+    def test_local_range(self, task_client):
+        """
+        Tests the range is read in the time zone and all day tasks end before their due date
+        """
+        tasks = [{'id': 'between-meeting', 'startDate': '2027-03-05T17:00:00.000+0000',
+                  'dueDate': '2027-03-05T18:00:00.000+0000'},
+                 {'id': 'between-all-day', 'startDate': '2027-03-04T08:00:00.000+0000',
+                  'dueDate': '2027-03-05T08:00:00.000+0000', 'isAllDay': True}]
+        task_client._client._upsert_into_local_state('tasks', 'id', tasks)
+        try:
+            day = datetime.datetime(2027, 3, 5)
+            assert task_client.between(day, day.replace(hour=23, minute=59), 'US/Pacific') == [tasks[0]]
+            assert task_client.between(day.replace(day=4), day, 'US/Pacific') == [tasks[1]]
+        finally:
+            task_client._client.delete_all_from_local_state('tasks', 'id', [task['id'] for task in tasks])
+
+    def test_bad_arguments(self, task_client):
+        """
+        Tests the range and time zone are checked
+        """
+        day = datetime.datetime(2027, 3, 5)
+        with pytest.raises(TypeError):
+            task_client.between('2027-03-05', day, 'US/Pacific')
+        with pytest.raises(ValueError):
+            task_client.between(day, day.replace(day=4), 'US/Pacific')
+        with pytest.raises(KeyError):
+            task_client.between(day, day, 'Not/AZone')
@@ -1,7 +1,12 @@
 """Testing module for local timezone to UTC conversion"""
 
-from datetime import datetime
-from ticktick.helpers.time_methods import convert_local_time_to_utc, convert_date_to_tick_tick_format
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytz
+
+from ticktick.helpers.time_methods import convert_local_time_to_utc, convert_date_to_tick_tick_format, \
+    convert_dates_to_tick_tick_format, parse_tick_tick_date, parse_tick_tick_dates
 
 
 def test_pacific_time():
@@ -45,3 +50,87 @@ def test_convert_iso_to_tick_tick_2():
     expected = '2022-12-31T08:00:00+0000'
     assert convert_date_to_tick_tick_format(date, 'US/Pacific') == expected
 
+
+
+def _reference_local_time_to_utc(original_time, time_zone):
+    """The original strftime/strptime implementation the fast path has to match"""
+    time_object = datetime.strptime(original_time.strftime('%Y-%m-%d %H:%M:%S'), '%Y-%m-%d %H:%M:%S')
+    return pytz.timezone(time_zone).localize(time_object).astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def test_matches_reference_conversion():
+    zones = ['US/Pacific', 'Europe/London', 'Asia/Kolkata', 'Australia/Lord_Howe', 'UTC', 'Etc/GMT+12']
+    times = [datetime(2021, 3, 14, 2, 30), datetime(2021, 11, 7, 1, 30), datetime(2021, 3, 28, 1, 15, 5, 999999),
+             datetime(2020, 2, 29, 23, 59, 59, 1), datetime(1999, 12, 31, 23, 0), datetime(2022, 6, 1, 12, 0)]
+    for zone in zones:
+        for time in times:
+            expected = _reference_local_time_to_utc(time, zone)
+            assert convert_local_time_to_utc(time, zone) == expected
+            assert convert_date_to_tick_tick_format(time, zone) == expected.strftime('%Y-%m-%dT%H:%M:%S+0000')
+
+
+def test_attached_tzinfo_ignored():
+    aware = datetime(2020, 12, 14, 1, 19, tzinfo=timezone.utc)
+    assert convert_local_time_to_utc(aware, 'US/Pacific') == datetime(2020, 12, 14, 9, 19)
+
+
+def test_unknown_time_zone():
+    with pytest.raises(pytz.UnknownTimeZoneError):
+        convert_local_time_to_utc(datetime(2020, 1, 1), 'Not/AZone')
+
+
+def test_matches_reference_around_transitions():
+    for zone in ['US/Pacific', 'Europe/Dublin', 'Australia/Lord_Howe', 'America/Sao_Paulo', 'Asia/Tehran']:
+        for transition in pytz.timezone(zone)._utc_transition_times[-60:-40]:
+            for minutes in range(-24 * 60 - 30, 24 * 60 + 31, 30):
+                time = transition + timedelta(minutes=minutes)
+                assert convert_local_time_to_utc(time, zone) == _reference_local_time_to_utc(time, zone)
+
+
+def test_batch_matches_single_conversion():
+    times = [datetime(2021, 3, 14, 2, 30), datetime(2021, 11, 7, 1, 30), datetime(2022, 12, 31, 14, 30, 45)]
+    expected = [convert_date_to_tick_tick_format(time, 'US/Pacific') for time in times]
+    assert convert_dates_to_tick_tick_format(times, 'US/Pacific') == expected
+
+
+def test_parse_tick_tick_dates():
+    strings = ['2022-12-31T22:30:45.000+0000', '2022-12-31T22:30:45+0000', '2022-12-31T23:30:45.500+0100']
+    assert parse_tick_tick_dates(strings) == [datetime(2022, 12, 31, 22, 30, 45)] * 2 + \
+        [datetime(2022, 12, 31, 22, 30, 45, 500000)]
+    assert parse_tick_tick_dates(strings[:1], 'US/Pacific') == [datetime(2022, 12, 31, 14, 30, 45)]
+    with pytest.raises(ValueError):
+        parse_tick_tick_dates(['2022-12-31'])
+
+
+def test_batch_datetime64():
+    numpy = pytest.importorskip('numpy')
+    times = [datetime(2021, 3, 14, 2, 30), datetime(2021, 11, 7, 1, 30, 59, 999), datetime(1999, 1, 1)]
+    for transition in pytz.timezone('US/Pacific')._utc_transition_times[-60:-50]:
+        times += [transition + timedelta(minutes=minutes) for minutes in range(-1500, 1500, 45)]
+    expected = convert_dates_to_tick_tick_format(times, 'US/Pacific')
+
+    converted = convert_dates_to_tick_tick_format(numpy.array(times, dtype='datetime64[us]'), 'US/Pacific')
+    assert converted.tolist() == expected
+    assert convert_dates_to_tick_tick_format(numpy.array(['NaT'], dtype='datetime64[s]'), 'UTC').tolist() == [None]
+
+    for tz in (None, 'US/Pacific', 'Etc/GMT+12'):
+        parsed = parse_tick_tick_dates(numpy.array(expected), tz)
+        assert parsed.dtype == numpy.dtype('datetime64[ms]')
+        assert parsed.astype(object).tolist() == parse_tick_tick_dates(expected, tz)
+
+
+def test_parse_tick_tick_date_matches_strptime():
+    strings = ['2021-06-17T01:44:07.000+0000', '2021-06-17T01:44:07+0000', '2021-06-17T01:44:07.123456+0530',
+               '2021-06-17T01:44:07.5-0800', '2020-02-29T23:59:59.999+0000']
+    for string in strings:
+        fmt = '%Y-%m-%dT%H:%M:%S.%f%z' if '.' in string else '%Y-%m-%dT%H:%M:%S%z'
+        expected = datetime.strptime(string, fmt).astimezone(pytz.utc).replace(tzinfo=None)
+        assert parse_tick_tick_date(string) == expected
+    assert parse_tick_tick_date(None) is None
+    assert parse_tick_tick_date('') is None
+
+
+def test_parse_tick_tick_date_invalid():
+    for string in ['2021-06-17', '2021-13-17T01:44:07.000+0000', '2021-06-17T01:44:07.000Z', '２021-06-17T01:44:07+0000']:
+        with pytest.raises(ValueError):
+            parse_tick_tick_date(string)
@@ -1,3 +1,12 @@
+import hashlib
+import secrets
+
+from contextlib import closing, contextmanager
+from ticktick.cache import SnapshotHandler
+from ticktick.circuit_breaker import CircuitBreakers, is_failure
+from ticktick.helpers.compression import compress_json
+from ticktick.helpers.sync_stream import CHUNK_SIZE, SyncStreamParser, require_ijson
+from ticktick.hooks import RequestHooks
 from ticktick.managers.focus import FocusTimeManager
 from ticktick.managers.habits import HabitManager
 from ticktick.managers.pomo import PomoManager
@@ -6,6 +15,8 @@ from ticktick.managers.settings import SettingsManager
 from ticktick.managers.tags import TagsManager
 from ticktick.managers.tasks import TaskManager
 from ticktick.oauth2 import OAuth2
+from ticktick.records import to_plain, to_records, to_record
+from ticktick.state_index import StateIndex
 
 
 class TickTickClient:
@@ -15,6 +26,8 @@ class TickTickClient:
 
     INITIAL_BATCH_URL = BASE_URL + 'batch/check/0'
 
+    SYNC_URL = BASE_URL + 'batch/check/'
+
     USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:95.0) Gecko/20100101 Firefox/95.0"
     X_DEVICE_ = '{"platform":"web","os":"OS X","device":"Firefox 95.0","name":"unofficial api!","version":4531,' \
                 '"id":"6490' + secrets.token_hex(10) + '","channel":"website","campaign":"","websocket":""}'
@@ -24,7 +37,14 @@ class TickTickClient:
 
     OAuth_Mode = False
 
-    def __init__(self, username: str, password: str, oauth: OAuth2) -> None:
+    def __init__(self,
+                 username: str,
+                 password: str,
+                 oauth: OAuth2,
+                 snapshot_path: str = None,
+                 compact: bool = False,
+                 compress_requests: int = None,
+                 stream_sync: bool = False) -> None:
         """
         Initializes a client session. If username and password are provided, the client will log in to TickTick.
         Otherwise, only the OAuth2/OpenAPI access will be initialized.
@@ -33,25 +53,30 @@ class TickTickClient:
         These include creating tasks, completing tasks, and getting tasks. If you want access to everything else
         (including the "state" dictionary), you must provide a username and password.
 
+        If `snapshot_path` is given, the client starts from the snapshot saved there by
+        [`save_snapshot`][api.TickTickClient.save_snapshot] and only syncs what changed since, instead of logging in
+        and downloading the whole account. The snapshot is written after the first full start.
+
+        !!! warning
+            The snapshot holds your session token and the contents of your account. Keep the file private.
+
         Arguments:
             username: TickTick Username
             password: TickTick Password
             oauth: OAuth2 manager
+            snapshot_path: Path of the snapshot file to start from and save to.
+            compact: Store the objects in [`state`](api.md#state) as memory saving [records](records.md) instead of
+                dictionaries.
+            compress_requests: Send json bodies of at least this many bytes gzip compressed. None never compresses.
+                Responses are always asked for compressed.
+            stream_sync: Parse the response of a full sync as it downloads instead of loading it whole, which
+                lowers the peak memory for large accounts. Requires `ijson` -> `pip install ticktick-py[stream]`.
 
         Raises:
             RunTimeError: If the login was not successful.
+            ImportError: If `stream_sync` is set and ijson is not installed.
         """
-        # Class members
-
-        self.access_token = None
-        self.cookies = {}
-        self.time_zone = ''
-        self.profile_id = ''
-        self.inbox_id = ''
-        self.state = {}
-        self.reset_local_state()
-        self.oauth_manager = oauth
-        self._session = self.oauth_manager.session
+        self._init_members(oauth, snapshot_path, compact, compress_requests, stream_sync)
 
         if username is None or password is None or username == '' or password == '':
             self.OAuth_Mode = True
@@ -63,13 +88,57 @@ class TickTickClient:
         else:
             self._prepare_session(username, password)
 
+    def _init_members(self, oauth: OAuth2, snapshot_path: str = None, compact: bool = False,
+                      compress_requests: int = None, stream_sync: bool = False) -> None:
+        """
+        Sets the class members that don't need a request to TickTick.
+        """
+        if stream_sync:
+            require_ijson()
+        self.compact = compact
+        self.compress_requests = compress_requests
+        self.stream_sync = stream_sync
+        self._snapshot = SnapshotHandler(snapshot_path) if snapshot_path else None
+        self._account = None
+        self.access_token = None
+        self.cookies = {}
+        self.time_zone = ''
+        self.profile_id = ''
+        self.inbox_id = ''
+        self.state = {}
+        self._index = StateIndex(self)
+        # Syncs requested inside a batch() block are held back until it exits
+        self._batch_depth = 0
+        self._deferred_sync = None
+        self.reset_local_state()
+        self.oauth_manager = oauth
+        self._session = self.oauth_manager.session
+        # Retry and rate limit policy of the session, None if the session was set up outside the library
+        self.retry_policy = getattr(self.oauth_manager, 'retry_policy', None)
+        # Fail fast on endpoint families that keep failing, see circuit_breaker.py
+        self.circuit_breakers = CircuitBreakers()
+        # Shared with the OAuth2 manager so one registration covers every request
+        self.hooks = getattr(self.oauth_manager, 'hooks', None)
+        if self.hooks is None:
+            self.hooks = RequestHooks()
+
     def _prepare_session(self, username, password):
         """
         Creates all the necessary calls to prepare the session
         """
-        self._login(username, password)
-        self._settings()
-        self.sync()
+        if self._restore_snapshot(username):
+            try:
+                self.sync()
+            except RuntimeError:
+                # The saved session expired -> log in again and keep catching up from the snapshot
+                self._login(username, password)
+                self.sync()
+        else:
+            self._login(username, password)
+            self._settings()
+            self.sync()
+            if self._snapshot is not None:
+                self.save_snapshot()
 
         # Mangers for the different operations
         self.focus = FocusTimeManager(self)
@@ -93,6 +162,58 @@ class TickTickClient:
             'user_settings': {},
             'profile': {}
         }
+        self._index.invalidate()
+        # Nothing is stored locally anymore, so the next sync has to download everything
+        self._checkpoint = 0
+
+    def save_snapshot(self) -> None:
+        """
+        Saves [`state`](api.md#state), the account details and the sync checkpoint to the `snapshot_path` given to
+        the client, so the next client created with it can skip the login and the full sync.
+
+        Saving before a short-lived process exits keeps the next start's catch-up sync small.
+
+        Raises:
+            RuntimeError: If the client was not created with a `snapshot_path`.
+        """
+        if self._snapshot is None:
+            raise RuntimeError('Client Was Not Created With A Snapshot Path')
+        self._snapshot.save({
+            'account': self._account,
+            'access_token': self.access_token,
+            'inbox_id': self.inbox_id,
+            'time_zone': self.time_zone,
+            'profile_id': self.profile_id,
+            'checkpoint': self._checkpoint,
+            'state': to_plain(self.state) if self.compact else self.state
+        })
+
+    def _restore_snapshot(self, username: str) -> bool:
+        """
+        Loads the snapshot saved for `username`, if there is one.
+
+        Returns:
+            Whether the client was restored from the snapshot.
+        """
+        # Only a digest of the username is stored, to tell accounts apart
+        self._account = hashlib.sha256(username.encode()).hexdigest()
+        if self._snapshot is None:
+            return False
+        snapshot = self._snapshot.load()
+        if snapshot is None or snapshot.get('account') != self._account:
+            return False
+
+        self.access_token = snapshot['access_token']
+        self.cookies['t'] = self.access_token
+        self.inbox_id = snapshot['inbox_id']
+        self.time_zone = snapshot['time_zone']
+        self.profile_id = snapshot['profile_id']
+        self.state = snapshot['state']
+        if self.compact:
+            self._compact_state()
+        self._index.invalidate()
+        self._checkpoint = snapshot['checkpoint']
+        return True
 
     def _login(self, username: str, password: str) -> None:
         """
@@ -152,12 +273,25 @@ class TickTickClient:
 
         return response
 
-    def sync(self):
+    def sync(self, full: bool = False):
         """
         Populates the `TickTickClient` [`state`](api.md#state) dictionary with the contents of your account.
 
+        The first sync downloads the whole account. Every later sync sends the checkpoint returned by the
+        previous one, so TickTick only returns what changed since then, and the changes are merged into
+        [`state`](api.md#state) in place.
+
         **This method is called when necessary by other methods and does not need to be explicitly called.**
 
+        Inside a [`batch`][api.TickTickClient.batch] block the sync is held back and nothing is returned.
+
+        !!! note
+            Projects, project folders and tags deleted from another device are not reported by a delta sync. Pass
+            `full=True` to download the whole account again and drop them.
+
+        Arguments:
+            full: Whether to ignore the checkpoint and download the whole account.
+
         Returns:
             httpx: The response from the get request.
 
@@ -166,21 +300,254 @@ class TickTickClient:
         """
         if self.OAuth_Mode:
             return
-        response = self.http_get(self.INITIAL_BATCH_URL, cookies=self.cookies, headers=self.HEADERS)
-
-        # Inbox Id
-        self.inbox_id = response['inboxId']
-        # Set list groups
-        self.state['project_folders'] = response['projectGroups']
-        # Set lists
-        self.state['projects'] = response['projectProfiles']
-        # Set Uncompleted Tasks
-        self.state['tasks'] = response['syncTaskBean']['update']
-        # Set tags
-        self.state['tags'] = response['tags']
+        if self._batch_depth:
+            self._deferred_sync = bool(self._deferred_sync) or full
+            return
+        if full:
+            self._checkpoint = 0
+
+        url = self.SYNC_URL + str(self._checkpoint)
+        if self.stream_sync and self._checkpoint == 0:
+            response = self._stream_full_sync(url)
+        else:
+            response = self.http_get(url, cookies=self.cookies, headers=self.HEADERS)
+        self._apply_sync(response)
 
         return response
 
+    def _stream_full_sync(self, url: str) -> dict:
+        """
+        Downloads a full sync with the body parsed as it arrives, see [`sync_stream`](helpers.md).
+
+        Returns:
+            The parsed response, with the top level values and the [`state`](api.md#state) lists.
+
+        Raises:
+            RunTimeError: If the request could not be completed.
+        """
+        parser = self._sync_parser()
+
+        def consume(response):
+            for chunk in response.iter_content(CHUNK_SIZE):
+                parser.feed(chunk)
+            return parser.bytes_read
+
+        response = self._send('GET', url, consume=consume, cookies=self.cookies, headers=self.HEADERS)
+        self.check_status_code(response, 'Could Not Complete Request')
+        return parser.close()
+
+    def _sync_parser(self) -> SyncStreamParser:
+        """
+        Returns a parser for a streamed full sync, storing records if the client is compact.
+        """
+        return SyncStreamParser(convert=to_record if self.compact else None)
+
+    def _apply_sync(self, response: dict) -> None:
+        """
+        Stores the response of `batch/check/<checkpoint>` in [`state`](api.md#state).
+
+        Arguments:
+            response: The response from the sync request.
+        """
+        if self._checkpoint == 0:
+            # Inbox Id
+            self.inbox_id = response['inboxId']
+            # Set list groups
+            self.state['project_folders'] = response['projectGroups']
+            # Set lists
+            self.state['projects'] = response['projectProfiles']
+            # Set Uncompleted Tasks
+            self.state['tasks'] = response['syncTaskBean']['update']
+            # Set tags
+            self.state['tags'] = response['tags']
+            if self.compact:
+                self._compact_state()
+            # Release the lookup tables of the replaced lists
+            self._index.invalidate()
+        else:
+            self._merge_sync(response)
+
+        self._checkpoint = response.get('checkPoint', self._checkpoint)
+
+    def _compact_state(self) -> None:
+        """
+        Replaces the objects in the [`state`](api.md#state) lists with records.
+        """
+        for search in ('projects', 'project_folders', 'tags', 'tasks'):
+            self.state[search] = to_records(search, self.state[search])
+
+    @contextmanager
+    def batch(self):
+        """
+        Holds back the syncs that manager methods make after every change until the block exits, and then syncs once.
+
+        Blocks can be nested -> only the outermost one syncs.
+
+        !!! warning
+            Inside the block [`state`](api.md#state) is not refreshed after each change. Methods that look up
+            their result in [`state`](api.md#state) after syncing (for example
+            [`ProjectManager.create`][managers.projects.ProjectManager.create]) return empty or outdated objects
+            until the block exits.
+
+        !!! example
+            ```python
+            # One sync for all the deletions instead of one per task
+            with client.batch():
+                for task in old_tasks:
+                    client.task.delete(task)
+            ```
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._deferred_sync is not None:
+                full = self._deferred_sync
+                self._deferred_sync = None
+                self.sync(full=full)
+
+    def _merge_sync(self, response: dict) -> None:
+        """
+        Merges the response of a delta sync into [`state`](api.md#state).
+
+        Arguments:
+            response: The response from `batch/check/<checkpoint>`.
+        """
+        if response.get('inboxId'):
+            self.inbox_id = response['inboxId']
+
+        task_bean = response.get('syncTaskBean') or {}
+        removed = {item['taskId'] for item in task_bean.get('delete') or []}
+        updated = []
+        for task in task_bean.get('update') or []:
+            # Completed, abandoned and trashed tasks are not part of the uncompleted tasks in state
+            if task.get('deleted') or task.get('status', 0) != 0:
+                removed.add(task['id'])
+            else:
+                updated.append(task)
+
+        self._upsert_into_local_state('tasks', 'id', updated)
+        if removed:
+            self.delete_all_from_local_state('tasks', 'id', removed)
+
+        # These are only present when something in them changed
+        if response.get('projectGroups') is not None:
+            self._upsert_into_local_state('project_folders', 'id', response['projectGroups'])
+        if response.get('projectProfiles') is not None:
+            self._upsert_into_local_state('projects', 'id', response['projectProfiles'])
+        if response.get('tags') is not None:
+            self._upsert_into_local_state('tags', 'name', response['tags'])
+
+    def _upsert_into_local_state(self, search: str, key: str, objects: list) -> None:
+        """
+        Updates the objects in `state[search]` that share `key` with one of `objects` in place, and appends the rest.
+
+        Arguments:
+            search: Key of the list in [`state`](api.md#state).
+            key: Field that identifies an object -> 'id' for most objects, 'name' for tags.
+            objects: The new versions of the objects.
+        """
+        if not objects:
+            return
+
+        if key in self._index.FIELDS:
+            existing = {obj[key]: self._index.lookup(search, key, obj[key]) for obj in objects}
+        else:
+            existing = {obj.get(key): obj for obj in self.state[search]}
+
+        for obj in objects:
+            current = existing.get(obj[key])
+            if current is obj:
+                continue
+            if current is not None:
+                self._index.replace(search, current, obj)
+            else:
+                if self.compact:
+                    obj = to_record(search, obj)
+                self.state[search].append(obj)
+                self._index.add(search, obj)
+                existing[obj[key]] = obj
+
+    def _request(self, method: str, url: str, **kwargs):
+        """
+        Sends the request, reports it to the [`hooks`](hooks.md) and returns the json parsed response if possible,
+        or just the text of the response if not.
+        """
+        response = self._send(method, url, **self._encode_body(kwargs))
+        self.check_status_code(response, 'Could Not Complete Request')
+
+        try:
+            return response.json()
+        except ValueError:
+            return response.text
+
+    def _send(self, method: str, url: str, consume=None, **kwargs):
+        """
+        Sends the request through the session and reports it to the [`hooks`](hooks.md) and the
+        [circuit breaker](circuit_breaker.md) of its endpoint family.
+
+        Arguments:
+            method: Http method.
+            url: Url of the request.
+            consume: Function reading the body of a successful response as it downloads, returning how many bytes
+                it read. The response body is loaded whole if not given. A streamed response is closed before
+                returning, whatever its status.
+            **kwargs: Arguments to send with the request.
+
+        Returns:
+            The response.
+
+        Raises:
+            CircuitOpenError: If the circuit of the endpoint family is open, without sending the request.
+        """
+        breaker = self.circuit_breakers.before_request(url)
+        token = self.hooks.started()
+        bytes_received = None
+        try:
+            if consume is not None:
+                kwargs['stream'] = True
+            response = getattr(self._session, method.lower())(url, **kwargs)
+            if consume is not None:
+                with closing(response):
+                    if response.status_code == 200:
+                        bytes_received = consume(response)
+                    else:
+                        # Error bodies are small, read them so they can be reported
+                        response.content
+        except Exception as error:
+            self.hooks.finished(token, method, url, error=error)
+            if breaker is not None:
+                breaker.record(failed=True)
+            raise
+        except BaseException:
+            # Interrupted -> says nothing about the endpoint, but a probe must not stay in flight forever
+            if breaker is not None:
+                breaker.release()
+            raise
+        self.hooks.finished(token, method, url, response, bytes_received=bytes_received)
+        if breaker is not None:
+            breaker.record(failed=is_failure(response.status_code))
+        return response
+
+    def _plain_json(self, kwargs: dict) -> dict:
+        """
+        Replaces records in the json body of a request with dictionaries so it can be serialized.
+        """
+        if self.compact and 'json' in kwargs:
+            kwargs['json'] = to_plain(kwargs['json'])
+        return kwargs
+
+    def _encode_body(self, kwargs: dict) -> dict:
+        """
+        Prepares the json body of a request to be sent -> records become dictionaries and large bodies are
+        compressed if `compress_requests` is set.
+        """
+        kwargs = self._plain_json(kwargs)
+        if self.compress_requests is not None:
+            kwargs = compress_json(kwargs, self.compress_requests)
+        return kwargs
+
     def http_post(self, url, **kwargs):
         """
         Sends an http post request with the specified url and keyword arguments.
@@ -195,13 +562,7 @@ class TickTickClient:
         Raises:
             RunTimeError: If the request could not be completed.
         """
-        response = self._session.post(url, **kwargs)
-        self.check_status_code(response, 'Could Not Complete Request')
-
-        try:
-            return response.json()
-        except ValueError:
-            return response.text
+        return self._request('POST', url, **kwargs)
 
     def http_get(self, url, **kwargs):
         """
@@ -217,13 +578,7 @@ class TickTickClient:
         Raises:
             RunTimeError: If the request could not be completed.
         """
-        response = self._session.get(url, **kwargs)
-        self.check_status_code(response, 'Could Not Complete Request')
-
-        try:
-            return response.json()
-        except ValueError:
-            return response.text
+        return self._request('GET', url, **kwargs)
 
     def http_delete(self, url, **kwargs):
         """
@@ -239,13 +594,7 @@ class TickTickClient:
         Raises:
             RunTimeError: If the request could not be completed.
         """
-        response = self._session.delete(url, **kwargs)
-        self.check_status_code(response, 'Could Not Complete Request')
-
-        try:
-            return response.json()
-        except ValueError:
-            return response.text
+        return self._request('DELETE', url, **kwargs)
 
     def http_put(self, url, **kwargs):
         """
@@ -261,13 +610,7 @@ class TickTickClient:
         Raises:
             RunTimeError: If the request could not be completed.
         """
-        response = self._session.put(url, **kwargs)
-        self.check_status_code(response, 'Could Not Complete Request')
-
-        try:
-            return response.json()
-        except ValueError:
-            return response.text
+        return self._request('PUT', url, **kwargs)
 
     @staticmethod
     def parse_id(response: dict) -> str:
@@ -326,7 +669,9 @@ class TickTickClient:
         Finds and returns the objects in `state` that match the inputted fields.
 
         If search is specified, it will only search the specific [`state`](api.md#state) list,
-        else the entire [`state`](api.md#state) dictionary will be searched.
+        else the entire [`state`](api.md#state) dictionary will be searched. When searching a specific list, commonly
+        searched fields (like `projectId`, `parentId`, `tags` and `status` for tasks, `groupId` for projects and
+        `name` for tags) are answered from an index instead of a scan.
 
         !!! example
             Since each TickTick object like tasks, projects, and tags are just dictionaries of fields,
@@ -382,12 +727,15 @@ class TickTickClient:
         objects = []
         if search is not None:
             # If a specific key was passed for self.state
-            # Go through self.state[key_name] and see if all the fields in kwargs match
-            # If all don't match return empty list
-            for index in self.state[search]:
+            # Narrow the objects down with an index when one fits the fields, then see if all the fields in kwargs
+            # match. If all don't match return empty list
+            candidates = self._index.candidates(search, kwargs)
+            if candidates is None:
+                candidates = self.state[search]
+            for index in candidates:
                 all_match = True
                 for field in kwargs:
-                    if kwargs[field] != index[field]:
+                    if field not in index or kwargs[field] != index[field]:
                         all_match = False
                         break
                 if all_match:
@@ -429,7 +777,8 @@ class TickTickClient:
         Returns the dictionary of the object corresponding to the passed id.
 
         If search is specified, it will only search the specific [`state`](api.md#state) list, else the
-        entire [`state`](api.md#state) dictionary will be searched.
+        entire [`state`](api.md#state) dictionary will be searched. Lookups go through hash tables that are kept
+        current with [`state`](api.md#state), so they take constant time per list.
 
 
         !!! example
@@ -475,18 +824,16 @@ class TickTickClient:
 
         # Search just in the desired list
         if search is not None:
-            for index in self.state[search]:
-                if index['id'] == obj_id:
-                    return index
+            found = self._index.lookup(search, 'id', obj_id)
+            if found is not None:
+                return found
 
         else:
             # Search all items in self.state
             for prim_key in self.state:
-                for our_object in self.state[prim_key]:
-                    if 'id' not in our_object:
-                        break
-                    if our_object['id'] == obj_id:
-                        return our_object
+                found = self._index.lookup(prim_key, 'id', obj_id)
+                if found is not None:
+                    return found
         # Return empty dictionary if not found
         return {}
 
@@ -495,7 +842,8 @@ class TickTickClient:
         Returns the dictionary object of the item with the matching etag.
 
         If search is specified, it will only search the specific [`state`](api.md#state) list, else the
-        entire [`state`](api.md#state) dictionary will be searched.
+        entire [`state`](api.md#state) dictionary will be searched. Like [`get_by_id`][api.TickTickClient.get_by_id],
+        lookups go through hash tables and take constant time per list.
 
         !!! example
             Since each TickTick object like tasks, projects, and tags are just dictionaries of fields,
@@ -541,18 +889,16 @@ class TickTickClient:
 
         # Search just in the desired list
         if search is not None:
-            for index in self.state[search]:
-                if index['etag'] == etag:
-                    return index
+            found = self._index.lookup(search, 'etag', etag)
+            if found is not None:
+                return found
 
         else:
             # Search all items in self.state
             for prim_key in self.state:
-                for our_object in self.state[prim_key]:
-                    if 'etag' not in our_object:
-                        break
-                    if our_object['etag'] == etag:
-                        return our_object
+                found = self._index.lookup(prim_key, 'etag', etag)
+                if found is not None:
+                    return found
         # Return empty dictionary if not found
         return {}
 
@@ -561,7 +907,9 @@ class TickTickClient:
         Deletes a single object from the local `state` dictionary. **Does not delete any items remotely.**
 
         If search is specified, it will only search the specific [`state`](api.md#state) list,
-        else the entire [`state`](api.md#state) dictionary will be searched.
+        else the entire [`state`](api.md#state) dictionary will be searched. When searching a specific list, commonly
+        searched fields (like `projectId`, `parentId`, `tags` and `status` for tasks, `groupId` for projects and
+        `name` for tags) are answered from an index instead of a scan.
 
         !!! example
             Since each TickTick object like tasks, lists, and tags are just dictionaries of fields,
@@ -627,6 +975,7 @@ class TickTickClient:
                     deleted = self.state[search][item]
                     # Delete the item
                     del self.state[search][item]
+                    self._index.discard(search, deleted)
                     return deleted
 
         else:
@@ -655,4 +1004,79 @@ class TickTickClient:
                     if all_match:
                         deleted = self.state[primary_key][middle_key]
                         del self.state[primary_key][middle_key]
+                        self._index.discard(primary_key, deleted)
                         return deleted
+
+    def delete_all_from_local_state(self, search: str, field: str, values) -> list:
+        """
+        Deletes every object in `state[search]` whose `field` is one of `values` from the local `state` dictionary,
+        in a single pass over the list. **Does not delete any items remotely.**
+
+        !!! example
+            Deleting every local task of two projects:
+
+            ```python
+            # Assumes that `client` is the name referencing the TickTickClient instance.
+
+            deleted_tasks = client.delete_all_from_local_state('tasks', 'projectId', [work_id, school_id])
+            ```
+
+        Arguments:
+            search: Key in [`state`](api.md#state) to delete the objects from.
+            field: Field of the objects to compare.
+            values: The values of `field` whose objects should be deleted.
+
+        Returns:
+            A list of the deleted objects. Empty if nothing matched.
+
+        Raises:
+            KeyError: If the search key provided is not a key in [`state`](api.md#state).
+        """
+        if search not in self.state:
+            raise KeyError(f"'{search}' Is Not Present In self.state Dictionary")
+
+        values = set(values)
+        kept = []
+        deleted = []
+        for obj in self.state[search]:
+            if obj.get(field) in values:
+                deleted.append(obj)
+            else:
+                kept.append(obj)
+
+        if deleted:
+            # Keep the same list object -> references to state[search] stay valid
+            self.state[search][:] = kept
+            self._index.discard_all(search, deleted)
+
+        return deleted
+
+    def patch_local_state(self, search: str, obj, fields: dict):
+        """
+        Sets `fields` on `obj`, an object in `state[search]`, and keeps the lookup tables current. Fields of `obj`
+        that were already changed by hand are picked up as well. **Does not change any items remotely.**
+
+        !!! example
+            ```python
+            # Assumes that `client` is the name referencing the TickTickClient instance.
+
+            tag = client.get_by_fields(name='movies', search='tags')
+            client.patch_local_state('tags', tag, {'color': '#134397', 'etag': 'wwb49yfr'})
+            ```
+
+        Arguments:
+            search: Key in [`state`](api.md#state) that holds the object.
+            obj: The object in `state[search]`.
+            fields: The fields to set.
+
+        Returns:
+            The patched object, which keeps its identity and position in the list.
+
+        Raises:
+            KeyError: If the search key provided is not a key in [`state`](api.md#state).
+        """
+        if search not in self.state:
+            raise KeyError(f"'{search}' Is Not Present In self.state Dictionary")
+
+        self._index.replace(search, obj, {**obj, **fields})
+        return obj
@@ -0,0 +1,212 @@
+"""
+On-disk archive of completed tasks.
+"""
+
+import datetime
+import inspect
+import json
+import sqlite3
+
+import pytz
+
+from ticktick.helpers.constants import DATE_FORMAT
+from ticktick.helpers.concurrency import check_paging
+from ticktick.helpers.time_methods import parse_tick_tick_date
+
+
+class CompletedArchive:
+    """
+    Stores completed tasks in a SQLite database so reports over past ranges don't have to go back to TickTick.
+
+    The archive remembers which time ranges it has already downloaded. Asking for a range only fetches the parts
+    that were never fetched, stores them, and then answers the whole range from disk.
+
+    !!! note
+        A range is only recorded as downloaded up to the moment it was fetched, so tasks completed later are picked
+        up the next time the range is asked for. Tasks that are uncompleted after being archived stay in the
+        archive.
+
+    !!! warning
+        Only [`TickTickClient`][api.TickTickClient] is supported, the archive reads and writes the database
+        synchronously and can't download through an [`AsyncTickTickClient`][async_api.AsyncTickTickClient].
+
+    !!! example
+        ```python
+        from ticktick.archive import CompletedArchive
+
+        archive = CompletedArchive(client, 'completed.db')
+        # The first call downloads the year, the second one only reads from disk
+        tasks = archive.get_completed(datetime(2020, 1, 1), datetime(2020, 12, 31))
+        tasks = archive.get_completed(datetime(2020, 6, 1), datetime(2020, 6, 30))
+        ```
+    """
+
+    def __init__(self, client_class, path: str):
+        """
+        Opens the archive, creating it if needed.
+
+        Arguments:
+            client_class: The [`TickTickClient`][api.TickTickClient] used to download missing ranges.
+            path: Path to the SQLite database file.
+        """
+        self._client = client_class
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        with self._connection:
+            self._connection.executescript('''
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id TEXT PRIMARY KEY,
+                    project_id TEXT,
+                    completed_time TEXT NOT NULL,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS tasks_completed_time ON tasks (completed_time);
+                CREATE INDEX IF NOT EXISTS tasks_project_completed_time ON tasks (project_id, completed_time);
+                CREATE TABLE IF NOT EXISTS coverage (
+                    start TEXT NOT NULL,
+                    end TEXT NOT NULL
+                );
+            ''')
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def get_completed(self,
+                      start,
+                      end=None,
+                      full: bool = True,
+                      tz: str = None,
+                      project: str = None,
+                      window: datetime.timedelta = None,
+                      workers: int = 1) -> list:
+        """
+        Returns the completed tasks in the range, downloading only the parts of it the archive doesn't have yet.
+
+        Takes the same arguments as [`get_completed`][managers.tasks.TaskManager.get_completed], which is used for
+        the downloads.
+
+        Arguments:
+            start (datetime): Start time datetime object.
+            end (datetime): End time datetime object.
+            full: Boolean specifying whether hours, minutes, and seconds are to be taken into account for the query.
+            tz: String specifying a specific time zone, however this will default to your accounts normal time zone.
+            project: Only return tasks from the project with this id.
+            window: Splits missing ranges into windows of this length that are fetched separately.
+            workers: How many windows to fetch at the same time.
+
+        Returns:
+            A list of the completed tasks, newest first.
+
+        Raises:
+            TypeError: If the proper types are not used, or the client is an async client.
+            ValueError: If start occurs after end, or window or workers are not positive.
+            KeyError: If the time zone string passed is not a valid time zone string.
+            RuntimeError: If downloading the tasks is unsuccessful.
+        """
+        task_manager = self._client.task
+        if inspect.iscoroutinefunction(task_manager.get_completed):
+            raise TypeError('CompletedArchive Requires A TickTickClient, Async Clients Are Not Supported')
+        check_paging(window, workers)
+        start, end = task_manager.completed_range(start, end, full, tz)
+
+        now = datetime.datetime.now(pytz.utc).replace(tzinfo=None, microsecond=0)
+        for gap_start, gap_end in self.missing(start, end):
+            self.store(task_manager.iter_completed_utc(gap_start, gap_end, window=window, workers=workers))
+            self._add_coverage(gap_start, min(gap_end, now))
+
+        return self.query(start, end, project)
+
+    def store(self, tasks) -> None:
+        """
+        Adds completed tasks to the archive, replacing any stored task with the same id.
+
+        Arguments:
+            tasks: Iterable of completed task dictionaries.
+        """
+        rows = ((task['id'], task.get('projectId'), parse_tick_tick_date(task['completedTime']).strftime(DATE_FORMAT),
+                 json.dumps(task))
+                for task in tasks if task.get('completedTime'))
+        with self._connection:
+            self._connection.executemany('INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?)', rows)
+
+    def query(self, start: datetime.datetime, end: datetime.datetime, project: str = None) -> list:
+        """
+        Returns the archived tasks completed between the UTC times `start` and `end`, newest first. Nothing is
+        downloaded.
+
+        Arguments:
+            start: Start of the range in UTC.
+            end: End of the range in UTC.
+            project: Only return tasks from the project with this id.
+
+        Returns:
+            A list of the completed tasks.
+        """
+        sql = 'SELECT data FROM tasks WHERE completed_time BETWEEN ? AND ?'
+        parameters = [start.strftime(DATE_FORMAT), end.strftime(DATE_FORMAT)]
+        if project is not None:
+            sql += ' AND project_id = ?'
+            parameters.append(project)
+        sql += ' ORDER BY completed_time DESC'
+        return [json.loads(data) for data, in self._connection.execute(sql, parameters)]
+
+    def missing(self, start: datetime.datetime, end: datetime.datetime) -> list:
+        """
+        Returns the parts of the UTC range from `start` to `end` that have not been downloaded yet.
+
+        Arguments:
+            start: Start of the range in UTC.
+            end: End of the range in UTC.
+
+        Returns:
+            A list of `(start, end)` tuples, oldest first.
+        """
+        gaps = []
+        for covered_start, covered_end in self._coverage():
+            if covered_end < start:
+                continue
+            if covered_start > end:
+                break
+            if covered_start > start:
+                gaps.append((start, covered_start - _SECOND))
+            start = max(start, covered_end + _SECOND)
+        if start <= end:
+            gaps.append((start, end))
+        return gaps
+
+    def _coverage(self) -> list:
+        """
+        Returns the downloaded ranges as sorted `(start, end)` tuples.
+        """
+        rows = self._connection.execute('SELECT start, end FROM coverage ORDER BY start')
+        return [(datetime.datetime.strptime(start, DATE_FORMAT), datetime.datetime.strptime(end, DATE_FORMAT))
+                for start, end in rows]
+
+    def _add_coverage(self, start: datetime.datetime, end: datetime.datetime) -> None:
+        """
+        Records the range as downloaded, merging it with the ranges it touches.
+        """
+        if end < start:
+            return
+        merged = []
+        for covered in sorted(self._coverage() + [(start, end)]):
+            if merged and covered[0] <= merged[-1][1] + _SECOND:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], covered[1]))
+            else:
+                merged.append(covered)
+        with self._connection:
+            self._connection.execute('DELETE FROM coverage')
+            self._connection.executemany('INSERT INTO coverage VALUES (?, ?)',
+                                         [(s.strftime(DATE_FORMAT), e.strftime(DATE_FORMAT)) for s, e in merged])
+
+
+_SECOND = datetime.timedelta(seconds=1)
@@ -0,0 +1,443 @@
+"""
+Asyncio counterpart of [`TickTickClient`][api.TickTickClient].
+"""
+
+import asyncio
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from ticktick.api import TickTickClient
+from ticktick.circuit_breaker import is_failure
+from ticktick.helpers.compression import ACCEPT_ENCODING
+from ticktick.helpers.sync_stream import CHUNK_SIZE
+from ticktick.managers.focus import FocusTimeManager
+from ticktick.managers.habits import HabitManager
+from ticktick.managers.pomo import PomoManager
+from ticktick.managers.settings import SettingsManager
+from ticktick.managers.async_projects import AsyncProjectManager
+from ticktick.managers.async_tags import AsyncTagsManager
+from ticktick.managers.async_tasks import AsyncTaskManager
+from ticktick.oauth2 import OAuth2
+from ticktick.retry import RetryPolicy
+
+
+class _AsyncBatch:
+    """
+    Async context manager returned by [`AsyncTickTickClient.batch`][async_api.AsyncTickTickClient.batch].
+    """
+
+    def __init__(self, client_class):
+        self._client = client_class
+
+    async def __aenter__(self):
+        self._client._batch_depth += 1
+        return self._client
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._client._batch_depth -= 1
+        if self._client._batch_depth == 0 and self._client._deferred_sync is not None:
+            full = self._client._deferred_sync
+            self._client._deferred_sync = None
+            await self._client.sync(full=full)
+
+
+class AsyncTickTickClient(TickTickClient):
+    """
+    Asyncio version of [`TickTickClient`][api.TickTickClient]. Requests go through a pooled `httpx.AsyncClient`, so
+    many operations can run at once on one event loop.
+
+    The `task`, `project` and `tag` managers mirror [`TaskManager`][managers.tasks.TaskManager],
+    [`ProjectManager`][managers.projects.ProjectManager] and [`TagsManager`][managers.tags.TagsManager] -> every
+    method that talks to TickTick is a coroutine, everything that only reads [`state`](api.md#state) (like
+    [`get_by_id`][api.TickTickClient.get_by_id] or [`builder`][managers.tasks.TaskManager.builder]) is not.
+
+    !!! note
+        Requires `httpx` -> `pip install ticktick-py[async]`
+
+    !!! example
+        ```python
+        async def main():
+            async with AsyncTickTickClient(username, password, oauth) as client:
+                tasks = [client.task.builder(title) for title in titles]
+                await asyncio.gather(*(client.task.create(task) for task in tasks))
+        ```
+    """
+
+    def __init__(self,
+                 username: str,
+                 password: str,
+                 oauth: OAuth2,
+                 max_connections: int = 100,
+                 max_keepalive_connections: int = 20,
+                 timeout: float = 30.0,
+                 transport=None,
+                 snapshot_path: str = None,
+                 compact: bool = False,
+                 http2: bool = False,
+                 retry_policy: RetryPolicy = None,
+                 compress_requests: int = None,
+                 stream_sync: bool = False) -> None:
+        """
+        Sets up the client. Nothing is sent until the client is opened with `await client.open()` or
+        `async with client`.
+
+        Arguments:
+            username: TickTick Username
+            password: TickTick Password
+            oauth: OAuth2 manager
+            max_connections: Most connections the pool keeps open at once.
+            max_keepalive_connections: Most idle connections the pool keeps alive.
+            timeout: Seconds to wait for a request before giving up.
+            transport: An `httpx.AsyncBaseTransport` to send the requests through instead of the default one.
+            snapshot_path: Path of the snapshot file to start from and save to, see
+                [`TickTickClient`][api.TickTickClient.__init__].
+            compact: Store the objects in [`state`](api.md#state) as memory saving [records](records.md) instead of
+                dictionaries.
+            http2: Use HTTP/2 where the server supports it, so concurrent requests share one connection. Requires
+                the `h2` package -> `pip install httpx[http2]`.
+            retry_policy: [`RetryPolicy`][retry.RetryPolicy] for every request. Defaults to the policy of `oauth`,
+                so both share one rate limit, or `RetryPolicy()` if it has none.
+            compress_requests: Send json bodies of at least this many bytes gzip compressed. None never compresses.
+            stream_sync: Parse the response of a full sync as it downloads, see
+                [`TickTickClient`][api.TickTickClient.__init__]. Requires `ijson`.
+
+        Raises:
+            ImportError: If httpx is not installed, `http2` is set and h2 is not, or `stream_sync` is set and ijson
+                is not.
+        """
+        if httpx is None:
+            raise ImportError("AsyncTickTickClient requires httpx -> pip install ticktick-py[async]")
+
+        self._init_members(oauth, snapshot_path, compact, compress_requests, stream_sync)
+        self.retry_policy = retry_policy or self.retry_policy or RetryPolicy()
+        self._async_session = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_keepalive_connections),
+            timeout=timeout,
+            transport=transport,
+            http2=http2,
+            headers={'Accept-Encoding': ACCEPT_ENCODING}
+        )
+        # Serializes syncs so checkpoints are applied in order
+        self._sync_lock = None
+        self._sync_requests = 0
+        self._synced_through = 0
+        self._last_sync = None
+
+        if username is None or password is None or username == '' or password == '':
+            self._credentials = None
+            self.OAuth_Mode = True
+            self.project = AsyncProjectManager(self)
+            self.tag = AsyncTagsManager(self)
+            self.task = AsyncTaskManager(self)
+            self.state = {'NOTICE': 'You are using the OpenAPI/OAuth2 method. Please provide a username and password to'
+                                    'access the state.'}
+        else:
+            self._credentials = (username, password)
+
+    async def open(self):
+        """
+        Logs in and syncs [`state`](api.md#state), like [`TickTickClient`][api.TickTickClient] does on creation.
+
+        Returns:
+            The client.
+
+        Raises:
+            RunTimeError: If the login was not successful.
+        """
+        if self._credentials is not None:
+            username, password = self._credentials
+            self._credentials = None
+            await self._prepare_session(username, password)
+        return self
+
+    async def aclose(self) -> None:
+        """
+        Closes the connection pool.
+        """
+        await self._async_session.aclose()
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def _prepare_session(self, username, password):
+        """
+        Creates all the necessary calls to prepare the session
+        """
+        if self._restore_snapshot(username):
+            try:
+                await self.sync()
+            except RuntimeError:
+                # The saved session expired -> log in again and keep catching up from the snapshot
+                await self._login(username, password)
+                await self.sync()
+        else:
+            await self._login(username, password)
+            await self._settings()
+            await self.sync()
+            if self._snapshot is not None:
+                self.save_snapshot()
+
+        # Mangers for the different operations
+        self.focus = FocusTimeManager(self)
+        self.habit = HabitManager(self)
+        self.project = AsyncProjectManager(self)
+        self.pomo = PomoManager(self)
+        self.settings = SettingsManager(self)
+        self.tag = AsyncTagsManager(self)
+        self.task = AsyncTaskManager(self)
+
+    async def _login(self, username: str, password: str) -> None:
+        """
+        Logs in to TickTick and sets the instance access token.
+
+        Arguments:
+            username: TickTick Username
+            password: TickTick Password
+        """
+        url = self.BASE_URL + 'user/signin'
+        user_info = {
+            'username': username,
+            'password': password
+        }
+        parameters = {
+            'wc': True,
+            'remember': True
+        }
+
+        response = await self.http_post(url, json=user_info, params=parameters, headers=self.HEADERS)
+
+        self.access_token = response['token']
+        self.cookies['t'] = self.access_token
+
+    async def _settings(self):
+        """
+        Sets the time_zone and profile_id.
+
+        Returns:
+            The json parsed response.
+        """
+        url = self.BASE_URL + 'user/preferences/settings'
+        parameters = {
+            'includeWeb': True
+        }
+        response = await self.http_get(url, params=parameters, cookies=self.cookies, headers=self.HEADERS)
+
+        self.time_zone = response['timeZone']
+        self.profile_id = response['id']
+
+        return response
+
+    async def sync(self, full: bool = False):
+        """
+        Async version of [`sync`][api.TickTickClient.sync].
+
+        Syncs never overlap. Callers that ask for a sync while one is waiting to start share it, so a burst of
+        concurrent changes costs one sync instead of one each.
+
+        Arguments:
+            full: Whether to ignore the checkpoint and download the whole account.
+
+        Returns:
+            The response from the sync request.
+        """
+        if self.OAuth_Mode:
+            return
+        if self._batch_depth:
+            self._deferred_sync = bool(self._deferred_sync) or full
+            return
+
+        if self._sync_lock is None:
+            self._sync_lock = asyncio.Lock()
+
+        self._sync_requests += 1
+        ticket = self._sync_requests
+        async with self._sync_lock:
+            if self._synced_through >= ticket and not full:
+                # A sync that started after this one was asked for already ran
+                return self._last_sync
+
+            covered = self._sync_requests
+            if full:
+                self._checkpoint = 0
+            url = self.SYNC_URL + str(self._checkpoint)
+            if self.stream_sync and self._checkpoint == 0:
+                response = await self._stream_full_sync(url)
+            else:
+                response = await self.http_get(url, cookies=self.cookies, headers=self.HEADERS)
+            self._apply_sync(response)
+            self._synced_through = covered
+            self._last_sync = response
+
+        return response
+
+    def batch(self):
+        """
+        Async version of [`batch`][api.TickTickClient.batch].
+
+        !!! example
+            ```python
+            async with client.batch():
+                await asyncio.gather(*(client.task.delete(task) for task in old_tasks))
+            ```
+        """
+        return _AsyncBatch(self)
+
+    async def _stream_full_sync(self, url: str) -> dict:
+        """
+        Async version of [`_stream_full_sync`][api.TickTickClient._stream_full_sync].
+        """
+        parser = self._sync_parser()
+
+        async def consume(response):
+            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                parser.feed(chunk)
+            return parser.bytes_read
+
+        response = await self._send('GET', url, consume=consume, cookies=self.cookies, headers=self.HEADERS)
+        self.check_status_code(response, 'Could Not Complete Request')
+        return parser.close()
+
+    async def _request(self, method: str, url: str, **kwargs):
+        """
+        Sends the request through the connection pool, reports it to the [`hooks`](hooks.md) and returns the json
+        parsed response if possible, or just the text of the response if not.
+        """
+        response = await self._send(method, url, **self._encode_body(kwargs))
+        self.check_status_code(response, 'Could Not Complete Request')
+
+        try:
+            return response.json()
+        except ValueError:
+            return response.text
+
+    async def _send(self, method: str, url: str, consume=None, **kwargs):
+        """
+        Async version of [`_send`][api.TickTickClient._send], with `consume` a coroutine function.
+
+        Failed requests are sent again as the [`retry_policy`][retry.RetryPolicy] decides, and every attempt waits
+        for its turn under its rate limit. The outcome after the retries is recorded on the
+        [circuit breaker](circuit_breaker.md) of the endpoint family.
+
+        Raises:
+            CircuitOpenError: If the circuit of the endpoint family is open, without sending the request.
+        """
+        cookies = kwargs.pop('cookies', None)
+        if cookies:
+            headers = dict(kwargs.get('headers') or {})
+            headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in cookies.items())
+            kwargs['headers'] = headers
+
+        breaker = self.circuit_breakers.before_request(url)
+        try:
+            response = await self._send_with_retries(method, url, kwargs, consume)
+        except Exception:
+            if breaker is not None:
+                breaker.record(failed=True)
+            raise
+        except BaseException:
+            # Cancelled -> says nothing about the endpoint, but a probe must not stay in flight forever
+            if breaker is not None:
+                breaker.release()
+            raise
+        if breaker is not None:
+            breaker.record(failed=is_failure(response.status_code))
+        return response
+
+    def _encode_body(self, kwargs: dict) -> dict:
+        """
+        Like [`TickTickClient._encode_body`][api.TickTickClient._encode_body], with compressed bodies passed as the
+        `content` httpx expects for raw bytes.
+        """
+        kwargs = super()._encode_body(kwargs)
+        if isinstance(kwargs.get('data'), bytes):
+            kwargs['content'] = kwargs.pop('data')
+        return kwargs
+
+    async def _send_with_retries(self, method: str, url: str, kwargs: dict, consume=None):
+        """
+        Sends the request, retrying as the [`retry_policy`][retry.RetryPolicy] decides, and reports it to the
+        [`hooks`](hooks.md) once, with the number of retries it took. With `consume`, the body of a successful
+        response is handed to it as it downloads.
+
+        Returns:
+            The last response.
+        """
+        policy = self.retry_policy
+        token = self.hooks.started()
+        attempt = 0
+        while True:
+            delay = policy.throttle()
+            if delay:
+                await asyncio.sleep(delay)
+
+            try:
+                if consume is None:
+                    response = await self._async_session.request(method, url, **kwargs)
+                else:
+                    request = self._async_session.build_request(method, url, **kwargs)
+                    response = await self._async_session.send(request, stream=True)
+            except httpx.TransportError as error:
+                if attempt >= policy.retries or method.upper() not in policy.allowed_methods:
+                    self.hooks.finished(token, method, url, error=error, retries=attempt)
+                    raise
+                delay = policy.retry_delay(attempt)
+            except Exception as error:
+                self.hooks.finished(token, method, url, error=error, retries=attempt)
+                raise
+            else:
+                retry = attempt < policy.retries and policy.is_retry(method, response.status_code,
+                                                                     'Retry-After' in response.headers)
+                bytes_received = None
+                if consume is not None:
+                    try:
+                        if response.status_code == 200 and not retry:
+                            bytes_received = await consume(response)
+                        else:
+                            # Error bodies are small, read them so they can be reported
+                            await response.aread()
+                    except Exception as error:
+                        self.hooks.finished(token, method, url, error=error, retries=attempt)
+                        raise
+                    finally:
+                        await response.aclose()
+                if not retry:
+                    self.hooks.finished(token, method, url, response, bytes_received=bytes_received,
+                                        retries=attempt)
+                    break
+                delay = policy.retry_delay(attempt, response.status_code, response.headers)
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+        return response
+
+    async def http_post(self, url, **kwargs):
+        """
+        Async version of [`http_post`][api.TickTickClient.http_post].
+        """
+        return await self._request('POST', url, **kwargs)
+
+    async def http_get(self, url, **kwargs):
+        """
+        Async version of [`http_get`][api.TickTickClient.http_get].
+        """
+        return await self._request('GET', url, **kwargs)
+
+    async def http_delete(self, url, **kwargs):
+        """
+        Async version of [`http_delete`][api.TickTickClient.http_delete].
+        """
+        return await self._request('DELETE', url, **kwargs)
+
+    async def http_put(self, url, **kwargs):
+        """
+        Async version of [`http_put`][api.TickTickClient.http_put].
+        """
+        return await self._request('PUT', url, **kwargs)
@@ -1,6 +1,7 @@
 import json
 import errno
 import logging
+import os
 
 log = logging.getLogger(__name__)
 
@@ -51,3 +52,62 @@ class CacheHandler:
 
         except IOError:
             log.warning(f"Cache could not be written to at: {self.path}")
+
+
+class SnapshotHandler:
+    """
+    Handles saving and loading snapshots of the client state to disk
+    """
+
+    # Bumped when the layout of the snapshot changes -> snapshots with another version are ignored
+    VERSION = 1
+
+    def __init__(self,
+                 path):
+        """
+        Initializes the path of the snapshot
+        :param path:
+        """
+        self.path = path
+
+    def load(self):
+        """
+        Retrieves the snapshot - returns None if there is no usable snapshot
+        :return:
+        """
+        try:
+            with open(self.path) as f:
+                snapshot = json.load(f)
+        except IOError as error_occurred:
+            if error_occurred.errno == errno.ENOENT:
+                log.debug(f"No snapshot exists at: {self.path}")
+            else:
+                log.warning(f"Snapshot could not be read at: {self.path}")
+            return None
+        except ValueError:
+            log.warning(f"Snapshot is not valid json at: {self.path}")
+            return None
+
+        if not isinstance(snapshot, dict) or snapshot.get('version') != self.VERSION:
+            log.warning(f"Snapshot at {self.path} was written by another version and is ignored")
+            return None
+        return snapshot
+
+    def save(self, snapshot):
+        """
+        Writes the snapshot - the old snapshot is only replaced once the new one is completely written.
+        The snapshot holds the access token, so only the owner can read it
+        :return:
+        """
+        temp_path = self.path + '.tmp'
+        try:
+            # A leftover temp file would keep its old permissions
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(descriptor, "w") as f:
+                json.dump({**snapshot, 'version': self.VERSION}, f, separators=(',', ':'))
+            os.replace(temp_path, self.path)
+
+        except IOError:
+            log.warning(f"Snapshot could not be written to at: {self.path}")
@@ -0,0 +1,252 @@
+"""
+Circuit breakers for the requests sent by [`TickTickClient`][api.TickTickClient].
+
+When TickTick is degraded, every request waits through its retries before failing. A circuit breaker counts the
+failures of a family of endpoints and, after `failure_threshold` of them in a row, opens -> requests to that family
+raise [`CircuitOpenError`][circuit_breaker.CircuitOpenError] straight away instead of being sent. After
+`reset_timeout` seconds the breaker turns half open and lets a single probe request through. If it succeeds the
+breaker closes again, if it fails it stays open for another `reset_timeout`.
+
+A request fails when it raises or gets a `429` or `5xx` response. Other responses, including client errors like
+`404`, show the endpoint is up and count as successes.
+
+The endpoints are grouped into the families `'batch'`, `'tag'`, `'completed'`, `'open'` (the Open API) and
+`'other'`, so an outage of one doesn't block the others.
+
+!!! example "Falling Back To The Local State"
+    ```python
+    from ticktick.circuit_breaker import CircuitOpenError
+
+    try:
+        client.sync()
+    except CircuitOpenError as error:
+        log.warning(f"TickTick unavailable, using cached state for {error.retry_in:.0f}s")
+    tasks = client.state['tasks']
+    ```
+"""
+
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Endpoint families, the first matching path pattern wins
+FAMILIES = (
+    ('batch', re.compile(r'^/api/v2/batch/')),
+    ('tag', re.compile(r'^/api/v2/tag')),
+    ('completed', re.compile(r'^/api/v2/project/all/completed')),
+    ('open', re.compile(r'^/open/v1/')),
+)
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised instead of sending a request while the circuit of its endpoint family is open.
+
+    Attributes:
+        family: Endpoint family of the request.
+        retry_in: Seconds until the breaker lets a probe request through.
+    """
+
+    def __init__(self, family: str, retry_in: float):
+        self.family = family
+        self.retry_in = retry_in
+        super().__init__(f"Circuit Open For '{family}' Endpoints -> Retry In {retry_in:.1f} Seconds")
+
+
+class CircuitBreaker:
+    """
+    Thread safe circuit breaker for one endpoint family.
+    """
+
+    def __init__(self, family: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Arguments:
+            family: Name of the endpoint family, used in errors.
+            failure_threshold: Failures in a row that open the circuit.
+            reset_timeout: Seconds the circuit stays open before a probe request is let through.
+
+        Raises:
+            ValueError: If failure_threshold is less than 1 or reset_timeout is negative.
+        """
+        if failure_threshold < 1:
+            raise ValueError('Failure Threshold Must Be At Least 1')
+        if reset_timeout < 0:
+            raise ValueError('Reset Timeout Must Not Be Negative')
+        self.family = family
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """
+        `'closed'`, `'open'` or `'half_open'`.
+        """
+        with self._lock:
+            return self._state(time.monotonic())
+
+    @property
+    def failures(self) -> int:
+        """
+        Failures in a row since the last success.
+        """
+        return self._failures
+
+    def before_request(self) -> None:
+        """
+        Called before sending a request. Lets it through unless the circuit is open, or half open with a probe
+        already in flight.
+
+        Raises:
+            CircuitOpenError: If the request must not be sent.
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(now)
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            retry_in = max(0.0, self._opened_at + self.reset_timeout - now)
+        raise CircuitOpenError(self.family, retry_in)
+
+    def record(self, failed: bool) -> None:
+        """
+        Records the outcome of a request that [`before_request`][circuit_breaker.CircuitBreaker.before_request]
+        let through.
+        """
+        with self._lock:
+            self._probing = False
+            if not failed:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                # Opening again after a failed probe restarts the wait
+                self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """
+        Ends a request that [`before_request`][circuit_breaker.CircuitBreaker.before_request] let through without
+        recording an outcome, for requests that were cancelled or interrupted. A half open breaker lets the next
+        probe through.
+        """
+        with self._lock:
+            self._probing = False
+
+    def reset(self) -> None:
+        """
+        Closes the circuit.
+        """
+        self.record(failed=False)
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if now - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+
+class CircuitBreakers:
+    """
+    The [`CircuitBreaker`][circuit_breaker.CircuitBreaker] of every endpoint family, available as
+    `client.circuit_breakers`.
+
+    ??? info "Import Help"
+        ```python
+        from ticktick.circuit_breaker import CircuitBreakers
+        ```
+
+    ??? example
+        ```python
+        client.circuit_breakers = CircuitBreakers(failure_threshold=3, reset_timeout=60)
+        ...
+        if client.circuit_breakers.states()['batch'] != 'closed':
+            ...
+        ```
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, enabled: bool = True):
+        """
+        Arguments:
+            failure_threshold: Failures in a row that open the circuit of a family.
+            reset_timeout: Seconds a circuit stays open before a probe request is let through.
+            enabled: Set to False to send every request regardless of failures.
+        """
+        self.enabled = enabled
+        self._breakers = {name: CircuitBreaker(name, failure_threshold, reset_timeout)
+                          for name in [name for name, _ in FAMILIES] + ['other']}
+
+    def __getitem__(self, family: str) -> CircuitBreaker:
+        """
+        Returns the breaker of `family`.
+
+        Raises:
+            KeyError: If the family doesn't exist.
+        """
+        return self._breakers[family]
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        """
+        Returns the breaker of the family `url` belongs to.
+        """
+        return self._breakers[family(url)]
+
+    def states(self) -> dict:
+        """
+        Returns the state of every family, like `{'batch': 'open', 'tag': 'closed', ...}`.
+        """
+        return {name: breaker.state for name, breaker in self._breakers.items()}
+
+    def reset(self) -> None:
+        """
+        Closes every circuit.
+        """
+        for breaker in self._breakers.values():
+            breaker.reset()
+
+    def before_request(self, url: str):
+        """
+        Checks the breaker of `url` before sending a request to it.
+
+        Returns:
+            The breaker to [`record`][circuit_breaker.CircuitBreaker.record] the outcome on, or None if the
+            breakers are disabled.
+
+        Raises:
+            CircuitOpenError: If the circuit of the family is open.
+        """
+        if not self.enabled:
+            return None
+        breaker = self.for_url(url)
+        breaker.before_request()
+        return breaker
+
+
+def family(url: str) -> str:
+    """
+    Returns the endpoint family of `url` -> `'batch'`, `'tag'`, `'completed'`, `'open'` or `'other'`.
+    """
+    path = urlsplit(url).path
+    for name, pattern in FAMILIES:
+        if pattern.match(path):
+            return name
+    return 'other'
+
+
+def is_failure(status: int) -> bool:
+    """
+    Returns whether a response with `status` means the endpoint is failing.
+    """
+    return status == 429 or status >= 500
@@ -0,0 +1,78 @@
+"""
+Helpers for sending independent requests at the same time.
+"""
+
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from ticktick.hooks import find_caller, with_caller
+
+
+def ordered_map(func, items, workers: int = 1):
+    """
+    Calls `func` on every item using up to `workers` threads and yields the results in the order of `items`.
+
+    With one worker (or one item) everything runs on the calling thread, so the results are produced lazily, one at a
+    time. With more workers every call is submitted up front.
+
+    Arguments:
+        func: Function taking a single item.
+        items: Iterable of items.
+        workers: Most calls to run at once.
+
+    Returns:
+        A generator of the results.
+
+    Raises:
+        ValueError: If workers is less than 1.
+
+    ??? info "Import Help"
+        ```python
+        from ticktick.helpers.concurrency import ordered_map
+        ```
+
+    ??? example
+        ```python
+        for response in ordered_map(send, payloads, workers=4):
+            ...
+        ```
+    """
+    if workers < 1:
+        raise ValueError('Workers Must Be At Least 1')
+    items = list(items)
+    if workers == 1 or len(items) <= 1:
+        return (func(item) for item in items)
+    return _threaded_map(func, items, workers)
+
+
+def check_paging(window: datetime.timedelta, workers: int) -> None:
+    """
+    Checks the `window` and `workers` arguments of the methods that fetch a range in windows, like
+    [`get_completed`][managers.tasks.TaskManager.get_completed].
+
+    Raises:
+        ValueError: If window is not a positive timedelta or None, or workers is not a positive integer.
+
+    ??? info "Import Help"
+        ```python
+        from ticktick.helpers.concurrency import check_paging
+        ```
+    """
+    if not isinstance(workers, int) or workers < 1:
+        raise ValueError('Workers Must Be A Positive Integer')
+    if window is not None and (not isinstance(window, datetime.timedelta) or window <= datetime.timedelta(0)):
+        raise ValueError('Window Must Be A Positive Timedelta')
+
+
+def _threaded_map(func, items: list, workers: int):
+    # Requests sent from the threads are reported as coming from whoever called ordered_map
+    caller = find_caller()
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        futures = [pool.submit(with_caller, caller, func, item) for item in items]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            # Don't start calls that nobody will read if the consumer stopped early or a call failed
+            for future in futures:
+                future.cancel()
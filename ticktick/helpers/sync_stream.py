@@ -0,0 +1,137 @@
+"""
+Incremental parser for the response of a full sync (`batch/check/0`).
+
+The response of a full sync holds the whole account. Parsing it with `response.json()` keeps the downloaded body and
+the parsed objects in memory at the same time. [`SyncStreamParser`][helpers.sync_stream.SyncStreamParser] is fed
+the body as it arrives and builds the objects of the [`state`](api.md#state) lists one at a time, so the body is
+never held whole.
+
+!!! note
+    Requires `ijson` -> `pip install ticktick-py[stream]`. Streaming lowers the peak memory of a full sync and
+    makes the first objects available before the download finishes, but parsing takes more cpu time than
+    `response.json()`, so it pays off for large accounts.
+"""
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Bytes read from the response at a time
+CHUNK_SIZE = 64 * 1024
+
+# Prefix of the objects of each state list in the response body
+STREAMED_LISTS = {
+    'projectGroups.item': 'project_folders',
+    'projectProfiles.item': 'projects',
+    'tags.item': 'tags',
+    'syncTaskBean.update.item': 'tasks',
+}
+
+_SCALARS = frozenset(['string', 'number', 'boolean', 'null'])
+
+
+def require_ijson() -> None:
+    """
+    Raises:
+        ImportError: If ijson is not installed.
+    """
+    if ijson is None:
+        raise ImportError("Streaming the sync requires ijson -> pip install ticktick-py[stream]")
+
+
+class SyncStreamParser:
+    """
+    Builds the [`state`](api.md#state) lists from the chunks of a `batch/check/0` response body.
+
+    Only the lists that go into [`state`](api.md#state) and the top level values (like `checkPoint` and `inboxId`)
+    are kept, everything else in the body is skipped.
+
+    ??? info "Import Help"
+        ```python
+        from ticktick.helpers.sync_stream import SyncStreamParser
+        ```
+
+    ??? example
+        ```python
+        parser = SyncStreamParser()
+        for chunk in response.iter_content(CHUNK_SIZE):
+            parser.feed(chunk)
+        response = parser.close()
+        ```
+    """
+
+    def __init__(self, convert=None):
+        """
+        Arguments:
+            convert: Function called with the state key and each finished object, returning what to store ->
+                for example [`to_record`][records.to_record] to store records.
+
+        Raises:
+            ImportError: If ijson is not installed.
+        """
+        require_ijson()
+        self.lists = {search: [] for search in STREAMED_LISTS.values()}
+        self.fields = {}
+        self.bytes_read = 0
+        self._convert = convert
+        self._events = ijson.sendable_list()
+        self._parser = ijson.parse_coro(self._events, use_float=True)
+        self._builder = None
+        self._prefix = None
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Parses the next chunk of the body.
+
+        Raises:
+            ijson.JSONError: If the body is not valid json.
+        """
+        self.bytes_read += len(chunk)
+        self._parser.send(chunk)
+        self._consume()
+
+    def close(self) -> dict:
+        """
+        Finishes parsing.
+
+        Returns:
+            The response in the shape `response.json()` would have, holding the top level values and the state
+            lists.
+
+        Raises:
+            ijson.JSONError: If the body ended early.
+        """
+        self._parser.close()
+        self._consume()
+        response = dict(self.fields)
+        response['projectGroups'] = self.lists['project_folders']
+        response['projectProfiles'] = self.lists['projects']
+        response['tags'] = self.lists['tags']
+        response['syncTaskBean'] = {'update': self.lists['tasks']}
+        return response
+
+    def _consume(self) -> None:
+        """
+        Builds objects out of the events parsed so far.
+        """
+        for prefix, event, value in self._events:
+            if self._builder is not None:
+                self._builder.event(event, value)
+                # Nested objects have longer prefixes, so this is the end of the object itself
+                if event == 'end_map' and prefix == self._prefix:
+                    self._finish(self._builder.value)
+            elif event == 'start_map' and prefix in STREAMED_LISTS:
+                self._builder = ijson.ObjectBuilder()
+                self._builder.event(event, value)
+                self._prefix = prefix
+            elif event in _SCALARS and prefix and '.' not in prefix:
+                self.fields[prefix] = value
+        del self._events[:]
+
+    def _finish(self, obj: dict) -> None:
+        search = STREAMED_LISTS[self._prefix]
+        if self._convert is not None:
+            obj = self._convert(search, obj)
+        self.lists[search].append(obj)
+        self._builder = None
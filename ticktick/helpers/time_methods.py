@@ -2,11 +2,34 @@
 Useful time conversion methods.
 """
 
+import bisect
+import functools
+import re
+
 import pytz
 
-from ticktick.helpers.constants import DATE_FORMAT
 import datetime
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_DAY = datetime.timedelta(days=1)
+
+# Dates as TickTick sends them -> '2021-06-17T01:44:07.000+0000', the fraction is optional
+_TICK_TICK_DATE = re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})'
+                             r'(?:\.([0-9]{1,6}))?([+-])([0-9]{2})([0-9]{2})')
+
+
+@functools.lru_cache(maxsize=None)
+def _time_zone(time_zone: str):
+    """
+    Returns the pytz time zone for the name. Cached, since looking a zone up by name is much slower than the
+    conversions themselves.
+    """
+    return pytz.timezone(time_zone)
+
 
 def convert_local_time_to_utc(original_time, time_zone: str):
     """
@@ -38,12 +61,34 @@ def convert_local_time_to_utc(original_time, time_zone: str):
             ```
     """
 
-    utc = pytz.utc
-    time_zone = pytz.timezone(time_zone)
-    original_time = original_time.strftime(DATE_FORMAT)
-    time_object = datetime.datetime.strptime(original_time, DATE_FORMAT)
-    time_zone_dt = time_zone.localize(time_object)
-    return time_zone_dt.astimezone(utc).replace(tzinfo=None)
+    zone = _time_zone(time_zone)
+    # Drops microseconds and any attached tzinfo -> the time is read as a wall clock time in `time_zone`
+    if isinstance(original_time, datetime.datetime):
+        time_object = datetime.datetime(original_time.year, original_time.month, original_time.day,
+                                        original_time.hour, original_time.minute, original_time.second)
+    else:
+        time_object = datetime.datetime(original_time.year, original_time.month, original_time.day)
+    if zone is pytz.utc:
+        return time_object
+    return _wall_time_to_utc(zone, time_object)
+
+
+def _wall_time_to_utc(zone, time_object: datetime.datetime) -> datetime.datetime:
+    """
+    Returns the UTC time of the naive wall clock time in `zone`, the same as `zone.localize()` would.
+
+    `localize` tries every offset the zone could have around the time, which is slow. When the zone has no
+    transition within a day of the time only one offset is possible, so it is read from the zone's transition table
+    directly. Times near a transition (and zones without a table) still go through `localize`.
+    """
+    transitions = getattr(zone, '_utc_transition_times', None)
+    if transitions:
+        # localize looks the offsets up the same way -> a day either side of the wall time
+        before = bisect.bisect_right(transitions, time_object - _DAY)
+        if before == bisect.bisect_right(transitions, time_object + _DAY):
+            offset = zone._transition_info[max(0, before - 1)][0]
+            return time_object - offset
+    return zone.localize(time_object).astimezone(pytz.utc).replace(tzinfo=None)
 
 
 def convert_date_to_tick_tick_format(datetime_obj, tz: str):
@@ -83,7 +128,204 @@ def convert_date_to_tick_tick_format(datetime_obj, tz: str):
             '2022-12-31T22:30:45+0000'
             ```
     """
-    date = convert_local_time_to_utc(datetime_obj, tz)
-    date = date.replace(tzinfo=datetime.timezone.utc).isoformat()
-    date = date[::-1].replace(":", "", 1)[::-1]
-    return date
+    # The UTC time has no microseconds, so isoformat() is exactly 'YYYY-MM-DDTHH:MM:SS'
+    return convert_local_time_to_utc(datetime_obj, tz).isoformat() + '+0000'
+
+
+def convert_dates_to_tick_tick_format(datetimes, tz: str):
+    """
+    Batch version of [`convert_date_to_tick_tick_format`][helpers.time_methods.convert_date_to_tick_tick_format].
+
+    A NumPy `datetime64` array is converted with array operations instead of one Python call per date. Any other
+    sequence of datetime objects is converted one by one, looking the time zone up only once.
+
+    Arguments:
+        datetimes (list or numpy.ndarray): Local datetime objects, or a `datetime64` array of local times.
+        tz: Time zone string of the local times.
+
+    Returns:
+        list or numpy.ndarray: The TickTick date strings in the same order. A `datetime64` array gives an array of
+        strings, with None where the input was `NaT`.
+
+    Raises:
+        pytz.UnknownTimeZoneError: If `tz` is not a valid time zone.
+
+    ??? info "Import Help"
+        ```python
+        from ticktick.helpers.time_methods import convert_dates_to_tick_tick_format
+        ```
+
+    ??? example
+        ```python
+        dates = [datetime(2022, 12, 31, 14, 30, 45), datetime(2023, 1, 1)]
+        converted = convert_dates_to_tick_tick_format(dates, 'US/Pacific')
+        ```
+
+        ??? success "Result"
+            ```python
+            ['2022-12-31T22:30:45+0000', '2023-01-01T08:00:00+0000']
+            ```
+    """
+    zone = _time_zone(tz)
+    if numpy is not None and isinstance(datetimes, numpy.ndarray):
+        utc = _datetime64_to_utc(datetimes, zone)
+        strings = numpy.char.add(numpy.datetime_as_string(utc, unit='s'), '+0000').astype(object)
+        strings[numpy.isnat(utc)] = None
+        return strings
+    return [convert_local_time_to_utc(date, tz).isoformat() + '+0000' for date in datetimes]
+
+
+def parse_tick_tick_dates(strings, tz: str = None):
+    """
+    Parses TickTick date strings like `'2021-01-12T08:00:00.000+0000'` back to datetimes.
+
+    A NumPy array of strings is parsed with array operations. Any other sequence is parsed one string at a time.
+
+    Arguments:
+        strings (list or numpy.ndarray): TickTick date strings.
+        tz: Time zone string to return the local times of. UTC if not specified.
+
+    Returns:
+        list or numpy.ndarray: Datetime objects with no time zone information attached, in the same order. None
+        or empty strings give None. An array of strings gives a `datetime64[ms]` array.
+
+    Raises:
+        ValueError: If a string is not a TickTick date.
+        pytz.UnknownTimeZoneError: If `tz` is not a valid time zone.
+
+    ??? info "Import Help"
+        ```python
+        from ticktick.helpers.time_methods import parse_tick_tick_dates
+        ```
+
+    ??? example
+        ```python
+        parsed = parse_tick_tick_dates(['2022-12-31T22:30:45.000+0000'], 'US/Pacific')
+        ```
+
+        ??? success "Result"
+            ```python
+            [datetime(2022, 12, 31, 14, 30, 45)]
+            ```
+    """
+    zone = _time_zone(tz) if tz is not None else pytz.utc
+    if numpy is not None and isinstance(strings, numpy.ndarray):
+        return _parse_datetime64(strings, zone)
+
+    parsed = []
+    for string in strings:
+        utc = parse_tick_tick_date(string)
+        parsed.append(utc if zone is pytz.utc or utc is None else _utc_to_wall_time(zone, utc))
+    return parsed
+
+
+@functools.lru_cache(maxsize=65536)
+def parse_tick_tick_date(string: str):
+    """
+    Parses a TickTick date string like `'2021-06-17T01:44:07.000+0000'`, as found in the `startDate`, `dueDate`,
+    `modifiedTime`, `createdTime` and `completedTime` fields of tasks.
+
+    The fixed format is matched directly instead of going through `strptime`, and the results are cached by string,
+    so parsing the dates of the same tasks again (like sorting them a second time) is a lookup.
+
+    Arguments:
+        string: TickTick date string, or None.
+
+    Returns:
+        datetime: The UTC time with no time zone information attached, or None if `string` is None or empty.
+
+    Raises:
+        ValueError: If the string is not a TickTick date.
+
+    ??? info "Import Help"
+        ```python
+        from ticktick.helpers.time_methods import parse_tick_tick_date
+        ```
+
+    ??? example
+        ```python
+        by_due = sorted(tasks, key=lambda task: parse_tick_tick_date(task.get('dueDate')) or datetime.max)
+        ```
+    """
+    if not string:
+        return None
+    match = _TICK_TICK_DATE.fullmatch(string)
+    if match is None:
+        raise ValueError(f"'{string}' Is Not A TickTick Date")
+    year, month, day, hour, minute, second, fraction, sign, offset_hours, offset_minutes = match.groups()
+    try:
+        parsed = datetime.datetime(int(year), int(month), int(day), int(hour), int(minute), int(second),
+                                   int(fraction.ljust(6, '0')) if fraction else 0)
+    except ValueError:
+        raise ValueError(f"'{string}' Is Not A TickTick Date") from None
+    if offset_hours == '00' and offset_minutes == '00':
+        return parsed
+    offset = datetime.timedelta(hours=int(offset_hours), minutes=int(offset_minutes))
+    return parsed - offset if sign == '+' else parsed + offset
+
+
+def _utc_to_wall_time(zone, utc: datetime.datetime) -> datetime.datetime:
+    """
+    Returns the wall clock time in `zone` of the naive UTC time.
+    """
+    return pytz.utc.localize(utc).astimezone(zone).replace(tzinfo=None)
+
+
+@functools.lru_cache(maxsize=None)
+def _transition_table(zone):
+    """
+    Returns the transition times (UTC) and the offset after each of them as `datetime64` and `timedelta64` arrays,
+    or None for zones with a single offset.
+    """
+    transitions = getattr(zone, '_utc_transition_times', None)
+    if not transitions:
+        return None
+    times = numpy.array(transitions, dtype='datetime64[s]')
+    offsets = numpy.array([info[0] for info in zone._transition_info], dtype='timedelta64[s]')
+    return times, offsets
+
+
+def _datetime64_to_utc(values, zone):
+    """
+    Array version of [`convert_local_time_to_utc`][helpers.time_methods.convert_local_time_to_utc], see
+    `_wall_time_to_utc` for how the offsets are found.
+    """
+    local = numpy.asarray(values).astype('datetime64[s]')
+    if zone is pytz.utc:
+        return local
+    table = _transition_table(zone)
+    if table is None:
+        return local - numpy.timedelta64(zone.utcoffset(None), 's')
+    times, offsets = table
+
+    day = numpy.timedelta64(1, 'D')
+    before = numpy.searchsorted(times, local - day, side='right')
+    after = numpy.searchsorted(times, local + day, side='right')
+    utc = local - offsets[numpy.maximum(before - 1, 0)]
+    # Times near a transition may have two offsets or none -> let localize pick like it does for single dates
+    for index in numpy.flatnonzero((before != after) & ~numpy.isnat(local)):
+        utc[index] = _wall_time_to_utc(zone, local[index].item())
+    return utc
+
+
+def _parse_datetime64(strings, zone):
+    """
+    Array version of [`parse_tick_tick_dates`][helpers.time_methods.parse_tick_tick_dates].
+    """
+    strings = numpy.asarray(strings, dtype=str)
+    if not numpy.all(numpy.char.endswith(strings, '+0000')):
+        # Not all in UTC -> parse one at a time, parse_tick_tick_date applies the offsets
+        return numpy.array(parse_tick_tick_dates(strings.tolist(), zone.zone), dtype='datetime64[ms]')
+    try:
+        utc = numpy.char.replace(strings, '+0000', '').astype('datetime64[ms]')
+    except ValueError:
+        raise ValueError('Strings Must Be TickTick Dates') from None
+    if zone is pytz.utc:
+        return utc
+    table = _transition_table(zone)
+    if table is None:
+        return utc + numpy.timedelta64(zone.utcoffset(None), 's')
+    times, offsets = table
+    # UTC times are never ambiguous -> the offset after the last transition before the time
+    index = numpy.maximum(numpy.searchsorted(times, utc.astype('datetime64[s]'), side='right') - 1, 0)
+    return utc + offsets[index]
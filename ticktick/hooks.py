@@ -0,0 +1,326 @@
+"""
+Instrumentation hooks for the requests sent to TickTick.
+
+Every request sent by [`TickTickClient`][api.TickTickClient], [`AsyncTickTickClient`][async_api.AsyncTickTickClient]
+and [`OAuth2`][oauth2.OAuth2] is reported to the functions registered on their `hooks` member as a
+[`RequestEvent`][hooks.RequestEvent]. A client shares the registry of its `OAuth2` manager, so registering once
+covers both.
+
+!!! example "Exporting Request Metrics"
+    ```python
+    def record(event):
+        metrics.histogram('ticktick.latency', event.elapsed, tags=[event.method, event.endpoint, event.caller])
+        metrics.count('ticktick.bytes_in', event.bytes_received)
+
+    client.hooks.add(record)
+    ```
+
+!!! example "Measuring Compression"
+    ```python
+    counter = client.hooks.add(ByteCounter())
+    client.sync()
+    print(counter.received, counter.wire_received)
+    ```
+"""
+
+import logging
+import re
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+from ticktick.helpers.compression import gzip_size
+
+log = logging.getLogger(__name__)
+
+# Path segments that identify a specific object rather than the kind of endpoint
+_ID_SEGMENT = re.compile(r'^(?:[0-9a-f]{24}|inbox\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$')
+_NUMBER_SEGMENT = re.compile(r'^\d+$')
+
+# Caller of the request that started the current thread's work, see with_caller
+_INHERITED = threading.local()
+
+
+class RequestEvent:
+    """
+    Describes a single request.
+
+    Attributes:
+        method: Http method, like 'GET'.
+        url: Full url of the request, without the query string.
+        endpoint: The url path with object ids and numbers replaced by `{id}` and `{n}`, for grouping.
+        status: Http status code, or None if no response was received.
+        elapsed: Seconds from sending the request to receiving the whole response, including any retries and the
+            waits between them.
+        bytes_sent: Size of the request body before compression.
+        bytes_received: Size of the response body after decompression.
+        wire_bytes_sent: Size of the request body as sent, compressed if it was.
+        wire_bytes_received: Size of the response body as received, compressed if it was.
+        retries: How many times the request was retried before the reported response or error -> one event is
+            emitted per request, not per attempt, by both clients.
+        caller: The outermost library method that led to the request, like 'TaskManager.create'.
+        error: The exception raised while sending the request, if any.
+    """
+
+    __slots__ = ('method', 'url', 'endpoint', 'status', 'elapsed', 'bytes_sent', 'bytes_received', 'retries',
+                 'caller', 'error', 'wire_bytes_sent', 'wire_bytes_received')
+
+    def __init__(self, method: str, url: str, endpoint: str, status, elapsed: float, bytes_sent: int,
+                 bytes_received: int, retries: int, caller, error=None, wire_bytes_sent: int = None,
+                 wire_bytes_received: int = None):
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint
+        self.status = status
+        self.elapsed = elapsed
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.retries = retries
+        self.caller = caller
+        self.error = error
+        self.wire_bytes_sent = bytes_sent if wire_bytes_sent is None else wire_bytes_sent
+        self.wire_bytes_received = bytes_received if wire_bytes_received is None else wire_bytes_received
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'RequestEvent({fields})'
+
+
+class RequestHooks:
+    """
+    Registry of the functions called with a [`RequestEvent`][hooks.RequestEvent] after every request.
+
+    Exceptions raised by a hook are logged and otherwise ignored, so instrumentation can never break a request.
+    """
+
+    def __init__(self):
+        self._hooks = []
+
+    def add(self, hook):
+        """
+        Registers `hook`. Returns it, so this can be used as a decorator.
+
+        Arguments:
+            hook: Function taking a [`RequestEvent`][hooks.RequestEvent].
+        """
+        self._hooks.append(hook)
+        return hook
+
+    def remove(self, hook) -> None:
+        """
+        Unregisters `hook`.
+
+        Raises:
+            ValueError: If the hook is not registered.
+        """
+        self._hooks.remove(hook)
+
+    def __len__(self):
+        return len(self._hooks)
+
+    def emit(self, event: RequestEvent) -> None:
+        """
+        Calls every hook with `event`.
+        """
+        for hook in list(self._hooks):
+            try:
+                hook(event)
+            except Exception:
+                log.exception(f"Request hook {hook!r} failed")
+
+    def started(self):
+        """
+        Returns the token to pass to [`finished`][hooks.RequestHooks.finished], or None if nothing is registered.
+        """
+        if not self._hooks:
+            return None
+        return time.perf_counter(), find_caller()
+
+    def finished(self, token, method: str, url: str, response=None, error=None, bytes_received: int = None,
+                 retries: int = None) -> None:
+        """
+        Reports a finished request to the hooks.
+
+        Arguments:
+            token: What [`started`][hooks.RequestHooks.started] returned when the request was sent.
+            method: Http method.
+            url: Url of the request.
+            response: The `requests` or `httpx` response, if one was received.
+            error: The exception raised while sending, if any.
+            bytes_received: Size of the response body after decompression, for streamed responses whose body was
+                already read.
+            retries: How many times the request was retried, for clients that retry themselves. Read from the
+                urllib3 retry history of the response when not given.
+        """
+        if token is None:
+            return
+        started, caller = token
+        elapsed = time.perf_counter() - started
+        url = urlsplit(url)._replace(query='', fragment='').geturl()
+        bytes_sent, wire_bytes_sent = _request_size(response)
+        if bytes_received is None:
+            bytes_received = len(response.content) if response is not None else 0
+        self.emit(RequestEvent(
+            method=method.upper(),
+            url=url,
+            endpoint=endpoint_template(url),
+            status=getattr(response, 'status_code', None),
+            elapsed=elapsed,
+            bytes_sent=bytes_sent,
+            bytes_received=bytes_received,
+            retries=_retries(response) if retries is None else retries,
+            caller=caller,
+            error=error,
+            wire_bytes_sent=wire_bytes_sent,
+            wire_bytes_received=_wire_size(response, bytes_received)
+        ))
+
+
+class ByteCounter:
+    """
+    Hook adding up the bytes of every request, before compression and on the wire. Thread safe.
+
+    Attributes:
+        sent: Request body bytes before compression.
+        wire_sent: Request body bytes as sent.
+        received: Response body bytes after decompression.
+        wire_received: Response body bytes as received.
+
+    ??? info "Import Help"
+        ```python
+        from ticktick.hooks import ByteCounter
+        ```
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.wire_sent = 0
+        self.received = 0
+        self.wire_received = 0
+
+    def __call__(self, event: RequestEvent) -> None:
+        with self._lock:
+            self.sent += event.bytes_sent
+            self.wire_sent += event.wire_bytes_sent
+            self.received += event.bytes_received
+            self.wire_received += event.wire_bytes_received
+
+    def as_dict(self) -> dict:
+        """
+        Returns the counters as a dictionary.
+        """
+        with self._lock:
+            return {'sent': self.sent, 'wire_sent': self.wire_sent,
+                    'received': self.received, 'wire_received': self.wire_received}
+
+
+def endpoint_template(url: str) -> str:
+    """
+    Returns the path of `url` with the segments that identify objects replaced, so requests to the same kind of
+    endpoint can be grouped.
+
+    ??? example
+        ```python
+        endpoint_template('https://api.ticktick.com/api/v2/batch/check/1234')
+        # '/api/v2/batch/check/{n}'
+        ```
+    """
+    segments = []
+    for segment in urlsplit(url).path.split('/'):
+        if _ID_SEGMENT.match(segment):
+            segment = '{id}'
+        elif _NUMBER_SEGMENT.match(segment):
+            segment = '{n}'
+        segments.append(segment)
+    return '/'.join(segments)
+
+
+def find_caller():
+    """
+    Returns the outermost public library method on the current call stack, like 'TaskManager.create', or None.
+    """
+    inherited = getattr(_INHERITED, 'caller', None)
+    if inherited is not None:
+        # Everything on this thread runs on behalf of the method that handed the work over
+        return inherited
+
+    caller = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        name = frame.f_code.co_name
+        if module.startswith('ticktick.') and not name.startswith(('_', '<')) and module != __name__:
+            owner = frame.f_locals.get('self')
+            caller = f'{type(owner).__name__}.{name}' if owner is not None else name
+        frame = frame.f_back
+    return caller
+
+
+def with_caller(caller, func, *args):
+    """
+    Calls `func(*args)` with `caller` reported as the caller of the requests it sends. Used to keep the caller of
+    work handed to other threads.
+    """
+    previous = getattr(_INHERITED, 'caller', None)
+    _INHERITED.caller = caller
+    try:
+        return func(*args)
+    finally:
+        _INHERITED.caller = previous
+
+
+def _request_size(response) -> tuple:
+    """
+    Returns the size of the body of the request that produced `response`, before compression and as sent.
+    """
+    request = getattr(response, 'request', None)
+    if request is None:
+        return 0, 0
+    # httpx keeps the body in .content, requests in .body
+    body = getattr(request, 'content', None)
+    if body is None:
+        body = getattr(request, 'body', None)
+    if body is None:
+        return 0, 0
+    if isinstance(body, str):
+        body = body.encode()
+    try:
+        wire = len(body)
+    except TypeError:
+        # Streamed bodies don't have a known size
+        return 0, 0
+    if request.headers.get('Content-Encoding') == 'gzip':
+        return gzip_size(body), wire
+    return wire, wire
+
+
+def _wire_size(response, decoded: int) -> int:
+    """
+    Returns how many bytes of the body of `response` came over the wire, `decoded` if that is unknown.
+    """
+    if response is None:
+        return 0
+    # httpx counts the bytes it downloads, urllib3 the bytes read from the socket
+    downloaded = getattr(response, 'num_bytes_downloaded', None)
+    if isinstance(downloaded, int):
+        return downloaded
+    tell = getattr(getattr(response, 'raw', None), 'tell', None)
+    if tell is not None:
+        try:
+            read = tell()
+        except (OSError, ValueError):
+            read = None
+        if isinstance(read, int) and (read or not decoded):
+            return read
+    return decoded
+
+
+def _retries(response) -> int:
+    """
+    Returns how many times urllib3 retried the request that produced `response`.
+    """
+    retries = getattr(getattr(response, 'raw', None), 'retries', None)
+    history = getattr(retries, 'history', None)
+    return len(history) if history else 0
@@ -0,0 +1,97 @@
+from ticktick.managers.projects import ProjectManager
+
+
+class AsyncProjectManager(ProjectManager):
+    """
+    Asyncio version of [`ProjectManager`][managers.projects.ProjectManager] used by
+    [`AsyncTickTickClient`][async_api.AsyncTickTickClient]. Methods that send requests are coroutines and take the
+    same arguments as their [`ProjectManager`][managers.projects.ProjectManager] counterparts.
+    """
+
+    async def create(self, name, color: str = 'random', project_type: str = 'TASK', folder_id: str = None):
+        """
+        Async version of [`create`][managers.projects.ProjectManager.create].
+        """
+        obj = self._create_objects(name, color, project_type, folder_id)
+        url = self._client.BASE_URL + 'batch/project'
+        payload = {
+            'add': obj
+        }
+        response = await self._client.http_post(url, json=payload, cookies=self._client.cookies,
+                                                headers=self.headers)
+        await self._client.sync()
+        return self._objects_from_response(response, obj, 'projects')
+
+    async def update(self, obj):
+        """
+        Async version of [`update`][managers.projects.ProjectManager.update].
+        """
+        tasks = self._update_objects(obj)
+        url = self._client.BASE_URL + 'batch/project'
+        payload = {
+            'update': tasks
+        }
+        response = await self._client.http_post(url, json=payload, cookies=self._client.cookies,
+                                                headers=self.headers)
+        await self._client.sync()
+        return self._objects_from_response(response, tasks, 'projects')
+
+    async def delete(self, ids):
+        """
+        Async version of [`delete`][managers.projects.ProjectManager.delete].
+        """
+        ids = self._existing_ids(ids, 'projects', 'Project')
+        url = self._client.BASE_URL + 'batch/project'
+        payload = {
+            'delete': ids
+        }
+        await self._client.http_post(url, json=payload, cookies=self._client.cookies, headers=self.headers)
+        return self._delete_locally(ids)
+
+    async def archive(self, ids):
+        """
+        Async version of [`archive`][managers.projects.ProjectManager.archive].
+        """
+        return await self.update(self._archive_objects(ids))
+
+    async def create_folder(self, name):
+        """
+        Async version of [`create_folder`][managers.projects.ProjectManager.create_folder].
+        """
+        objs = self._folder_objects(name)
+        url = self._client.BASE_URL + 'batch/projectGroup'
+        payload = {
+            'add': objs
+        }
+        response = await self._client.http_post(url, json=payload, cookies=self._client.cookies,
+                                                headers=self.headers)
+        await self._client.sync()
+        return self._objects_from_response(response, objs, 'project_folders')
+
+    async def update_folder(self, obj):
+        """
+        Async version of [`update_folder`][managers.projects.ProjectManager.update_folder].
+        """
+        tasks = self._update_objects(obj)
+        url = self._client.BASE_URL + 'batch/projectGroup'
+        payload = {
+            'update': tasks
+        }
+        response = await self._client.http_post(url, json=payload, cookies=self._client.cookies,
+                                                headers=self.headers)
+        await self._client.sync()
+        return self._objects_from_response(response, tasks, 'project_folders')
+
+    async def delete_folder(self, ids):
+        """
+        Async version of [`delete_folder`][managers.projects.ProjectManager.delete_folder].
+        """
+        ids = self._existing_ids(ids, 'project_folders', 'Project Folder')
+        url = self._client.BASE_URL + 'batch/projectGroup'
+        payload = {
+            'delete': ids
+        }
+        await self._client.http_post(url, json=payload, cookies=self._client.cookies, headers=self.headers)
+        deleted = self._delete_folders_locally(ids)
+        await self._client.sync()
+        return deleted
@@ -0,0 +1,174 @@
+import asyncio
+
+from ticktick.managers.tags import TagsManager
+
+
+class AsyncTagsManager(TagsManager):
+    """
+    Asyncio version of [`TagsManager`][managers.tags.TagsManager] used by
+    [`AsyncTickTickClient`][async_api.AsyncTickTickClient]. Methods that send requests are coroutines and take the
+    same arguments as their [`TagsManager`][managers.tags.TagsManager] counterparts.
+    """
+
+    async def create(self, label, color: str = 'random', parent: str = None, sort: int = None):
+        """
+        Async version of [`create`][managers.tags.TagsManager.create].
+        """
+        batch = isinstance(label, list)  # Bool signifying batch create or not
+        obj = self._create_objects(label, color, parent, sort)
+
+        url = self._client.BASE_URL + 'batch/tag'
+        payload = {'add': obj}
+        response = await self._client.http_post(url, json=payload, cookies=self._client.cookies,
+                                                headers=self.headers)
+        await self._client.sync()
+
+        if not batch:
+            return self._client.get_by_etag(self._client.parse_etag(response), search='tags')
+        else:
+            items = self._tags_from_response(response, obj)
+            if len(items) == 1:
+                return items[0]
+            else:
+                return items
+
+    async def rename(self, old: str, new: str) -> dict:
+        """
+        Async version of [`rename`][managers.tags.TagsManager.rename].
+        """
+        payload = self._rename_payload(old, new)
+        url = self._client.BASE_URL + 'tag/rename'
+        await self._client.http_put(url, json=payload, cookies=self._client.cookies, headers=self.headers)
+        return self._rename_locally(payload['name'], new)
+
+    async def color(self, label: str, color: str) -> dict:
+        """
+        Async version of [`color`][managers.tags.TagsManager.color].
+        """
+        obj = self._color_object(label, color)
+        return (await self._update_locally([obj]))[0]
+
+    async def sorting(self, label: str, sort: int) -> dict:
+        """
+        Async version of [`sorting`][managers.tags.TagsManager.sorting].
+        """
+        obj = self._sorting_object(label, sort)
+        return (await self._update_locally([obj]))[0]
+
+    async def _update_locally(self, objs: list) -> list:
+        """
+        Sends the updated tags and sets their new etags in `state`, syncing only if TickTick didn't confirm them.
+        """
+        url = self._client.BASE_URL + 'batch/tag'
+        payload = {
+            'update': objs
+        }
+        response = await self._client.http_post(url, json=payload, cookies=self._client.cookies,
+                                                headers=self.headers)
+        if not self._confirms(response, objs):
+            await self._client.sync()
+            return [self._client.get_by_fields(name=obj['name'], search='tags') for obj in objs]
+        return self._set_etags(response, objs)
+
+    async def nesting(self, child: str, parent: str) -> dict:
+        """
+        Async version of [`nesting`][managers.tags.TagsManager.nesting].
+        """
+        obj, pobj = self._nesting_objects(child, parent)
+        if pobj is None:
+            return obj  # Nothing to change
+
+        return (await self._update_locally([pobj, obj]))[1]
+
+    async def update(self, obj):
+        """
+        Async version of [`update`][managers.tags.TagsManager.update].
+        """
+        batch = isinstance(obj, list)  # Bool signifying batch update or not
+        obj_list = self._update_objects(obj)
+
+        url = self._client.BASE_URL + 'batch/tag'
+        payload = {'update': obj_list}
+        response = await self._client.http_post(url, json=payload, cookies=self._client.cookies,
+                                                headers=self.headers)
+        await self._client.sync()
+
+        if not batch:
+            return self._client.get_by_etag(self._client.parse_etag(response), search='tags')
+        else:
+            return self._tags_from_response(response, obj_list)
+
+    async def merge(self, label, merged: str, workers: int = 1):
+        """
+        Async version of [`merge`][managers.tags.TagsManager.merge].
+        """
+        kept_obj, merge_queue = self._merge_queue(label, merged)
+        self._raise_failed(await self._send_merges(kept_obj, merge_queue, workers))
+        return kept_obj
+
+    async def bulk_merge(self, label, merged: str, workers: int = 1) -> list:
+        """
+        Async version of [`bulk_merge`][managers.tags.TagsManager.bulk_merge].
+        """
+        kept_obj, merge_queue = self._merge_queue(label, merged)
+        return await self._send_merges(kept_obj, merge_queue, workers)
+
+    async def _send_merges(self, kept_obj: dict, merge_queue: list, workers: int) -> list:
+        self._check_workers(workers)
+        url = self._client.BASE_URL + 'tag/merge'
+        limit = asyncio.Semaphore(workers)
+
+        async def send(tag_obj):
+            async with limit:
+                try:
+                    await self._client.http_put(url, json={'name': tag_obj['name'], 'newName': kept_obj['name']},
+                                                cookies=self._client.cookies, headers=self.headers)
+                except RuntimeError as error:
+                    return self._tag_result(tag_obj, error)
+            return self._tag_result(tag_obj)
+
+        results = []
+        try:
+            results.extend(await asyncio.gather(*(send(tag_obj) for tag_obj in merge_queue)))
+        finally:
+            self._evict_merged(kept_obj, results)
+            await self._client.sync()
+        return results
+
+    async def delete(self, label, workers: int = 1):
+        """
+        Async version of [`delete`][managers.tags.TagsManager.delete].
+        """
+        results = await self.bulk_delete(label, workers)
+        self._raise_failed(results)
+        objects = [result['tag'] for result in results]
+        if len(objects) == 1:
+            return objects[0]
+        else:
+            return objects
+
+    async def bulk_delete(self, label, workers: int = 1) -> list:
+        """
+        Async version of [`bulk_delete`][managers.tags.TagsManager.bulk_delete].
+        """
+        tag_objs = self._delete_queue(label)
+        self._check_workers(workers)
+        url = self._client.BASE_URL + 'tag'
+        limit = asyncio.Semaphore(workers)
+
+        async def send(tag_obj):
+            async with limit:
+                try:
+                    await self._client.http_delete(url, params={'name': tag_obj['name']},
+                                                   cookies=self._client.cookies, headers=self.headers)
+                except RuntimeError as error:
+                    return self._tag_result(tag_obj, error)
+            return self._tag_result(tag_obj)
+
+        results = []
+        try:
+            results.extend(await asyncio.gather(*(send(tag_obj) for tag_obj in tag_objs)))
+        finally:
+            self._evict_deleted(results)
+            await self._client.sync()
+        return results
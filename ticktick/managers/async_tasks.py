@@ -0,0 +1,218 @@
+import asyncio
+import datetime
+import logging
+
+from ticktick.managers.tasks import TaskManager
+
+log = logging.getLogger(__name__)
+
+
+class AsyncTaskManager(TaskManager):
+    """
+    Asyncio version of [`TaskManager`][managers.tasks.TaskManager] used by
+    [`AsyncTickTickClient`][async_api.AsyncTickTickClient]. Methods that send requests are coroutines and take the
+    same arguments as their [`TaskManager`][managers.tasks.TaskManager] counterparts.
+    """
+
+    async def create(self, task):
+        """
+        Async version of [`create`][managers.tasks.TaskManager.create].
+        """
+        url = self._generate_create_url()
+        response = await self._client.http_post(url=url, json=task, headers=self.oauth_headers)
+        await self._client.sync()
+        return self._created_task(response)
+
+    async def bulk_create(self, tasks: list, chunk_size: int = None, workers: int = 1) -> dict:
+        """
+        Async version of [`bulk_create`][managers.tasks.TaskManager.bulk_create]. Up to `workers` chunks are sent
+        at the same time.
+        """
+        chunks = self._bulk_add_chunks(tasks, chunk_size)
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError('Workers Must Be A Positive Integer')
+
+        url = self._client.BASE_URL + 'batch/task'
+        limit = asyncio.Semaphore(workers)
+
+        async def send(chunk):
+            async with limit:
+                return await self._client.http_post(url, json={'add': chunk}, cookies=self._client.cookies,
+                                                    headers=self.headers)
+
+        try:
+            responses = await asyncio.gather(*(send(chunk) for chunk in chunks))
+        except Exception:
+            await self._sync_after_failure()
+            raise
+        if chunks:
+            await self._client.sync()
+        return self._merge_batch_results(responses)
+
+    async def _sync_after_failure(self) -> None:
+        """
+        Async version of `TaskManager._sync_after_failure`.
+        """
+        try:
+            await self._client.sync()
+        except Exception:
+            log.warning('Sync after a failed bulk request failed too', exc_info=True)
+
+    async def update(self, task):
+        """
+        Async version of [`update`][managers.tasks.TaskManager.update].
+        """
+        url = self._generate_update_url(task['id'])
+        response = await self._client.http_post(url=url, json=task, headers=self.oauth_headers)
+        await self._client.sync()
+        return response
+
+    async def complete(self, task: dict):
+        """
+        Async version of [`complete`][managers.tasks.TaskManager.complete].
+        """
+        url = self._generate_mark_complete_url(task['projectId'], task['id'])
+        response = await self._client.http_post(url=url, json=task, headers=self.oauth_headers)
+        await self._client.sync()
+        if response == '':
+            return task
+        return response
+
+    async def delete(self, task, chunk_size: int = None, workers: int = 1):
+        """
+        Async version of [`delete`][managers.tasks.TaskManager.delete].
+        """
+        results = await self.bulk_delete(task if isinstance(task, list) else [task], chunk_size, workers)
+        self._raise_failed_chunk(results)
+        return task
+
+    async def bulk_delete(self, tasks: list, chunk_size: int = None, workers: int = 1) -> list:
+        """
+        Async version of [`bulk_delete`][managers.tasks.TaskManager.bulk_delete].
+        """
+        chunks = self._delete_chunks(tasks, chunk_size)
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError('Workers Must Be A Positive Integer')
+
+        url = self._generate_delete_url()
+        limit = asyncio.Semaphore(workers)
+
+        async def send(chunk):
+            async with limit:
+                try:
+                    response = await self._client.http_post(url, json={'delete': chunk},
+                                                            cookies=self._client.cookies, headers=self.headers)
+                except RuntimeError as error:
+                    return self._delete_result(chunk, error=error)
+            return self._delete_result(chunk, response)
+
+        results = list(await asyncio.gather(*(send(chunk) for chunk in chunks)))
+        self._evict_deleted(results)
+        return results
+
+    async def make_subtask(self, obj, parent: str):
+        """
+        Async version of [`make_subtask`][managers.tasks.TaskManager.make_subtask].
+        """
+        subtasks, ids = self._subtask_payload(obj, parent)
+        url = self._client.BASE_URL + 'batch/taskParent'
+        await self._client.http_post(url, json=subtasks, cookies=self._client.cookies, headers=self.headers)
+        await self._client.sync()
+        return self._found_tasks(ids, search='tasks')
+
+    async def move(self, obj, new: str):
+        """
+        Async version of [`move`][managers.tasks.TaskManager.move].
+        """
+        move_tasks, ids = self._move_payload(obj, new)
+        url = self._client.BASE_URL + 'batch/taskProject'
+        await self._client.http_post(url, json=move_tasks, cookies=self._client.cookies, headers=self.headers)
+        await self._client.sync()
+        return self._found_tasks(ids)
+
+    async def move_all(self, old: str, new: str) -> list:
+        """
+        Async version of [`move_all`][managers.tasks.TaskManager.move_all].
+        """
+        task_project = self._move_all_payload(old, new)
+        if not task_project:
+            return task_project
+        url = self._client.BASE_URL + 'batch/taskProject'
+        await self._client.http_post(url, json=task_project, cookies=self._client.cookies, headers=self.headers)
+        await self._client.sync()
+        return self.get_from_project(new)
+
+    async def get_completed(self,
+                            start,
+                            end=None,
+                            full: bool = True,
+                            tz: str = None,
+                            window: datetime.timedelta = None,
+                            workers: int = 1) -> list:
+        """
+        Async version of [`get_completed`][managers.tasks.TaskManager.get_completed]. Up to `workers` windows are
+        fetched at the same time.
+        """
+        return [task async for task in self.iter_completed(start, end, full, tz, window=window, workers=workers)]
+
+    def iter_completed(self,
+                       start,
+                       end=None,
+                       full: bool = True,
+                       tz: str = None,
+                       window: datetime.timedelta = None,
+                       workers: int = 1):
+        """
+        Async version of [`iter_completed`][managers.tasks.TaskManager.iter_completed]. Returns an async generator
+        that yields the completed tasks newest first.
+
+        !!! example
+            ```python
+            async for task in client.task.iter_completed(datetime(2019, 1, 1), datetime(2021, 1, 1)):
+                report.add(task)
+            ```
+        """
+        return super().iter_completed(start, end, full, tz, window=window, workers=workers)
+
+    async def _iter_completed(self, windows: list, workers: int):
+        """
+        Async version of `TaskManager._iter_completed`. With more than one worker
+        up to `workers` windows are fetched at the same time and each is yielded once the windows before it are.
+        """
+        seen = set()
+        if workers == 1:
+            for bounds in windows:
+                async for page in self._completed_pages(*bounds):
+                    for task in self._unseen(page, seen):
+                        yield task
+            return
+
+        limit = asyncio.Semaphore(workers)
+
+        async def fetch(bounds):
+            async with limit:
+                return [task async for page in self._completed_pages(*bounds) for task in page]
+
+        fetches = [asyncio.ensure_future(fetch(bounds)) for bounds in windows]
+        try:
+            for window_fetch in fetches:
+                for task in self._unseen(await window_fetch, seen):
+                    yield task
+        finally:
+            # Stopping early leaves the later windows running
+            for window_fetch in fetches:
+                window_fetch.cancel()
+
+    async def _completed_pages(self, start: datetime.datetime, end: datetime.datetime):
+        """
+        Async version of `TaskManager._completed_pages`.
+        """
+        url = self._client.BASE_URL + 'project/all/completed'
+        while True:
+            parameters = self._completed_page_parameters(start, end)
+            page = await self._client.http_get(url, params=parameters, cookies=self._client.cookies,
+                                               headers=self.headers)
+            yield page
+            end = self._next_completed_end(page, end)
+            if end is None or end < start:
+                return
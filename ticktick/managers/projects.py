@@ -1,3 +1,5 @@
+from collections.abc import Mapping
+
 from ticktick.helpers.hex_color import check_hex_color, generate_hex_color
 from ticktick.managers.check_logged_in import logged_in
 
@@ -221,14 +223,26 @@ class ProjectManager:
                 ```
                 [![project-batch-create.png](https://i.postimg.cc/8CHH8xSZ/project-batch-create.png)](https://postimg.cc/d7hdrHDC)
 
+        """
+        obj = self._create_objects(name, color, project_type, folder_id)
+
+        url = self._client.BASE_URL + 'batch/project'
+        payload = {
+            'add': obj
+        }
+        response = self._client.http_post(url, json=payload, cookies=self._client.cookies, headers=self.headers)
+        self._client.sync()
+        return self._objects_from_response(response, obj, 'projects')
+
+    def _create_objects(self, name, color: str, project_type: str, folder_id: str) -> list:
+        """
+        Returns the list of project objects that [`create`][managers.projects.ProjectManager.create] should add.
         """
         if isinstance(name, list):
             # If task name is a list, we will batch create objects
             obj = name
-            batch = True
         # Create the single project object
         elif isinstance(name, str):
-            batch = False
             obj = self.builder(name=name,
                                color=color,
                                project_type=project_type,
@@ -238,24 +252,25 @@ class ProjectManager:
         else:
             raise TypeError(f"Required Positional Argument Must Be A String or List of Project Objects")
 
-        url = self._client.BASE_URL + 'batch/project'
-        payload = {
-            'add': obj
-        }
-        response = self._client.http_post(url, json=payload, cookies=self._client.cookies, headers=self.headers)
-        self._client.sync()
-        if len(obj) == 1:
-            return self._client.get_by_id(self._client.parse_id(response), search='projects')
+        return obj
+
+    def _objects_from_response(self, response: dict, originals: list, search: str):
+        """
+        Returns the objects in `state[search]` that were created or updated from `originals`, in the same order.
+        Just the dictionary object is returned if there is a single one.
+        """
+        if len(originals) == 1:
+            return self._client.get_by_id(self._client.parse_id(response), search=search)
         else:
             etag = response['id2etag']
             etag2 = list(etag.keys())  # Get the ids
-            items = [''] * len(obj)  # Create enough spots for the objects
+            items = [''] * len(originals)  # Create enough spots for the objects
             for proj_id in etag2:
-                found = self._client.get_by_id(proj_id, search='projects')
-                for original in obj:
+                found = self._client.get_by_id(proj_id, search=search)
+                for original in originals:
                     if found['name'] == original['name']:
                         # Get the index of original
-                        index = obj.index(original)
+                        index = originals.index(original)
                         # Place found at the index in return list
                         items[index] = found
             return items
@@ -363,14 +378,7 @@ class ProjectManager:
                 [![project-update-multiple-after.png](https://i.postimg.cc/3RVGNv2y/project-update-multiple-after.png)](https://postimg.cc/0MGjHrWx)
 
         """
-        # Check the types
-        if not isinstance(obj, dict) and not isinstance(obj, list):
-            raise TypeError("Project objects must be a dict or list of dicts.")
-
-        if isinstance(obj, dict):
-            tasks = [obj]
-        else:
-            tasks = obj
+        tasks = self._update_objects(obj)
 
         url = self._client.BASE_URL + 'batch/project'
         payload = {
@@ -378,21 +386,21 @@ class ProjectManager:
         }
         response = self._client.http_post(url, json=payload, cookies=self._client.cookies, headers=self.headers)
         self._client.sync()
-        if len(tasks) == 1:
-            return self._client.get_by_id(self._client.parse_id(response), search='projects')
+        return self._objects_from_response(response, tasks, 'projects')
+
+    @staticmethod
+    def _update_objects(obj) -> list:
+        """
+        Checks the type of the object(s) to update and returns them in a list.
+        """
+        # Check the types
+        if not isinstance(obj, Mapping) and not isinstance(obj, list):
+            raise TypeError("Project objects must be a dict or list of dicts.")
+
+        if isinstance(obj, Mapping):
+            return [obj]
         else:
-            etag = response['id2etag']
-            etag2 = list(etag.keys())  # Get the ids
-            items = [''] * len(obj)  # Create enough spots for the objects
-            for proj_id in etag2:
-                found = self._client.get_by_id(proj_id, search='projects')
-                for original in obj:
-                    if found['name'] == original['name']:
-                        # Get the index of original
-                        index = obj.index(original)
-                        # Place found at the index in return list
-                        items[index] = found
-            return items
+            return obj
 
     def delete(self, ids):
         """
@@ -443,34 +451,58 @@ class ProjectManager:
 
                 A list of the deleted dictionary objects will be returned.
 
+        """
+        ids = self._existing_ids(ids, 'projects', 'Project')
+
+        # Delete the task
+        url = self._client.BASE_URL + 'batch/project'
+        payload = {
+            'delete': ids
+        }
+        self._client.http_post(url, json=payload, cookies=self._client.cookies, headers=self.headers)
+        return self._delete_locally(ids)
+
+    def _existing_ids(self, ids, search: str, kind: str) -> list:
+        """
+        Checks that every id exists in `state[search]` and returns the ids in a list.
         """
         if not isinstance(ids, str) and not isinstance(ids, list):
             raise TypeError('Ids Must Be A String or List Of Strings')
 
         if isinstance(ids, str):
-            proj = self._client.get_by_fields(id=ids, search='projects')
+            proj = self._client.get_by_fields(id=ids, search=search)
             if not proj:
-                raise ValueError(f"Project '{ids}' Does Not Exist To Delete")
+                raise ValueError(f"{kind} '{ids}' Does Not Exist To Delete")
             ids = [ids]
         else:
             for i in ids:
-                proj = self._client.get_by_fields(id=i, search='projects')
+                proj = self._client.get_by_fields(id=i, search=search)
                 if not proj:
-                    raise ValueError(f"Project '{i}' Does Not Exist To Delete")
+                    raise ValueError(f"{kind} '{i}' Does Not Exist To Delete")
+        return ids
 
-        # Delete the task
-        url = self._client.BASE_URL + 'batch/project'
-        payload = {
-            'delete': ids
-        }
-        self._client.http_post(url, json=payload, cookies=self._client.cookies, headers=self.headers)
-        # Delete the list
-        deleted_list = []
-        for current_id in ids:
-            tasks = self._client.task.get_from_project(current_id)
-            for task in tasks:
-                self._client.delete_from_local_state(id=task['id'], search='tasks')
-            deleted_list.append(self._client.delete_from_local_state(id=current_id, search='projects'))
+    def _delete_locally(self, ids: list):
+        """
+        Deletes the projects and their tasks from `state` and returns the deleted projects.
+        """
+        # One pass over each list, however many tasks the projects hold
+        self._client.delete_all_from_local_state('tasks', 'projectId', ids)
+        deleted = {project['id']: project for project in
+                   self._client.delete_all_from_local_state('projects', 'id', ids)}
+        deleted_list = [deleted.get(current_id, {}) for current_id in ids]
+
+        if len(deleted_list) == 1:
+            return deleted_list[0]
+        else:
+            return deleted_list
+
+    def _delete_folders_locally(self, ids: list):
+        """
+        Deletes the folders from `state` and returns them -> a delta sync only reports folders that still exist.
+        """
+        deleted = {folder['id']: folder for folder in
+                   self._client.delete_all_from_local_state('project_folders', 'id', ids)}
+        deleted_list = [deleted.get(current_id, {}) for current_id in ids]
 
         if len(deleted_list) == 1:
             return deleted_list[0]
@@ -566,6 +598,12 @@ class ProjectManager:
 
                     [![archived-multiple-after.png](https://i.postimg.cc/tg1SMhRJ/archived-multiple-after.png)](https://postimg.cc/rdkNdRr2)
         """
+        return self.update(self._archive_objects(ids))
+
+    def _archive_objects(self, ids) -> list:
+        """
+        Returns the project objects for the ids, marked as archived.
+        """
         if not isinstance(ids, str) and not isinstance(ids, list):
             raise TypeError('Ids Must Be A String or List Of Strings')
 
@@ -585,7 +623,7 @@ class ProjectManager:
                 proj['closed'] = True
                 objs.append(proj)
 
-        return self.update(objs)
+        return objs
 
     def create_folder(self, name):
         """
@@ -656,6 +694,22 @@ class ProjectManager:
 
                     [![folders-multiple.png](https://i.postimg.cc/2jwXKjds/folders-multiple.png)](https://postimg.cc/0rzf6sBn)
         """
+        objs = self._folder_objects(name)
+
+        url = self._client.BASE_URL + 'batch/projectGroup'
+        payload = {
+            'add': objs
+        }
+        response = self._client.http_post(url, json=payload, cookies=self._client.cookies, headers=self.headers)
+        self._client.sync()
+        return self._objects_from_response(response, objs, 'project_folders')
+
+    @staticmethod
+    def _folder_objects(name) -> list:
+        """
+        Returns the list of project folder objects that [`create_folder`][managers.projects.ProjectManager.create_folder]
+        should add.
+        """
         if not isinstance(name, str) and not isinstance(name, list):
             raise TypeError('Name Must Be A String or List Of Strings')
 
@@ -674,27 +728,7 @@ class ProjectManager:
                     'listType': 'group'
                 })
 
-        url = self._client.BASE_URL + 'batch/projectGroup'
-        payload = {
-            'add': objs
-        }
-        response = self._client.http_post(url, json=payload, cookies=self._client.cookies, headers=self.headers)
-        self._client.sync()
-        if len(objs) == 1:
-            return self._client.get_by_id(self._client.parse_id(response), search='project_folders')
-        else:
-            etag = response['id2etag']
-            etag2 = list(etag.keys())  # Get the ids
-            items = [''] * len(objs)  # Create enough spots for the objects
-            for proj_id in etag2:
-                found = self._client.get_by_id(proj_id, search='project_folders')
-                for original in objs:
-                    if found['name'] == original['name']:
-                        # Get the index of original
-                        index = objs.index(original)
-                        # Place found at the index in return list
-                        items[index] = found
-            return items
+        return objs
 
     def update_folder(self, obj):
         """
@@ -781,14 +815,7 @@ class ProjectManager:
 
                     ![image](https://user-images.githubusercontent.com/56806733/104409181-8bece180-551a-11eb-8424-9f147d85eb80.png)
         """
-        # Check the types
-        if not isinstance(obj, dict) and not isinstance(obj, list):
-            raise TypeError("Project objects must be a dict or list of dicts.")
-
-        if isinstance(obj, dict):
-            tasks = [obj]
-        else:
-            tasks = obj
+        tasks = self._update_objects(obj)
 
         url = self._client.BASE_URL + 'batch/projectGroup'
         payload = {
@@ -796,21 +823,7 @@ class ProjectManager:
         }
         response = self._client.http_post(url, json=payload, cookies=self._client.cookies, headers=self.headers)
         self._client.sync()
-        if len(tasks) == 1:
-            return self._client.get_by_id(self._client.parse_id(response), search='project_folders')
-        else:
-            etag = response['id2etag']
-            etag2 = list(etag.keys())  # Get the ids
-            items = [''] * len(tasks)  # Create enough spots for the objects
-            for proj_id in etag2:
-                found = self._client.get_by_id(proj_id, search='project_folders')
-                for original in tasks:
-                    if found['name'] == original['name']:
-                        # Get the index of original
-                        index = tasks.index(original)
-                        # Place found at the index in return list
-                        items[index] = found
-            return items
+        return self._objects_from_response(response, tasks, 'project_folders')
 
     def delete_folder(self, ids):
         """
@@ -902,32 +915,14 @@ class ProjectManager:
 
                     ![image](https://user-images.githubusercontent.com/56806733/104407546-a8871a80-5516-11eb-815b-4df41e3d797a.png)
         """
-        if not isinstance(ids, str) and not isinstance(ids, list):
-            raise TypeError('Ids Must Be A String or List Of Strings')
-
-        if isinstance(ids, str):
-            proj = self._client.get_by_fields(id=ids, search='project_folders')
-            if not proj:
-                raise ValueError(f"Project Folder '{ids}' Does Not Exist To Delete")
-            ids = [ids]
-        else:
-            for i in ids:
-                proj = self._client.get_by_fields(id=i, search='project_folders')
-                if not proj:
-                    raise ValueError(f"Project Folder '{i}' Does Not Exist To Delete")
+        ids = self._existing_ids(ids, 'project_folders', 'Project Folder')
 
         url = self._client.BASE_URL + 'batch/projectGroup'
         payload = {
             'delete': ids
         }
         self._client.http_post(url, json=payload, cookies=self._client.cookies, headers=self.headers)
-        # Delete the list
-        deleted_list = []
-        for current_id in ids:
-            deleted_list.append(self._client.get_by_id(current_id, search='project_folders'))
+        deleted = self._delete_folders_locally(ids)
+        # Picks up the projects that were ungrouped
         self._client.sync()
-
-        if len(deleted_list) == 1:
-            return deleted_list[0]
-        else:
-            return deleted_list
+        return deleted
@@ -1,3 +1,7 @@
+from collections.abc import Mapping
+
+from ticktick.helpers.concurrency import ordered_map
+
 from ticktick.helpers.hex_color import check_hex_color, generate_hex_color
 from ticktick.managers.check_logged_in import logged_in
 
@@ -280,19 +284,8 @@ class TagsManager:
 
                 ![image](https://user-images.githubusercontent.com/56806733/104660625-cb7f0f00-567b-11eb-8649-68646870ccfa.png)
         """
-        batch = False  # Bool signifying batch create or not
-        if isinstance(label, list):
-            # Batch tag creation triggered
-            obj = label  # Assuming all correct objects
-            batch = True
-        else:
-            if not isinstance(label, str):
-                raise TypeError('Required Positional Argument Must Be A String or List of Tag Objects')
-            # Create a single object
-            obj = self.builder(label=label, color=color, parent=parent, sort=sort)
-
-        if not batch:
-            obj = [obj]
+        batch = isinstance(label, list)  # Bool signifying batch create or not
+        obj = self._create_objects(label, color, parent, sort)
 
         url = self._client.BASE_URL + 'batch/tag'
         payload = {'add': obj}
@@ -302,24 +295,47 @@ class TagsManager:
         if not batch:
             return self._client.get_by_etag(self._client.parse_etag(response), search='tags')
         else:
-            etag = response['id2etag']
-            etag2 = list(etag.keys())  # Tag names are out of order
-            labels = [x['name'] for x in obj]  # Tag names are in order
-            items = [''] * len(obj)  # Create enough spots for the objects
-            for tag in etag2:
-                index = labels.index(tag)  # Object of the index is here
-                actual_etag = etag[tag]  # Get the actual etag
-                found = self._client.get_by_etag(actual_etag, search='tags')
-                items[index] = found  # Place at the correct index
+            items = self._tags_from_response(response, obj)
             if len(items) == 1:
                 return items[0]
             else:
                 return items
 
+    def _create_objects(self, label, color: str, parent: str, sort: int) -> list:
+        """
+        Returns the list of tag objects that [`create`][managers.tags.TagsManager.create] should add.
+        """
+        if isinstance(label, list):
+            # Batch tag creation triggered
+            return label  # Assuming all correct objects
+
+        if not isinstance(label, str):
+            raise TypeError('Required Positional Argument Must Be A String or List of Tag Objects')
+        # Create a single object
+        return [self.builder(label=label, color=color, parent=parent, sort=sort)]
+
+    def _tags_from_response(self, response: dict, objs: list) -> list:
+        """
+        Returns the tag objects in `state` that were created or updated from `objs`, in the same order.
+        """
+        etag = response['id2etag']
+        etag2 = list(etag.keys())  # Tag names are out of order
+        labels = [x['name'] for x in objs]  # Tag names are in order
+        items = [''] * len(objs)  # Create enough spots for the objects
+        for tag in etag2:
+            index = labels.index(tag)  # Object of the index is here
+            actual_etag = etag[tag]  # Get the actual etag
+            found = self._client.get_by_etag(actual_etag, search='tags')
+            items[index] = found  # Place at the correct index
+        return items
+
     def rename(self, old: str, new: str) -> dict:
         """
         Renames a tag.
 
+        The tag, the tags nested under it and the tags of the tasks in [`state`](api.md#state) are renamed locally
+        without a sync. TickTick doesn't return the new etag of the tag, so it is updated on the next sync.
+
         Arguments:
             old: Current label of the tag to be changed.
             new: Desired new label of the tag.
@@ -359,6 +375,16 @@ class TagsManager:
 
                 ![image](https://user-images.githubusercontent.com/56806733/104661299-19e0dd80-567d-11eb-825f-758d83178295.png)
         """
+        payload = self._rename_payload(old, new)
+
+        url = self._client.BASE_URL + 'tag/rename'
+        self._client.http_put(url, json=payload, cookies=self._client.cookies, headers=self.headers)
+        return self._rename_locally(payload['name'], new)
+
+    def _rename_payload(self, old: str, new: str) -> dict:
+        """
+        Checks the arguments of [`rename`][managers.tags.TagsManager.rename] and returns the `tag/rename` payload.
+        """
         # Check that both old and new are strings
         if not isinstance(old, str) or not isinstance(new, str):
             raise TypeError('Old and New Must Be Strings')
@@ -377,17 +403,64 @@ class TagsManager:
         if found:
             raise ValueError(f"Name '{new}' Already Exists -> Cannot Duplicate Name")
 
-        url = self._client.BASE_URL + 'tag/rename'
-        payload = {
+        return {
             'name': obj['name'],
             'newName': new
         }
-        response = self._client.http_put(url, json=payload, cookies=self._client.cookies, headers=self.headers)
-        self._client.sync()
-        # Response from TickTick does not return the new etag of the object, we must find it ourselves
-        new_obj = self._client.get_by_fields(name=temp_new, search='tags')
-        # Return the etag of the updated object
-        return self._client.get_by_etag(new_obj['etag'], search='tags')
+
+    def _rename_locally(self, old_name: str, new: str) -> dict:
+        """
+        Applies a rename to `state` -> the tag itself, the tags nested under it, and the tags of the tasks. TickTick
+        doesn't return the new etags, they are picked up on the next sync.
+
+        Returns:
+            The renamed tag object.
+        """
+        new_name = new.lower()
+        obj = self._client.get_by_fields(name=old_name, search='tags')
+        self._client.patch_local_state('tags', obj, {'name': new_name, 'label': new})
+
+        for child in [tag for tag in self._client.state['tags'] if tag.get('parent') == old_name]:
+            self._client.patch_local_state('tags', child, {'parent': new_name})
+
+        # Tasks are filed under each of their tags, so this only visits the tasks that have the tag
+        tasks = self._client._index.candidates('tasks', {'tags': [old_name]})
+        if tasks is None:
+            tasks = self._client.state['tasks']
+        for task in list(tasks):
+            tags = task.get('tags')
+            if isinstance(tags, list) and old_name in tags:
+                self._client.patch_local_state('tasks', task, {
+                    'tags': [new_name if tag == old_name else tag for tag in tags]
+                })
+        return obj
+
+    def _patch_locally(self, response, objs: list) -> list:
+        """
+        Sets the etags TickTick returned on the changed tag objects in `state` and returns the objects in the same
+        order. Syncs instead if the response doesn't confirm every change.
+        """
+        if not self._confirms(response, objs):
+            self._client.sync()
+            return [self._client.get_by_fields(name=obj['name'], search='tags') for obj in objs]
+        return self._set_etags(response, objs)
+
+    @staticmethod
+    def _confirms(response, objs: list) -> bool:
+        """
+        Returns whether a `batch/tag` response has a new etag for every one of `objs` and no errors.
+        """
+        if not isinstance(response, Mapping) or response.get('id2error'):
+            return False
+        id2etag = response.get('id2etag') or {}
+        return all(obj['name'] in id2etag for obj in objs)
+
+    def _set_etags(self, response: dict, objs: list) -> list:
+        """
+        Sets the etags of a confirmed `batch/tag` response on the tag objects in `state`.
+        """
+        return [self._client.patch_local_state('tags', obj, {'etag': response['id2etag'][obj['name']]})
+                for obj in objs]
 
     def color(self, label: str, color: str) -> dict:
         """
@@ -428,6 +501,20 @@ class TagsManager:
 
                 ![image](https://user-images.githubusercontent.com/56806733/104661860-55c87280-567e-11eb-93b5-054fa4f1104a.png)
         """
+        obj = self._color_object(label, color)
+
+        url = self._client.BASE_URL + 'batch/tag'
+        payload = {
+            'update': [obj]
+        }
+        response = self._client.http_post(url, json=payload, cookies=self._client.cookies, headers=self.headers)
+        return self._patch_locally(response, [obj])[0]
+
+    def _color_object(self, label: str, color: str) -> dict:
+        """
+        Checks the arguments of [`color`][managers.tags.TagsManager.color] and returns the tag object with the new
+        color set.
+        """
         if not isinstance(label, str) or not isinstance(color, str):
             raise TypeError('Label and Color Must Be Strings')
 
@@ -442,14 +529,7 @@ class TagsManager:
             raise ValueError(f"Hex Color String '{color}' Is Not Valid")
 
         obj['color'] = color  # Set the color
-
-        url = self._client.BASE_URL + 'batch/tag'
-        payload = {
-            'update': [obj]
-        }
-        response = self._client.http_post(url, json=payload, cookies=self._client.cookies, headers=self.headers)
-        self._client.sync()
-        return self._client.get_by_etag(response['id2etag'][obj['name']])
+        return obj
 
     def sorting(self, label: str, sort: int) -> dict:
         """
@@ -489,6 +569,20 @@ class TagsManager:
 
                 ![image](https://user-images.githubusercontent.com/56806733/104663663-5531db00-5682-11eb-9440-5673a70840b4.png)
         """
+        obj = self._sorting_object(label, sort)
+
+        url = self._client.BASE_URL + 'batch/tag'
+        payload = {
+            'update': [obj]
+        }
+        response = self._client.http_post(url, json=payload, cookies=self._client.cookies, headers=self.headers)
+        return self._patch_locally(response, [obj])[0]
+
+    def _sorting_object(self, label: str, sort: int) -> dict:
+        """
+        Checks the arguments of [`sorting`][managers.tags.TagsManager.sorting] and returns the tag object with the
+        new sort type set.
+        """
         if not isinstance(label, str) or not isinstance(sort, int):
             raise TypeError('Label Must Be A String and Sort Must Be An Int')
 
@@ -500,14 +594,7 @@ class TagsManager:
         sort = self._sort_string_value(sort)  # Get the sort string for the value
 
         obj['sortType'] = sort  # set the object field
-
-        url = self._client.BASE_URL + 'batch/tag'
-        payload = {
-            'update': [obj]
-        }
-        response = self._client.http_post(url, json=payload, cookies=self._client.cookies, headers=self.headers)
-        self._client.sync()
-        return self._client.get_by_etag(response['id2etag'][obj['name']])
+        return obj
 
     def nesting(self, child: str, parent: str) -> dict:
         """
@@ -617,6 +704,22 @@ class TagsManager:
 
                     ![image](https://user-images.githubusercontent.com/56806733/104666080-dcce1880-5687-11eb-9ca8-5abcdb4109ba.png)
         """
+        obj, pobj = self._nesting_objects(child, parent)
+        if pobj is None:
+            return obj  # Nothing to change
+
+        url = self._client.BASE_URL + 'batch/tag'
+        payload = {
+            'update': [pobj, obj]
+        }
+        response = self._client.http_post(url, json=payload, cookies=self._client.cookies, headers=self.headers)
+        return self._patch_locally(response, [pobj, obj])[1]
+
+    def _nesting_objects(self, child: str, parent: str):
+        """
+        Checks the arguments of [`nesting`][managers.tags.TagsManager.nesting] and returns the child tag object with
+        the new parent set, along with the parent tag object. The parent object is None if nothing has to change.
+        """
         if not isinstance(child, str):
             raise TypeError('Inputs Must Be Strings')
 
@@ -643,7 +746,7 @@ class TagsManager:
                 if parent is not None:  # Case 3
                     # check if the parent is already the same, if it is just return
                     if obj['parent'] == parent.lower():
-                        return obj
+                        return obj, None
                     else:
                         new_p = parent.lower()
                         obj['parent'] = new_p
@@ -659,20 +762,14 @@ class TagsManager:
                 new_p = parent.lower()  # -> Case 1
                 obj['parent'] = new_p
             else:  # Doesn't want a parent -> Case 2
-                return obj  # We don't have to do anything if no parent and doesn't want a parent
+                return obj, None  # We don't have to do anything if no parent and doesn't want a parent
 
         # Have to find the project
         pobj = self._client.get_by_fields(name=new_p, search='tags')
         if not pobj:
             raise ValueError(f"Tag '{parent}' Does Not Exist To Set As Parent")
 
-        url = self._client.BASE_URL + 'batch/tag'
-        payload = {
-            'update': [pobj, obj]
-        }
-        response = self._client.http_post(url, json=payload, cookies=self._client.cookies, headers=self.headers)
-        self._client.sync()
-        return self._client.get_by_etag(response['id2etag'][obj['name']], search='tags')
+        return obj, pobj
 
     def update(self, obj):
         """
@@ -778,17 +875,8 @@ class TagsManager:
                     ![image](https://user-images.githubusercontent.com/56806733/104670531-dc864b00-5690-11eb-844a-899031335922.png)
 
         """
-        batch = False  # Bool signifying batch create or not
-        if isinstance(obj, list):
-            # Batch tag creation triggered
-            obj_list = obj  # Assuming all correct objects
-            batch = True
-        else:
-            if not isinstance(obj, dict):
-                raise TypeError('Required Positional Argument Must Be A Dict or List of Tag Objects')
-
-        if not batch:
-            obj_list = [obj]
+        batch = isinstance(obj, list)  # Bool signifying batch update or not
+        obj_list = self._update_objects(obj)
 
         url = self._client.BASE_URL + 'batch/tag'
         payload = {'update': obj_list}
@@ -798,29 +886,37 @@ class TagsManager:
         if not batch:
             return self._client.get_by_etag(self._client.parse_etag(response), search='tags')
         else:
-            etag = response['id2etag']
-            etag2 = list(etag.keys())  # Tag names are out of order
-            labels = [x['name'] for x in obj_list]  # Tag names are in order
-            items = [''] * len(obj_list)  # Create enough spots for the objects
-            for tag in etag2:
-                index = labels.index(tag)  # Object of the index is here
-                actual_etag = etag[tag]  # Get the actual etag
-                found = self._client.get_by_etag(actual_etag, search='tags')
-                items[index] = found  # Place at the correct index
-            return items
+            return self._tags_from_response(response, obj_list)
 
-    def merge(self, label, merged: str):
+    @staticmethod
+    def _update_objects(obj) -> list:
+        """
+        Checks the type of the tag object(s) to update and returns them in a list.
+        """
+        if isinstance(obj, list):
+            # Batch tag update triggered
+            return obj  # Assuming all correct objects
+
+        if not isinstance(obj, Mapping):
+            raise TypeError('Required Positional Argument Must Be A Dict or List of Tag Objects')
+        return [obj]
+
+    def merge(self, label, merged: str, workers: int = 1):
         """
 
         Merges the tasks of the passed tags into the argument `merged` and deletes all the tags except `merged`
         Args can be individual label strings, or a list of strings
 
+        TickTick merges one tag per request. Up to `workers` of them are sent at the same time, and the local state
+        is synced once at the end.
+
         Arguments:
             label (str or list):
                 **Single Tag (str)**: The label string of the tag to merge.
 
                 **Multiple Tags (list)**: The label strings of the tags to merge in a list.
             merged: The label of the tag that will remain after the merge.
+            workers: How many merge requests to send at the same time.
 
         Returns:
             dict: The tag dictionary object that remains after the merge.
@@ -828,7 +924,7 @@ class TagsManager:
         Raises:
             TypeError: If `merged` is not a str or if `label` is not a str or list.
             ValueError: If any of the labels do not exist.
-            RuntimeError: If the merge could not be successfully completed.
+            RuntimeError: If the merge could not be successfully completed. The other tags are still merged.
 
         !!! example "Merging Tags"
             === "Merging Two Tags"
@@ -906,6 +1002,69 @@ class TagsManager:
 
                     ![image](https://user-images.githubusercontent.com/56806733/104681239-b7043c00-56a6-11eb-9b45-5522b9c69cb0.png)
         """
+        kept_obj, merge_queue = self._merge_queue(label, merged)
+        self._raise_failed(self._send_merges(kept_obj, merge_queue, workers))
+        return kept_obj
+
+    def bulk_merge(self, label, merged: str, workers: int = 1) -> list:
+        """
+        Same as [`merge`][managers.tags.TagsManager.merge], but doesn't raise when single tags could not be merged
+        and returns a result for every tag instead.
+
+        Arguments:
+            label (str or list): The label string or a list of label strings of the tags to merge.
+            merged: The label of the tag that will remain after the merge.
+            workers: How many merge requests to send at the same time.
+
+        Returns:
+            A list with one dictionary per label, in order, holding `tag` -> the tag object that was merged, and
+            `error` -> the `RuntimeError` raised for its request, else None.
+
+        Raises:
+            TypeError: If `merged` is not a str or if `label` is not a str or list.
+            ValueError: If any of the labels do not exist, or workers is not positive.
+
+        !!! example
+            ```python
+            results = client.tag.bulk_merge(['School', 'Hobbies', 'Errands'], 'Work', workers=8)
+            failed = [result['tag']['label'] for result in results if result['error']]
+            ```
+        """
+        kept_obj, merge_queue = self._merge_queue(label, merged)
+        return self._send_merges(kept_obj, merge_queue, workers)
+
+    def _send_merges(self, kept_obj: dict, merge_queue: list, workers: int) -> list:
+        """
+        Sends the merge requests for the tags in `merge_queue`, removes the merged tags from `state` and syncs once
+        they are done.
+        """
+        self._check_workers(workers)
+        url = self._client.BASE_URL + 'tag/merge'
+
+        def send(tag_obj):
+            payload = {
+                'name': tag_obj['name'],
+                'newName': kept_obj['name']
+            }
+            try:
+                self._client.http_put(url, json=payload, cookies=self._client.cookies, headers=self.headers)
+            except RuntimeError as error:
+                return self._tag_result(tag_obj, error)
+            return self._tag_result(tag_obj)
+
+        results = []
+        try:
+            results.extend(ordered_map(send, merge_queue, workers))
+        finally:
+            self._evict_merged(kept_obj, results)
+            self._client.sync()
+        return results
+
+    def _merge_queue(self, label, merged: str):
+        """
+        Checks the arguments of [`merge`][managers.tags.TagsManager.merge] and returns the kept tag object along
+        with the list of tag objects to merge into it.
+        """
         # Make sure merged is a string
         if not isinstance(merged, str):
             raise ValueError('Merged Must Be A String')
@@ -942,32 +1101,23 @@ class TagsManager:
                     raise ValueError(f"Tag '{item}' Does Not Exist To Merge")
                 merge_queue.append(found)
 
-        for labels in merge_queue:
-            # Merge
-            url = self._client.BASE_URL + 'tag/merge'
-            payload = {
-                'name': labels['name'],
-                'newName': kept_obj['name']
-            }
-            self._client.http_put(url, json=payload, cookies=self._client.cookies, headers=self.headers)
-        self._client.sync()
-
-        return kept_obj
+        return kept_obj, merge_queue
 
-    def delete(self, label):
+    def delete(self, label, workers: int = 1):
         """
         Delete tag(s). Supports single tag deletion and "mock" batch tag deletion.
 
         !!! info
             Batch deleting for tags is not supported by TickTick. However, passing in
             a list of labels to delete will "mock" batch deleting - but individual requests
-            will have to be made for each deletion.
+            will have to be made for each deletion. Up to `workers` of them are sent at the same time.
 
         Arguments:
             label (str or list):
                 **Single Tag (str)**: The label of the tag.
 
                 **Multiple Tags (list)**: A list of tag label strings.
+            workers: How many delete requests to send at the same time.
 
         Returns:
             dict or list:
@@ -978,7 +1128,7 @@ class TagsManager:
         Raises:
             TypeError: If `label` is not a string or list.
             ValueError: If a label does not exist.
-            RuntimeError: If the tag could not be deleted successfully.
+            RuntimeError: If the tag could not be deleted successfully. The other tags are still deleted.
 
         !!! example "Tag Deletion"
             === "Single Tag Deletion"
@@ -1042,31 +1192,117 @@ class TagsManager:
                     ![image](https://user-images.githubusercontent.com/56806733/104668185-7b5c7880-568c-11eb-8da0-aaee68d53500.png)
 
         """
-        # Determine if the tag exists
-        if not isinstance(label, str) and not isinstance(label, list):
-            raise TypeError('Label Must Be A String or List Of Strings')
+        results = self.bulk_delete(label, workers)
+        self._raise_failed(results)
+        objects = [result['tag'] for result in results]
+        if len(objects) == 1:
+            return objects[0]
+        else:
+            return objects
+
+    def bulk_delete(self, label, workers: int = 1) -> list:
+        """
+        Same as [`delete`][managers.tags.TagsManager.delete], but doesn't raise when single tags could not be deleted
+        and returns a result for every tag instead.
 
+        Arguments:
+            label (str or list): The label string or a list of label strings of the tags to delete.
+            workers: How many delete requests to send at the same time.
+
+        Returns:
+            A list with one dictionary per label, in order, holding `tag` -> the tag object, and `error` -> the
+            `RuntimeError` raised for its request, else None. Only the tags without an error are removed from
+            [`state`](api.md#state).
+
+        Raises:
+            TypeError: If `label` is not a string or list.
+            ValueError: If a label does not exist, or workers is not positive.
+
+        !!! example
+            ```python
+            results = client.tag.bulk_delete(old_labels, workers=8)
+            failed = [result['tag']['label'] for result in results if result['error']]
+            ```
+        """
+        tag_objs = self._delete_queue(label)
+        self._check_workers(workers)
         url = self._client.BASE_URL + 'tag'
-        if isinstance(label, str):
-            label = [label]  # If a singular string we are going to add it to a list
 
-        objects = []
-        for lbl in label:
-            if not isinstance(lbl, str):
-                raise TypeError(f"'{lbl}' Must Be A String")
-            lbl = lbl.lower()
-            tag_obj = self._client.get_by_fields(name=lbl, search='tags')  # Get the tag object
-            if not tag_obj:
-                raise ValueError(f"Tag '{lbl}' Does Not Exist To Delete")
+        def send(tag_obj):
             # We can assume that only one tag has the name
             params = {
                 'name': tag_obj['name']
             }
-            response = self._client.http_delete(url, params=params, cookies=self._client.cookies, headers=self.headers)
-            # Find the tag in the tags list and delete it, then return the deleted object
-            objects.append(self._client.delete_from_local_state(search='tags', etag=tag_obj['etag']))
-        self._client.sync()
-        if len(objects) == 1:
-            return objects[0]
-        else:
-            return objects
+            try:
+                self._client.http_delete(url, params=params, cookies=self._client.cookies, headers=self.headers)
+            except RuntimeError as error:
+                return self._tag_result(tag_obj, error)
+            return self._tag_result(tag_obj)
+
+        results = []
+        try:
+            results.extend(ordered_map(send, tag_objs, workers))
+        finally:
+            self._evict_deleted(results)
+            self._client.sync()
+        return results
+
+    def _delete_queue(self, label) -> list:
+        """
+        Checks the labels passed to [`delete`][managers.tags.TagsManager.delete] and returns their tag objects.
+        """
+        if not isinstance(label, str) and not isinstance(label, list):
+            raise TypeError('Label Must Be A String or List Of Strings')
+
+        if isinstance(label, str):
+            label = [label]  # If a singular string we are going to add it to a list
+
+        return [self._tag_to_delete(lbl) for lbl in label]
+
+    def _evict_deleted(self, results: list) -> None:
+        """
+        Removes the tags that were deleted remotely from `state` in one pass.
+        """
+        deleted = [result['tag']['name'] for result in results if result['error'] is None]
+        self._client.delete_all_from_local_state('tags', 'name', deleted)
+
+    def _evict_merged(self, kept_obj: dict, results: list) -> None:
+        """
+        Removes the tags that were merged into `kept_obj` remotely from `state` -> TickTick deletes them, and a delta
+        sync only reports tags that still exist.
+        """
+        self._evict_deleted([result for result in results if result['tag']['name'] != kept_obj['name']])
+
+    @staticmethod
+    def _check_workers(workers: int) -> None:
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError('Workers Must Be A Positive Integer')
+
+    @staticmethod
+    def _tag_result(tag_obj: dict, error=None) -> dict:
+        """
+        Returns the per tag result of [`bulk_merge`][managers.tags.TagsManager.bulk_merge] and
+        [`bulk_delete`][managers.tags.TagsManager.bulk_delete].
+        """
+        return {'tag': tag_obj, 'error': error}
+
+    @staticmethod
+    def _raise_failed(results: list) -> None:
+        """
+        Raises the error of the first tag that failed, if any.
+        """
+        for result in results:
+            if result['error'] is not None:
+                raise result['error']
+
+    def _tag_to_delete(self, label: str) -> dict:
+        """
+        Returns the tag object with the label, checking that it exists.
+        """
+        if not isinstance(label, str):
+            raise TypeError(f"'{label}' Must Be A String")
+        label = label.lower()
+        tag_obj = self._client.get_by_fields(name=label, search='tags')  # Get the tag object
+        if not tag_obj:
+            raise ValueError(f"Tag '{label}' Does Not Exist To Delete")
+        return tag_obj
@@ -1,10 +1,23 @@
 import datetime
+import logging
+import secrets
+import time
 import pytz
+from collections.abc import Mapping
 
-from ticktick.helpers.time_methods import convert_local_time_to_utc, convert_date_to_tick_tick_format
+from ticktick.helpers.time_methods import convert_local_time_to_utc, convert_date_to_tick_tick_format, \
+    convert_dates_to_tick_tick_format, parse_tick_tick_date
 from ticktick.helpers.constants import DATE_FORMAT
+from ticktick.helpers.concurrency import check_paging, ordered_map
 from calendar import monthrange
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+log = logging.getLogger(__name__)
+
 
 class TaskManager:
     """
@@ -13,6 +26,12 @@ class TaskManager:
 
     TASK_CREATE_ENDPOINT = "/open/v1/task"
 
+    # Most completed tasks TickTick returns for one request to project/all/completed
+    COMPLETED_PAGE_SIZE = 100
+
+    # Tasks sent per batch/task request by bulk_create
+    BULK_CHUNK_SIZE = 100
+
     def __init__(self, client_class):
         # ._client is a reference to the original client_class
         self._client = client_class
@@ -163,13 +182,111 @@ class TaskManager:
         # except KeyError:
         #     pass
 
-        # set 'inbox' to be the actual inbox id
+        # return response
+        return self._created_task(response)
+
+    def _created_task(self, response: dict) -> dict:
+        """
+        Sets 'inbox' to be the actual inbox id in the response from a task creation.
+        """
         if response['projectId'] == 'inbox':
             response['projectId'] = self._client.inbox_id
-
-        # return response
         return response
 
+    def bulk_create(self, tasks: list, chunk_size: int = None, workers: int = 1) -> dict:
+        """
+        Creates many tasks with a few `batch/task` requests instead of one request and one sync per task. Use
+        [`builder`][managers.tasks.TaskManager.builder] for easy task dictionary creation.
+
+        The tasks are sent in chunks of `chunk_size`, and [`state`](api.md#state) is synced once at the end. Tasks
+        without an `id` get one generated, and tasks without a `projectId` go to the inbox. The dictionaries passed
+        in are not changed.
+
+        Arguments:
+            tasks: List of task dictionaries to be created.
+            chunk_size: How many tasks to send per request. Defaults to `BULK_CHUNK_SIZE`.
+            workers: How many chunks to send at the same time.
+
+        Returns:
+            A dictionary with `id2etag` -> the etag of every created task by id, and `id2error` -> the error
+            TickTick reported for every task that could not be created, by id.
+
+        Raises:
+            TypeError: If tasks is not a list of dictionaries.
+            ValueError: If chunk_size or workers are not positive.
+            RuntimeError: If a request is unsuccessful. Tasks in chunks that were already sent stay created, and
+                [`state`](api.md#state) is still synced to pick them up.
+
+        !!! example
+            ```python
+            tasks = [client.task.builder(ticket['summary'], projectId=project['id']) for ticket in tickets]
+            result = client.task.bulk_create(tasks)
+            failed = result['id2error']
+            ```
+        """
+        chunks = self._bulk_add_chunks(tasks, chunk_size)
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError('Workers Must Be A Positive Integer')
+
+        url = self._client.BASE_URL + 'batch/task'
+
+        def send(chunk):
+            return self._client.http_post(url, json={'add': chunk}, cookies=self._client.cookies,
+                                          headers=self.headers)
+
+        try:
+            responses = list(ordered_map(send, chunks, workers))
+        except Exception:
+            self._sync_after_failure()
+            raise
+        if chunks:
+            self._client.sync()
+        return self._merge_batch_results(responses)
+
+    def _sync_after_failure(self) -> None:
+        """
+        Syncs after a request failed part way through a bulk operation, so [`state`](api.md#state) has what the
+        earlier requests changed. A failing sync is only logged -> the caller raises the original error.
+        """
+        try:
+            self._client.sync()
+        except Exception:
+            log.warning('Sync after a failed bulk request failed too', exc_info=True)
+
+    def _bulk_add_chunks(self, tasks: list, chunk_size: int = None) -> list:
+        """
+        Checks the arguments of [`bulk_create`][managers.tasks.TaskManager.bulk_create] and returns the tasks to
+        add, split into chunks.
+        """
+        if chunk_size is None:
+            chunk_size = self.BULK_CHUNK_SIZE
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError('Chunk Size Must Be A Positive Integer')
+        if not isinstance(tasks, list) or not all(isinstance(task, Mapping) for task in tasks):
+            raise TypeError('Tasks Must Be A List Of Task Dictionaries')
+
+        to_add = []
+        for task in tasks:
+            task = dict(task)
+            if not task.get('id'):
+                task['id'] = generate_object_id()
+            if task.get('projectId') in (None, 'inbox'):
+                task['projectId'] = self._client.inbox_id
+            to_add.append(task)
+        return [to_add[index:index + chunk_size] for index in range(0, len(to_add), chunk_size)]
+
+    @staticmethod
+    def _merge_batch_results(responses: list) -> dict:
+        """
+        Merges the `id2etag` and `id2error` dictionaries of several `batch/task` responses.
+        """
+        merged = {'id2etag': {}, 'id2error': {}}
+        for response in responses:
+            if isinstance(response, Mapping):
+                merged['id2etag'].update(response.get('id2etag') or {})
+                merged['id2error'].update(response.get('id2error') or {})
+        return merged
+
     def _generate_update_url(self, taskID: str):
         """
         Generates the url for updating a task based off the taskID
@@ -323,17 +440,21 @@ class TaskManager:
         """
         return self._client.BASE_URL + 'batch/task'
 
-    def delete(self, task):
+    def delete(self, task, chunk_size: int = None, workers: int = 1):
         """
         Deletes a task. Supports single task deletion, and batch task deletion.
 
-        For a single task pass in the task dictionary. For multiple tasks pass in a list of task dictionaries.
+        For a single task pass in the task dictionary. For multiple tasks pass in a list of task dictionaries. Large
+        lists are sent in chunks, see [`bulk_delete`][managers.tasks.TaskManager.bulk_delete]. The deleted tasks are
+        removed from [`state`](api.md#state) directly, along with their subtasks, instead of syncing.
 
         Arguments:
              task (str or list):
                  **Single Task (dict)**: Task dictionary to be deleted
 
                  **Multiple Tasks (list)**: List of task dictionaries to be deleted
+             chunk_size: How many tasks to delete per request. Defaults to `BULK_CHUNK_SIZE`.
+             workers: How many chunks to send at the same time.
 
         Returns:
              dict or list:
@@ -341,6 +462,9 @@ class TaskManager:
 
                 **Multiple Tasks (list)**: List of task dictionaries that were deleted
 
+        Raises:
+            RuntimeError: If a chunk could not be deleted. The tasks of the other chunks are still deleted.
+
         !!! example "Task Deletion"
 
             === "Single Task Deletion"
@@ -421,13 +545,107 @@ class TaskManager:
 
         """
 
-        # generate url
+        results = self.bulk_delete(task if isinstance(task, list) else [task], chunk_size, workers)
+        self._raise_failed_chunk(results)
+
+        # return input
+        return task
+
+    def bulk_delete(self, tasks: list, chunk_size: int = None, workers: int = 1) -> list:
+        """
+        Deletes the tasks in chunks of `chunk_size`, sending up to `workers` chunks at the same time, and removes the
+        deleted tasks and their subtasks from [`state`](api.md#state). A failed chunk doesn't stop the others.
+
+        Arguments:
+            tasks: List of task dictionaries to be deleted.
+            chunk_size: How many tasks to delete per request. Defaults to `BULK_CHUNK_SIZE`.
+            workers: How many chunks to send at the same time.
+
+        Returns:
+            A list with one dictionary per chunk, in order, holding `ids` -> the ids of the tasks in the chunk,
+            `id2error` -> the errors TickTick reported for single tasks, and `error` -> the `RuntimeError` raised if
+            the whole request failed, else None.
+
+        Raises:
+            TypeError: If tasks is not a list of dictionaries.
+            ValueError: If chunk_size or workers are not positive.
+
+        !!! example
+            ```python
+            results = client.task.bulk_delete(old_tasks, chunk_size=200, workers=4)
+            failed = [result['ids'] for result in results if result['error']]
+            ```
+        """
+        chunks = self._delete_chunks(tasks, chunk_size)
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError('Workers Must Be A Positive Integer')
+
         url = self._generate_delete_url()
 
+        def send(chunk):
+            try:
+                response = self._client.http_post(url, json={'delete': chunk}, cookies=self._client.cookies,
+                                                  headers=self.headers)
+            except RuntimeError as error:
+                return self._delete_result(chunk, error=error)
+            return self._delete_result(chunk, response)
+
+        results = list(ordered_map(send, chunks, workers))
+        self._evict_deleted(results)
+        return results
+
+    def _delete_chunks(self, tasks: list, chunk_size: int = None) -> list:
+        """
+        Checks the arguments of [`bulk_delete`][managers.tasks.TaskManager.bulk_delete] and returns the `batch/task`
+        delete entries split into chunks.
+        """
+        if chunk_size is None:
+            chunk_size = self.BULK_CHUNK_SIZE
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError('Chunk Size Must Be A Positive Integer')
+        if not isinstance(tasks, list) or not all(isinstance(task, Mapping) for task in tasks):
+            raise TypeError('Tasks Must Be A List Of Task Dictionaries')
+
+        to_delete = self._delete_payload(tasks)['delete']
+        return [to_delete[index:index + chunk_size] for index in range(0, len(to_delete), chunk_size)]
+
+    @staticmethod
+    def _delete_result(chunk: list, response=None, error=None) -> dict:
+        """
+        Returns the [`bulk_delete`][managers.tasks.TaskManager.bulk_delete] result for a chunk.
+        """
+        id2error = response.get('id2error') or {} if isinstance(response, Mapping) else {}
+        return {'ids': [entry['taskId'] for entry in chunk], 'id2error': id2error, 'error': error}
+
+    def _evict_deleted(self, results: list) -> None:
+        """
+        Removes the tasks that were deleted remotely from `state`, along with their subtasks at any depth, which
+        TickTick deletes with them.
+        """
+        if self._client.OAuth_Mode:
+            return
+        deleted = [task_id for result in results if result['error'] is None
+                   for task_id in result['ids'] if task_id not in result['id2error']]
+        subtasks = [task['id'] for task_id in deleted for task in self._descendants(task_id)]
+        self._client.delete_all_from_local_state('tasks', 'id', list(dict.fromkeys(deleted + subtasks)))
+
+    @staticmethod
+    def _raise_failed_chunk(results: list) -> None:
+        """
+        Raises the error of the first chunk that failed, if any.
+        """
+        for result in results:
+            if result['error'] is not None:
+                raise result['error']
+
+    def _delete_payload(self, task) -> dict:
+        """
+        Returns the `batch/task` payload that deletes the task dictionary or list of task dictionaries.
+        """
         to_delete = []
 
         # if its just a dict then we are going to have to make a list object for it
-        if isinstance(task, dict):
+        if isinstance(task, Mapping):
             # ticktick returns for the 'projectId': 'inbox' instead of the actual inbox id - which is required for
             # proper deletion
             if task['projectId'] == 'inbox':
@@ -444,15 +662,7 @@ class TaskManager:
                 delete_dict = {'projectId': item['projectId'], 'taskId': item['id']}
                 to_delete.append(delete_dict)
 
-        payload = {'delete': to_delete}
-        # make request
-        self._client.http_post(url, json=payload, cookies=self._client.cookies, headers=self.headers)
-
-        # sync local state
-        self._client.sync()
-
-        # return input
-        return task
+        return {'delete': to_delete}
 
     def make_subtask(self, obj, parent: str):
         """
@@ -562,13 +772,26 @@ class TaskManager:
 
                     ![image](https://user-images.githubusercontent.com/56806733/104559535-64207b00-55f9-11eb-84cf-ca4f989ea075.png)
         """
-        if not isinstance(obj, dict) and not isinstance(obj, list):
+        subtasks, ids = self._subtask_payload(obj, parent)
+
+        url = self._client.BASE_URL + 'batch/taskParent'
+        response = self._client.http_post(url, json=subtasks, cookies=self._client.cookies, headers=self.headers)
+        self._client.sync()
+        # Find and return the updated child objects
+        return self._found_tasks(ids, search='tasks')
+
+    def _subtask_payload(self, obj, parent: str):
+        """
+        Checks the arguments of [`make_subtask`][managers.tasks.TaskManager.make_subtask] and returns the
+        `batch/taskParent` payload along with the ids of the sub-tasks.
+        """
+        if not isinstance(obj, Mapping) and not isinstance(obj, list):
             raise TypeError('obj must be a dictionary or list of dictionaries')
 
         if not isinstance(parent, str):
             raise TypeError('parent must be a string')
 
-        if isinstance(obj, dict):
+        if isinstance(obj, Mapping):
             obj = [obj]
 
         parent_obj = self._client.get_by_id(search='tasks', obj_id=parent)
@@ -590,18 +813,19 @@ class TaskManager:
                 'taskId': i
             }
             subtasks.append(temp)
+        return subtasks, ids
 
-        url = self._client.BASE_URL + 'batch/taskParent'
-        response = self._client.http_post(url, json=subtasks, cookies=self._client.cookies, headers=self.headers)
-        self._client.sync()
-        # Find and return the updated child objects
-        subtasks = []
+    def _found_tasks(self, ids: list, search: str = None):
+        """
+        Returns the task objects in `state` with the ids -> just the dictionary object if it is a single task.
+        """
+        found = []
         for task_id in ids:
-            subtasks.append(self._client.get_by_id(task_id, search='tasks'))
-        if len(subtasks) == 1:
-            return subtasks[0]  # Return just the dictionary object if its a single task
+            found.append(self._client.get_by_id(task_id, search=search))
+        if len(found) == 1:
+            return found[0]  # Return just the dictionary object if its a single task
         else:
-            return subtasks
+            return found
 
     def move(self, obj, new: str):
         """
@@ -705,8 +929,21 @@ class TaskManager:
                     ![image](https://user-images.githubusercontent.com/56806733/104557388-063e6400-55f6-11eb-8ba4-aa64f3f739bd.png)
 
     """
+        move_tasks, ids = self._move_payload(obj, new)
+
+        url = self._client.BASE_URL + 'batch/taskProject'
+        self._client.http_post(url, json=move_tasks, cookies=self._client.cookies, headers=self.headers)
+        self._client.sync()
+        # Return the tasks in the new list
+        return self._found_tasks(ids)
+
+    def _move_payload(self, obj, new: str):
+        """
+        Checks the arguments of [`move`][managers.tasks.TaskManager.move] and returns the `batch/taskProject`
+        payload along with the ids of the moved tasks.
+        """
         # Type errors
-        if not isinstance(obj, dict) and not isinstance(obj, list):
+        if not isinstance(obj, Mapping) and not isinstance(obj, list):
             raise TypeError('obj should be a dict or list of dicts')
         if not isinstance(new, str):
             raise TypeError('new should be a string')
@@ -717,7 +954,7 @@ class TaskManager:
             if not project:
                 raise ValueError('The ID for the new project does not exist')
 
-        if isinstance(obj, dict):
+        if isinstance(obj, Mapping):
             obj = [obj]
 
         # Go through and check that the projects are all the same
@@ -733,18 +970,8 @@ class TaskManager:
                     'toProjectId': new
                 })
 
-        url = self._client.BASE_URL + 'batch/taskProject'
-        self._client.http_post(url, json=move_tasks, cookies=self._client.cookies, headers=self.headers)
-        self._client.sync()
-        # Return the tasks in the new list
         ids = [x['id'] for x in obj]
-        return_list = []
-        for i in ids:
-            return_list.append(self._client.get_by_id(i))
-        if len(return_list) == 1:
-            return return_list[0]
-        else:
-            return return_list
+        return move_tasks, ids
 
     def move_all(self, old: str, new: str) -> list:
         """
@@ -797,6 +1024,23 @@ class TaskManager:
 
                 ![image](https://user-images.githubusercontent.com/56806733/104423710-4a1c6500-5533-11eb-90f3-2c3d024280af.png)
         """
+        task_project = self._move_all_payload(old, new)
+        if not task_project:
+            return task_project  # No tasks to move so just return the empty list
+
+        url = self._client.BASE_URL + 'batch/taskProject'
+        # Make the initial call to move the tasks
+        self._client.http_post(url, json=task_project, cookies=self._client.cookies, headers=self.headers)
+
+        self._client.sync()
+        # Return the tasks in the new list
+        return self._client.task.get_from_project(new)
+
+    def _move_all_payload(self, old: str, new: str) -> list:
+        """
+        Checks that both projects exist and returns the `batch/taskProject` payload that moves every task in `old`
+        to `new`. The payload is empty if `old` has no tasks.
+        """
         # Make sure that old and new id's exist
         if old != self._client.inbox_id:
             old_list = self._client.get_by_fields(id=old, search='projects')
@@ -810,8 +1054,6 @@ class TaskManager:
 
         # Get the tasks from the old list
         tasks = self.get_from_project(old)
-        if not tasks:
-            return tasks  # No tasks to move so just return the empty list
         task_project = []  # List containing all the tasks that will be updated
 
         for task in tasks:
@@ -820,14 +1062,7 @@ class TaskManager:
                 'taskId': task['id'],
                 'toProjectId': new
             })
-
-        url = self._client.BASE_URL + 'batch/taskProject'
-        # Make the initial call to move the tasks
-        self._client.http_post(url, json=task_project, cookies=self._client.cookies, headers=self.headers)
-
-        self._client.sync()
-        # Return the tasks in the new list
-        return self._client.task.get_from_project(new)
+        return task_project
 
     def get_from_project(self, project: str):
         """
@@ -883,30 +1118,198 @@ class TaskManager:
 
         # Get the list of tasks that share the project id
         tasks = self._client.get_by_fields(projectId=project, search='tasks')
-        if isinstance(tasks, dict):
+        if isinstance(tasks, Mapping):
             return [tasks]
         else:
             return tasks
 
-    def get_completed(self, start, end=None, full: bool = True, tz: str = None) -> list:
+    def children(self, task_id: str) -> list:
+        """
+        Returns the subtasks directly nested under the task, in the order of [`state`](api.md#state).
+
+        Children are looked up through an index of `parentId` that is kept current with `state`, so walking a
+        whole task tree takes time proportional to the size of the tree.
+
+        Arguments:
+            task_id: ID string of the parent task.
+
+        Returns:
+            A list of task dictionaries. Empty if the task has no subtasks.
+
+        Raises:
+            TypeError: If `task_id` is not a string.
+            ValueError: If the task does not exist in `state`.
+
+        !!! example
+            ```python
+            trip = client.get_by_fields(title='Plan Trip', search='tasks')
+            steps = client.task.children(trip['id'])
+            ```
+        """
+        self._check_task_exists(task_id)
+        return self._children(task_id)
+
+    def descendants(self, task_id: str) -> list:
+        """
+        Returns every task nested under the task at any depth, in outline order -> each task comes right before its
+        own subtasks.
+
+        Arguments:
+            task_id: ID string of the root task.
+
+        Returns:
+            A list of task dictionaries, not including the root task.
+
+        Raises:
+            TypeError: If `task_id` is not a string.
+            ValueError: If the task does not exist in `state`.
+
+        !!! example "Printing An Outline"
+            ```python
+            depth = {trip['id']: 0}
+            for task in client.task.descendants(trip['id']):
+                depth[task['id']] = depth[task['parentId']] + 1
+                print('  ' * depth[task['id']] + task['title'])
+            ```
+        """
+        self._check_task_exists(task_id)
+        return self._descendants(task_id)
+
+    def _descendants(self, task_id: str) -> list:
+        """
+        [`descendants`][managers.tasks.TaskManager.descendants] without checking that the task exists.
+        """
+        found = []
+        seen = {task_id}  # Guards against parentId cycles
+        # Children are pushed in reverse so the first child is visited first
+        stack = self._children(task_id)[::-1]
+        while stack:
+            task = stack.pop()
+            if task['id'] in seen:
+                continue
+            seen.add(task['id'])
+            found.append(task)
+            stack.extend(self._children(task['id'])[::-1])
+        return found
+
+    def ancestors(self, task_id: str) -> list:
+        """
+        Returns the parent of the task, the parent of that task and so on up to the top level task.
+
+        Arguments:
+            task_id: ID string of the task.
+
+        Returns:
+            A list of task dictionaries, nearest first. Empty for a top level task. A parent that is not in `state`
+            ends the list.
+
+        Raises:
+            TypeError: If `task_id` is not a string.
+            ValueError: If the task does not exist in `state`.
+        """
+        task = self._check_task_exists(task_id)
+        found = []
+        seen = {task_id}
+        parent_id = task.get('parentId')
+        while parent_id and parent_id not in seen:
+            parent = self._client.get_by_id(parent_id, search='tasks')
+            if not parent:
+                break
+            seen.add(parent_id)
+            found.append(parent)
+            parent_id = parent.get('parentId')
+        return found
+
+    def between(self, start: datetime.datetime, end: datetime.datetime, tz: str = None) -> list:
+        """
+        Returns the tasks in [`state`](api.md#state) whose start and due dates overlap the range, for agenda and
+        calendar views.
+
+        A task covers the time from its `startDate` to its `dueDate` (just its `startDate` if it has no due date).
+        All day tasks end before their `dueDate`, which is the start of the day after. Tasks without dates are never
+        returned.
+
+        The tasks are found through an interval index over their dates that is rebuilt on the first query after
+        `state` changes, so repeated queries take O(log n + k).
+
+        Arguments:
+            start: Start of the range in the time zone `tz`.
+            end: End of the range in the time zone `tz`, included.
+            tz: Time zone string of `start` and `end`. Defaults to the account time zone.
+
+        Returns:
+            A list of task dictionaries ordered by start date.
+
+        Raises:
+            TypeError: If `start` or `end` are not datetime objects.
+            ValueError: If `start` is after `end`.
+            KeyError: If the time zone is not valid.
+
+        !!! example "Today's Agenda"
+            ```python
+            today = datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            agenda = client.task.between(today, today.replace(hour=23, minute=59, second=59))
+            ```
+        """
+        if not isinstance(start, datetime.datetime) or not isinstance(end, datetime.datetime):
+            raise TypeError('Start And End Must Be Datetime Objects')
+        if start > end:
+            raise ValueError('Invalid Date Range: Start Date Occurs After End Date')
+        if tz is None:
+            tz = self._client.time_zone
+        if tz not in pytz.all_timezones_set:
+            raise KeyError('Invalid Time Zone')
+
+        return self._client._index.overlapping('tasks', convert_local_time_to_utc(start, tz),
+                                               convert_local_time_to_utc(end, tz))
+
+    def _check_task_exists(self, task_id: str):
+        """
+        Returns the task with the id from `state`, checking that it exists.
+        """
+        if not isinstance(task_id, str):
+            raise TypeError('Task Id Must Be A String')
+        task = self._client.get_by_id(task_id, search='tasks')
+        if not task:
+            raise ValueError(f"Task '{task_id}' Does Not Exist")
+        return task
+
+    def _children(self, task_id: str) -> list:
+        """
+        Returns the tasks in `state` whose `parentId` is `task_id`.
+        """
+        tasks = self._client._index.candidates('tasks', {'parentId': task_id})
+        if tasks is None:
+            tasks = self._client.state['tasks']
+        return [task for task in tasks if task.get('parentId') == task_id]
+
+    def get_completed(self,
+                      start,
+                      end=None,
+                      full: bool = True,
+                      tz: str = None,
+                      window: datetime.timedelta = None,
+                      workers: int = 1) -> list:
         """
         Obtains all completed tasks from the given start date and end date.
 
-        !!! note
-            There is a limit of 100 items for the request
+        TickTick returns at most 100 tasks per request, so the range is paged through until it is exhausted. Use
+        [`iter_completed`][managers.tasks.TaskManager.iter_completed] to handle the tasks as they arrive.
 
         Arguments:
             start (datetime): Start time datetime object.
             end (datetime): End time datetime object.
             full: Boolean specifying whether hours, minutes, and seconds are to be taken into account for the query.
             tz: String specifying a specific time zone, however this will default to your accounts normal time zone.
+            window: Splits the range into windows of this length that are fetched separately.
+            workers: How many windows to fetch at the same time.
 
         Returns:
             A list containing all the completed tasks based on the times.
 
         Raises:
             TypeError: If the proper types are not used.
-            ValueError: If start occurs after end.
+            ValueError: If start occurs after end, or window or workers are not positive.
             KeyError: If the time zone string passed is not a valid time zone string.
             RuntimeError: If getting the tasks is unsuccessful.
 
@@ -986,9 +1389,167 @@ class TaskManager:
                 end = datetime(2020, 12, 15, 17)    # 5PM 12/15/2020
                 tasks = client.task.get_completed(start, end, full=False)
                 ```
+
+            === "Years Of History"
+                Long ranges can be split into windows that are fetched in parallel.
+
+                ```python
+                start = datetime(2018, 1, 1)
+                end = datetime(2021, 12, 31)
+                tasks = client.task.get_completed(start, end, window=timedelta(days=90), workers=4)
+                ```
+        """
+        return list(self.iter_completed(start, end, full, tz, window=window, workers=workers))
+
+    def iter_completed(self,
+                       start,
+                       end=None,
+                       full: bool = True,
+                       tz: str = None,
+                       window: datetime.timedelta = None,
+                       workers: int = 1):
+        """
+        Generator version of [`get_completed`][managers.tasks.TaskManager.get_completed]. Takes the same
+        arguments and yields the completed tasks newest first, requesting the next page only when the current one
+        has been used up.
+
+        With more than one worker, the windows are fetched in parallel and each one is yielded once it and the
+        windows before it are complete.
+
+        Returns:
+            A generator of completed task dictionaries.
+
+        !!! example
+            ```python
+            for task in client.task.iter_completed(datetime(2019, 1, 1), datetime(2021, 1, 1)):
+                report.add(task)
+            ```
+        """
+        check_paging(window, workers)
+        start, end = self.completed_range(start, end, full, tz)
+        return self.iter_completed_utc(start, end, window=window, workers=workers)
+
+    def iter_completed_utc(self,
+                           start: datetime.datetime,
+                           end: datetime.datetime,
+                           window: datetime.timedelta = None,
+                           workers: int = 1):
+        """
+        Yields the completed tasks between the UTC times `start` and `end`, newest first, like
+        [`iter_completed`][managers.tasks.TaskManager.iter_completed] does for its range.
+
+        Meant for code that keeps its own UTC ranges, like the [`CompletedArchive`][archive.CompletedArchive] ->
+        use [`completed_range`][managers.tasks.TaskManager.completed_range] to turn local dates into one.
+
+        Arguments:
+            start: Start of the range in UTC.
+            end: End of the range in UTC.
+            window: Splits the range into windows of this length that are fetched separately.
+            workers: How many windows to fetch at the same time.
+
+        Returns:
+            A generator of completed task dictionaries.
+
+        Raises:
+            ValueError: If window or workers are not positive.
+        """
+        check_paging(window, workers)
+        return self._iter_completed(self._split_range(start, end, window), workers)
+
+    def _iter_completed(self, windows: list, workers: int):
+        """
+        Yields the completed tasks of the `(start, end)` UTC `windows` in order, dropping tasks already yielded.
+
+        With one worker the pages are requested lazily, with more the windows are fetched `workers` at a time by
+        `ordered_map`.
+        """
+        seen = set()
+        if workers == 1:
+            pages = (page for bounds in windows for page in self._completed_pages(*bounds))
+        else:
+            pages = ordered_map(lambda bounds: [task for page in self._completed_pages(*bounds) for task in page],
+                                windows, workers)
+        for page in pages:
+            yield from self._unseen(page, seen)
+
+    def _completed_pages(self, start: datetime.datetime, end: datetime.datetime):
+        """
+        Yields the pages of completed tasks between the UTC times `start` and `end`, newest first.
         """
         url = self._client.BASE_URL + 'project/all/completed'
+        while True:
+            parameters = self._completed_page_parameters(start, end)
+            page = self._client.http_get(url, params=parameters, cookies=self._client.cookies, headers=self.headers)
+            yield page
+            end = self._next_completed_end(page, end)
+            if end is None or end < start:
+                return
+
+    def _completed_page_parameters(self, start: datetime.datetime, end: datetime.datetime) -> dict:
+        return {
+            'from': start.strftime(DATE_FORMAT),
+            'to': end.strftime(DATE_FORMAT),
+            'limit': self.COMPLETED_PAGE_SIZE
+        }
+
+    def _next_completed_end(self, page: list, end: datetime.datetime):
+        """
+        Returns the end of the range for the page after `page`, or None if `page` was the last one.
+
+        The next page ends at the oldest completion time seen, so tasks completed in that same second are asked for
+        again -> they are dropped as duplicates. The API can't page within a second, so when a whole page was
+        completed in one second the rest of that second is skipped and a warning is logged.
+        """
+        if not isinstance(page, list) or len(page) < self.COMPLETED_PAGE_SIZE:
+            return None
+        times = [_completed_time(task) for task in page if task.get('completedTime')]
+        if not times:
+            return None
+        oldest = min(times)
+        if oldest >= end:
+            # A full page from a single second -> move past it instead of asking for it forever
+            log.warning(f"More than {self.COMPLETED_PAGE_SIZE} tasks completed at {end.strftime(DATE_FORMAT)} UTC, "
+                        f"tasks past the first {self.COMPLETED_PAGE_SIZE} of that second are skipped")
+            oldest = end - datetime.timedelta(seconds=1)
+        return oldest
+
+    @staticmethod
+    def _unseen(page: list, seen: set) -> list:
+        """
+        Returns the tasks in `page` whose ids are not in `seen`, adding them to it.
+        """
+        tasks = []
+        for task in page:
+            if task['id'] not in seen:
+                seen.add(task['id'])
+                tasks.append(task)
+        return tasks
+
+    @staticmethod
+    def _split_range(start: datetime.datetime, end: datetime.datetime, window: datetime.timedelta = None) -> list:
+        """
+        Splits the range from `start` to `end` into `(start, end)` windows no longer than `window`, newest first.
+        """
+        if window is None:
+            return [(start, end)]
+
+        windows = []
+        while end >= start:
+            window_start = max(start, end - window)
+            windows.append((window_start, end))
+            end = window_start - datetime.timedelta(seconds=1)
+        return windows
 
+    def completed_range(self, start, end=None, full: bool = True, tz: str = None) -> tuple:
+        """
+        Returns the UTC start and end of the range [`get_completed`][managers.tasks.TaskManager.get_completed]
+        fetches for these arguments.
+
+        Raises:
+            TypeError: If the proper types are not used.
+            ValueError: If start occurs after end.
+            KeyError: If the time zone string passed is not a valid time zone string.
+        """
         if tz is None:
             tz = self._client.time_zone
 
@@ -1019,14 +1580,7 @@ class TaskManager:
         # Convert Local Time to UTC time based off the time_zone string specified
         start = convert_local_time_to_utc(start, tz)
         end = convert_local_time_to_utc(end, tz)
-
-        parameters = {
-            'from': start.strftime(DATE_FORMAT),
-            'to': end.strftime(DATE_FORMAT),
-            'limit': 100
-        }
-        response = self._client.http_get(url, params=parameters, cookies=self._client.cookies, headers=self.headers)
-        return response
+        return start, end
 
     def dates(self, start, due=None, tz=None):
         """
@@ -1070,24 +1624,80 @@ class TaskManager:
         else:
             tz = self._client.time_zone
 
+        start, due, all_day = self._date_range(start, due)
+        dates['startDate'] = convert_date_to_tick_tick_format(start, tz)
+        if due is not None:
+            dates['dueDate'] = convert_date_to_tick_tick_format(due, tz)
+        dates['allDay'] = all_day
+
+        return dates
+
+    def bulk_dates(self, starts: list, dues: list = None, tz: str = None) -> list:
+        """
+        Batch version of [`dates`][managers.tasks.TaskManager.dates] for building many tasks at once. All the dates
+        are converted in a single call to
+        [`convert_dates_to_tick_tick_format`][helpers.time_methods.convert_dates_to_tick_tick_format], as a
+        `datetime64` array when NumPy is installed.
+
+        Arguments:
+            starts: Desired start times.
+            dues: Desired end times, in the same order as `starts`. An item can be None for a task with only a
+                start time.
+            tz: Time zone string if the desired time zone is not the account default.
+
+        Returns:
+            A list with the dictionary [`dates`][managers.tasks.TaskManager.dates] would return for each start time.
+
+        Raises:
+            ValueError: If `dues` doesn't have one item per start time.
+
+        !!! example
+            ```python
+            dates = client.task.bulk_dates([row.start for row in rows], [row.due for row in rows])
+            tasks = [client.task.builder(row.title, **row_dates) for row, row_dates in zip(rows, dates)]
+            ```
+        """
+        if dues is None:
+            dues = [None] * len(starts)
+        if len(dues) != len(starts):
+            raise ValueError('Dues Must Have One Item Per Start Date')
+
+        ranges = [self._date_range(start, due) for start, due in zip(starts, dues)]
+        flat = []
+        for start, due, all_day in ranges:
+            flat.append(start)
+            if due is not None:
+                flat.append(due)
+        if numpy is not None:
+            # Like dates(), attached time zones and microseconds are ignored
+            flat = numpy.array([date.replace(tzinfo=None) for date in flat], dtype='datetime64[s]')
+        converted = iter(convert_dates_to_tick_tick_format(flat, tz if tz is not None else self._client.time_zone))
+
+        results = []
+        for start, due, all_day in ranges:
+            dates = {'timeZone': tz} if tz is not None else {}
+            dates['startDate'] = next(converted)
+            if due is not None:
+                dates['dueDate'] = next(converted)
+            dates['allDay'] = all_day
+            results.append(dates)
+        return results
+
+    @staticmethod
+    def _date_range(start, due=None):
+        """
+        Returns the start and due times [`dates`][managers.tasks.TaskManager.dates] should convert, and whether the
+        task is all day.
+        """
         # Check if just start date
         if due is None:
-            if start.hour != 0 or start.minute != 0 or start.second != 0 or start.microsecond != 0:
-                dates['startDate'] = convert_date_to_tick_tick_format(start, tz)
-                dates['allDay'] = False
-            else:
-                dates['startDate'] = convert_date_to_tick_tick_format(start, tz)
-                dates['allDay'] = True
-            return dates
+            all_day = not (start.hour != 0 or start.minute != 0 or start.second != 0 or start.microsecond != 0)
+            return start, None, all_day
 
         # Check all day for both
         if (start.hour != 0 or start.minute != 0 or start.second != 0 or start.microsecond != 0
                 or due.hour != 0 or due.minute != 0 or due.second != 0 or due.microsecond != 0):
-            # Just convert the dates and return
-            dates['startDate'] = convert_date_to_tick_tick_format(start, tz)
-            dates['dueDate'] = convert_date_to_tick_tick_format(due, tz)
-            dates['allDay'] = False
-            return dates
+            return start, due, False
 
         # All day is true, however normally right now if we were to use a date like Jan 1 - Jan 3,
         # TickTick would create a task that is only Jan 1 - Jan 2 since the date would be up to Jan 3
@@ -1109,12 +1719,7 @@ class TaskManager:
             month = due.month
 
         due = datetime.datetime(year, month, day)  # No hours, mins, or seconds needed
-
-        dates['startDate'] = convert_date_to_tick_tick_format(start, tz)
-        dates['dueDate'] = convert_date_to_tick_tick_format(due, tz)
-        dates['allDay'] = True
-
-        return dates
+        return start, due, True
 
     def builder(self,
                 title: str = '',
@@ -1199,3 +1804,23 @@ class TaskManager:
 
         # merge dicts
         return {**dates, **task}
+
+
+def generate_object_id() -> str:
+    """
+    Returns a new id in the format TickTick uses for its objects -> 24 hex characters, starting with the creation
+    time.
+
+    ??? info "Import Help"
+        ```python
+        from ticktick.managers.tasks import generate_object_id
+        ```
+    """
+    return '%08x' % int(time.time()) + secrets.token_hex(8)
+
+
+def _completed_time(task: dict) -> datetime.datetime:
+    """
+    Returns the `completedTime` of a task as a UTC datetime with no time zone information attached.
+    """
+    return parse_tick_tick_date(task['completedTime'])
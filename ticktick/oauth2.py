@@ -7,32 +7,85 @@ import os
 
 from urllib.parse import urlparse, urlencode, parse_qsl
 from ticktick.cache import CacheHandler
+from ticktick.helpers.compression import ACCEPT_ENCODING
+from ticktick.hooks import RequestHooks
+from ticktick.retry import RetryPolicy
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 log = logging.getLogger(__name__)
 
 
+# Seconds to wait for a connection and for each read of the response when a call doesn't pass its own timeout
+DEFAULT_TIMEOUT = (10, 60)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    `HTTPAdapter` that applies a default timeout to requests sent without one, so a stuck socket can't hang the
+    caller. A `timeout` passed to the request itself still wins.
+
+    With a [`RetryPolicy`][retry.RetryPolicy], every request waits for its turn under the policy's rate limit
+    before it is sent.
+    """
+
+    def __init__(self, *args, timeout=DEFAULT_TIMEOUT, policy: RetryPolicy = None, **kwargs):
+        self.timeout = timeout
+        self.policy = policy
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        if self.policy is not None:
+            self.policy.wait()
+        return super().send(request, **kwargs)
+
+
 def requests_retry_session(retries=3,
                            backoff_factor=1,
                            status_forcelist=(405, 500, 502, 504),
                            session=None,
-                           allowed_methods=frozenset(['GET', 'POST', 'PUT', 'DELETE'])):
+                           allowed_methods=frozenset(['GET', 'POST', 'PUT', 'DELETE']),
+                           pool_connections: int = 10,
+                           pool_maxsize: int = 10,
+                           pool_block: bool = False,
+                           timeout=DEFAULT_TIMEOUT,
+                           adapter: HTTPAdapter = None,
+                           policy: RetryPolicy = None):
     """
     Method for http retries
+
+    Arguments:
+        pool_connections: How many hosts to keep a connection pool for.
+        pool_maxsize: Most connections kept alive per host. Should be at least the number of threads sharing the
+            session, otherwise connections are thrown away and opened again.
+        pool_block: Wait for a free connection when `pool_maxsize` are in use, instead of opening an extra one
+            that isn't kept.
+        timeout: Default `(connect, read)` timeout in seconds, or a single number for both. None waits forever.
+        adapter: Transport adapter to mount instead of the default one. The other arguments are ignored if given.
+        policy: [`RetryPolicy`][retry.RetryPolicy] deciding the retries, backoff and rate limit. Replaces
+            `retries`, `backoff_factor`, `status_forcelist` and `allowed_methods` if given.
     """
     session = session or requests.session()
-    retry = Retry(
-        total=retries,
-        read=retries,
-        connect=retries,
-        backoff_factor=backoff_factor,
-        status_forcelist=status_forcelist,
-        allowed_methods=allowed_methods
-    )
-    adapter = HTTPAdapter(max_retries=retry)
+    if adapter is None:
+        if policy is not None:
+            retry = policy.urllib3_retry()
+        else:
+            retry = Retry(
+                total=retries,
+                read=retries,
+                connect=retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=status_forcelist,
+                allowed_methods=allowed_methods
+            )
+        adapter = TimeoutHTTPAdapter(max_retries=retry, pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                     pool_block=pool_block, timeout=timeout, policy=policy)
     session.mount('http://', adapter)
     session.mount('https://', adapter)
+    # Ask for compressed responses in every encoding the session can decode
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
     return session
 
 
@@ -52,7 +105,12 @@ class OAuth2:
                  session=None,
                  env_key: str = None,
                  cache_path: str = '.token-oauth',
-                 check_cache: bool = True
+                 check_cache: bool = True,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 timeout=DEFAULT_TIMEOUT,
+                 adapter: HTTPAdapter = None,
+                 retry_policy: RetryPolicy = None
                  ):
         """
         Initialize the object.
@@ -67,6 +125,18 @@ class OAuth2:
             env_key: The environment variable name where the access token dictionary is stored as a string literal.
             cache_path: The desired path of the file where the access token information will be stored.
             check_cache: Whether to check the cache file for the access token information
+            pool_connections: How many hosts to keep a connection pool for. Ignored if `session` is passed.
+            pool_maxsize: Most connections kept alive per host. Raise it to at least the number of `workers`
+                used with methods that send requests in parallel. Ignored if `session` is passed.
+            timeout: Default `(connect, read)` timeout in seconds for every request, or a single number for both.
+                None waits forever. A `timeout` passed to a single request overrides it. Ignored if `session` is
+                passed.
+            adapter: A `requests` transport adapter to send every request through instead of the default pooled,
+                retrying one (for example an adapter for a proxy or another HTTP implementation). Ignored if
+                `session` is passed.
+            retry_policy: [`RetryPolicy`][retry.RetryPolicy] for every request -> jittered backoff, `Retry-After`
+                handling and an optional rate limit. Defaults to `RetryPolicy()`. Ignored if `session` or `adapter`
+                is passed.
 
         !!! examples
 
@@ -105,8 +175,17 @@ class OAuth2:
                 'Wed Nov 17 15:48:55 2021'}'
                 ```
         """
+        # Shared with the clients using this manager, so they draw from the same rate limit
+        self.retry_policy = None
+        if session is None and adapter is None:
+            self.retry_policy = retry_policy or RetryPolicy()
+
         # If a proper session is passed then we will just use the existing session
-        self.session = session or requests_retry_session()
+        self.session = session or requests_retry_session(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                                         timeout=timeout, adapter=adapter, policy=self.retry_policy)
+
+        # Functions called after every request, see hooks.py
+        self.hooks = RequestHooks()
 
         # Set the client_id
         self._client_id = client_id
@@ -244,7 +323,13 @@ class OAuth2:
             RunTimeError: If the request could not be completed.
         """
 
-        response = self.session.post(url, **kwargs)
+        token = self.hooks.started()
+        try:
+            response = self.session.post(url, **kwargs)
+        except Exception as error:
+            self.hooks.finished(token, 'POST', url, error=error)
+            raise
+        self.hooks.finished(token, 'POST', url, response)
         if response.status_code != 200:
             raise RuntimeError("POST request could not be completed")
 
@@ -0,0 +1,315 @@
+"""
+Compact records for the objects held in [`state`](api.md#state).
+
+A client created with `compact=True` stores tasks, projects, project folders and tags as the record classes below
+instead of plain dictionaries. Records behave like dictionaries -> `task['title']`, `task.get('tags')`, `'parentId'
+in task`, iteration and `==` against dictionaries all work, so [`get_by_fields`][api.TickTickClient.get_by_fields]
+and the managers work the same way.
+
+They take a fraction of the memory:
+
+- Known fields are stored in `__slots__` instead of a per object hash table.
+- Empty lists are not created until the field is first read.
+- Repeated values of enum-like fields (time zones, kinds, project ids, ...) are shared between records.
+
+Task records also have parsed views of their dates -> `task.start_dt`, `task.due_dt`, `task.modified_dt`,
+`task.created_dt` and `task.completed_dt` are UTC datetimes (or None), parsed on first use with
+[`parse_tick_tick_date`][helpers.time_methods.parse_tick_tick_date], which caches them.
+
+!!! warning
+    Records are not `dict` instances, so `json.dumps(task)` needs `json.dumps(task.to_dict())`. The client converts
+    them itself before sending requests.
+"""
+
+import sys
+from collections.abc import Mapping, MutableMapping
+
+from ticktick.helpers.time_methods import parse_tick_tick_date
+
+
+class _Absent:
+    """
+    Marks a field that the object does not have.
+    """
+    __slots__ = ()
+
+    def __repr__(self):
+        return '<absent>'
+
+
+class _EmptyList:
+    """
+    Marks a field holding an empty list that has not been read yet.
+    """
+    __slots__ = ()
+
+    def __repr__(self):
+        return '[]'
+
+
+_ABSENT = _Absent()
+_EMPTY_LIST = _EmptyList()
+
+# Ints shared between records -> ints above the small int cache would otherwise be a separate object per record
+_SHARED_INTS = {}
+
+# Most ints kept in _SHARED_INTS. Shared fields only hold a handful of distinct values (user ids, kinds, ...), so the
+# table fills up only when a field isn't enum-like after all -> later values are then left unshared
+MAX_SHARED_INTS = 1024
+
+
+def _share(value):
+    """
+    Returns a shared copy of `value` if it is a string or an int, else `value`.
+    """
+    if type(value) is str:
+        return sys.intern(value)
+    if type(value) is int:
+        shared = _SHARED_INTS.get(value)
+        if shared is not None:
+            return shared
+        if len(_SHARED_INTS) < MAX_SHARED_INTS:
+            _SHARED_INTS[value] = value
+    return value
+
+
+def _slot_names(fields: tuple) -> tuple:
+    """
+    Returns the slot names for `fields`. They are prefixed so fields like `items` don't hide the mapping methods.
+    """
+    return tuple('f_' + name for name in fields)
+
+
+class Record(MutableMapping):
+    """
+    Base class of the compact records. Subclasses list the fields they store in slots with `FIELDS`, and the fields
+    whose values should be shared with `SHARED`. Any other field goes into an overflow dictionary.
+    """
+
+    FIELDS = ()
+    SHARED = frozenset()
+    _SLOTS = {}
+
+    __slots__ = ('_extra',)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._SLOTS = dict(zip(cls.FIELDS, _slot_names(cls.FIELDS)))
+
+    def __init__(self, fields=(), **kwargs):
+        self._extra = None
+        for slot in self._SLOTS.values():
+            object.__setattr__(self, slot, _ABSENT)
+        self.update(fields, **kwargs)
+
+    def __getitem__(self, key):
+        slot = self._SLOTS.get(key)
+        if slot is not None:
+            value = getattr(self, slot)
+            if value is _ABSENT:
+                raise KeyError(key)
+            if value is _EMPTY_LIST:
+                value = []
+                object.__setattr__(self, slot, value)
+            return value
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        slot = self._SLOTS.get(key)
+        if slot is not None:
+            if type(value) is list and not value:
+                value = _EMPTY_LIST
+            elif key in self.SHARED:
+                value = _share(value)
+            object.__setattr__(self, slot, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        slot = self._SLOTS.get(key)
+        if slot is not None:
+            if getattr(self, slot) is _ABSENT:
+                raise KeyError(key)
+            object.__setattr__(self, slot, _ABSENT)
+        else:
+            if self._extra is None:
+                raise KeyError(key)
+            del self._extra[key]
+
+    def __contains__(self, key):
+        slot = self._SLOTS.get(key)
+        if slot is not None:
+            return getattr(self, slot) is not _ABSENT
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self):
+        for name, slot in self._SLOTS.items():
+            if getattr(self, slot) is not _ABSENT:
+                yield name
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        length = sum(1 for slot in self._SLOTS.values() if getattr(self, slot) is not _ABSENT)
+        return length + (len(self._extra) if self._extra is not None else 0)
+
+    def clear(self):
+        for slot in self._SLOTS.values():
+            object.__setattr__(self, slot, _ABSENT)
+        self._extra = None
+
+    def copy(self):
+        """
+        Returns a shallow copy of the record.
+        """
+        return type(self)(self.to_dict())
+
+    def to_dict(self) -> dict:
+        """
+        Returns the record as a plain dictionary, without creating the lists that haven't been read.
+        """
+        result = {}
+        for name, slot in self._SLOTS.items():
+            value = getattr(self, slot)
+            if value is _EMPTY_LIST:
+                result[name] = []
+            elif value is not _ABSENT:
+                result[name] = value
+        if self._extra is not None:
+            result.update(self._extra)
+        return result
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.to_dict()!r})'
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.__init__(state)
+
+
+class TaskRecord(Record):
+    """
+    Compact task object.
+    """
+    FIELDS = ('id', 'projectId', 'sortOrder', 'title', 'content', 'desc', 'startDate', 'dueDate', 'timeZone',
+              'isFloating', 'isAllDay', 'reminder', 'reminders', 'exDate', 'repeatFlag', 'repeatFrom', 'repeatTaskId',
+              'priority', 'status', 'items', 'progress', 'modifiedTime', 'etag', 'deleted', 'createdTime',
+              'creator', 'assignee', 'tags', 'kind', 'parentId', 'childIds', 'columnId', 'completedTime',
+              'completedUserId', 'commentCount', 'attachments', 'imgMode', 'focusSummaries', 'pomodoroSummaries')
+    SHARED = frozenset(('projectId', 'timeZone', 'repeatFlag', 'repeatFrom', 'kind', 'creator', 'assignee',
+                        'columnId', 'completedUserId', 'parentId'))
+    __slots__ = _slot_names(FIELDS)
+
+    @property
+    def start_dt(self):
+        """
+        `startDate` as a UTC datetime, or None.
+        """
+        return parse_tick_tick_date(self.get('startDate'))
+
+    @property
+    def due_dt(self):
+        """
+        `dueDate` as a UTC datetime, or None.
+        """
+        return parse_tick_tick_date(self.get('dueDate'))
+
+    @property
+    def modified_dt(self):
+        """
+        `modifiedTime` as a UTC datetime, or None.
+        """
+        return parse_tick_tick_date(self.get('modifiedTime'))
+
+    @property
+    def created_dt(self):
+        """
+        `createdTime` as a UTC datetime, or None.
+        """
+        return parse_tick_tick_date(self.get('createdTime'))
+
+    @property
+    def completed_dt(self):
+        """
+        `completedTime` as a UTC datetime, or None.
+        """
+        return parse_tick_tick_date(self.get('completedTime'))
+
+
+class ProjectRecord(Record):
+    """
+    Compact project object.
+    """
+    FIELDS = ('id', 'name', 'isOwner', 'color', 'inAll', 'sortOrder', 'sortType', 'userCount', 'etag',
+              'modifiedTime', 'closed', 'muted', 'transferred', 'groupId', 'viewMode', 'notificationOptions',
+              'teamId', 'permission', 'kind', 'timeline', 'needAudit', 'barcodeNeedAudit', 'openToTeam',
+              'teamMemberPermission', 'source')
+    SHARED = frozenset(('groupId', 'viewMode', 'teamId', 'permission', 'kind', 'sortType', 'source'))
+    __slots__ = _slot_names(FIELDS)
+
+
+class ProjectFolderRecord(Record):
+    """
+    Compact project folder object.
+    """
+    FIELDS = ('id', 'etag', 'name', 'showAll', 'sortOrder', 'deleted', 'userId', 'sortType', 'teamId', 'timeline')
+    SHARED = frozenset(('userId', 'sortType', 'teamId'))
+    __slots__ = _slot_names(FIELDS)
+
+
+class TagRecord(Record):
+    """
+    Compact tag object.
+    """
+    FIELDS = ('name', 'label', 'sortOrder', 'sortType', 'color', 'etag', 'parent', 'type')
+    SHARED = frozenset(('sortType', 'parent', 'type'))
+    __slots__ = _slot_names(FIELDS)
+
+
+RECORD_TYPES = {
+    'tasks': TaskRecord,
+    'projects': ProjectRecord,
+    'project_folders': ProjectFolderRecord,
+    'tags': TagRecord,
+}
+
+
+def to_record(search: str, obj):
+    """
+    Returns `obj` as the record type for `state[search]`, or unchanged if `search` has no record type or `obj`
+    is not a dictionary.
+
+    Arguments:
+        search: Key of the list in [`state`](api.md#state) the object belongs to.
+        obj: The object.
+    """
+    record_type = RECORD_TYPES.get(search)
+    if record_type is None or not isinstance(obj, dict):
+        return obj
+    return record_type(obj)
+
+
+def to_records(search: str, objects: list) -> list:
+    """
+    Returns a list of the objects as the record type for `state[search]`.
+    """
+    return [to_record(search, obj) for obj in objects]
+
+
+def to_plain(value):
+    """
+    Returns `value` with every record inside it replaced by a plain dictionary, so it can be serialized to json.
+    """
+    if isinstance(value, Record):
+        value = value.to_dict()
+    if isinstance(value, Mapping):
+        return {key: to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_plain(item) for item in value]
+    return value
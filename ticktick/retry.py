@@ -0,0 +1,302 @@
+"""
+Retry policy shared by the requests sent to TickTick.
+
+A [`RetryPolicy`][retry.RetryPolicy] decides which failed requests are sent again and how long to wait before each
+attempt:
+
+- Failures back off exponentially like urllib3's `backoff_factor` -> no wait before the first retry, then
+    `backoff * 2 ** attempt` seconds. With `jitter=True` the wait is random between 0 and `backoff * 2 ** attempt`
+    instead (full jitter), so clients that failed together don't retry together.
+- A `429 Too Many Requests` (or `503`) with a `Retry-After` header waits as long as the server asked.
+- An optional token bucket spaces out the requests of a client to at most `rate` per second, with bursts of up to
+    `burst` requests.
+
+The default policy retries like the session of earlier versions -> 3 retries of `405`, `500`, `502` and `504`
+responses with a `backoff_factor` of 1. The policy of a client is available as `client.retry_policy`, and its
+[`stats`][retry.RetryStats] report how much time was spent waiting.
+
+!!! example "Limiting A Client To 5 Requests Per Second"
+    ```python
+    from ticktick.retry import RetryPolicy
+
+    auth_client = OAuth2(client_id, client_secret, uri, retry_policy=RetryPolicy(rate=5, burst=10, jitter=True))
+    client = TickTickClient(username, password, auth_client)
+    ...
+    print(client.retry_policy.stats.as_dict())
+    ```
+"""
+
+import email.utils
+import random
+import threading
+import time
+
+from urllib3.util.retry import Retry
+
+# Statuses a Retry-After header is honored for
+RETRY_AFTER_STATUSES = frozenset([413, 429, 503])
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket. Every request takes a token, tokens come back at `rate` per second and at most
+    `burst` are kept.
+
+    Tokens are handed out even when the bucket is empty -> the caller is told how long to wait for its turn, so
+    concurrent callers queue up in the order they asked.
+    """
+
+    def __init__(self, rate: float, burst: float = None):
+        """
+        Arguments:
+            rate: Tokens added per second.
+            burst: Most tokens kept. Defaults to `rate`, or 1 if `rate` is lower.
+
+        Raises:
+            ValueError: If rate or burst are not positive.
+        """
+        if rate <= 0:
+            raise ValueError('Rate Must Be Positive')
+        if burst is None:
+            burst = max(1.0, rate)
+        if burst <= 0:
+            raise ValueError('Burst Must Be Positive')
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Takes a token.
+
+        Returns:
+            Seconds to wait before the token may be used, 0 if one was available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+
+class RetryStats:
+    """
+    Counters of a [`RetryPolicy`][retry.RetryPolicy].
+
+    Attributes:
+        retries: Requests sent again after a failure.
+        rate_limited: Retries caused by the server limiting the rate (`429` responses or a `Retry-After` header).
+        backoff_time: Seconds spent in jittered backoff.
+        throttled_time: Seconds spent waiting on `Retry-After` headers and the token bucket.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Sets every counter back to 0.
+        """
+        with self._lock:
+            self.retries = 0
+            self.rate_limited = 0
+            self.backoff_time = 0.0
+            self.throttled_time = 0.0
+
+    def as_dict(self) -> dict:
+        """
+        Returns the counters as a dictionary.
+        """
+        with self._lock:
+            return {'retries': self.retries, 'rate_limited': self.rate_limited,
+                    'backoff_time': self.backoff_time, 'throttled_time': self.throttled_time}
+
+    def _add_retry(self, delay: float, rate_limited: bool) -> None:
+        with self._lock:
+            self.retries += 1
+            if rate_limited:
+                self.rate_limited += 1
+                self.throttled_time += delay
+            else:
+                self.backoff_time += delay
+
+    def _add_throttle(self, delay: float) -> None:
+        with self._lock:
+            self.throttled_time += delay
+
+
+class RetryPolicy:
+    """
+    Decides which requests are retried and how long to wait before sending them. See the [module](retry.md)
+    documentation.
+
+    ??? info "Import Help"
+        ```python
+        from ticktick.retry import RetryPolicy
+        ```
+    """
+
+    def __init__(self,
+                 retries: int = 3,
+                 backoff: float = 1.0,
+                 max_backoff: float = 120.0,
+                 status_forcelist=(405, 500, 502, 504),
+                 allowed_methods=frozenset(['GET', 'POST', 'PUT', 'DELETE']),
+                 rate: float = None,
+                 burst: float = None,
+                 max_retry_after: float = 300.0,
+                 jitter: bool = False):
+        """
+        Arguments:
+            retries: Most times a request is sent again.
+            backoff: Base of the exponential backoff in seconds, like urllib3's `backoff_factor`. The wait before
+                retry `n` (from 0) is `backoff * 2 ** n`, except for the first retry which is sent straight away.
+            max_backoff: Largest backoff in seconds.
+            status_forcelist: Response statuses that are retried. Responses with a `Retry-After` header are also
+                retried if their status is `413`, `429` or `503`.
+            allowed_methods: Http methods that are retried.
+            rate: Most requests sent per second. None doesn't limit the rate.
+            burst: Requests that can be sent at once before `rate` applies. Defaults to `rate`.
+            max_retry_after: Longest `Retry-After` honored in seconds. Longer waits are cut to this.
+            jitter: Wait a random time between 0 and the exponential backoff instead of the backoff itself ->
+                recommended when many clients share an account. Add `429` and `503` to `status_forcelist` as well
+                to retry rate limited requests without a `Retry-After` header.
+
+        Raises:
+            ValueError: If retries is negative, or rate or burst are not positive.
+        """
+        if retries < 0:
+            raise ValueError('Retries Must Not Be Negative')
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.status_forcelist = frozenset(status_forcelist)
+        self.allowed_methods = frozenset(method.upper() for method in allowed_methods)
+        self.max_retry_after = max_retry_after
+        self.jitter = jitter
+        self.bucket = TokenBucket(rate, burst) if rate is not None else None
+        self.stats = RetryStats()
+
+    def backoff_time(self, attempt: int) -> float:
+        """
+        Returns the backoff for the retry numbered `attempt`, counting from 0.
+        """
+        cap = min(self.max_backoff, self.backoff * 2 ** attempt)
+        if self.jitter:
+            return random.uniform(0, cap)
+        # Same waits as urllib3's backoff_factor
+        return 0.0 if attempt == 0 else cap
+
+    def retry_after(self, headers) -> float:
+        """
+        Returns the seconds a `Retry-After` header asks to wait, capped at `max_retry_after`, or None if there is
+        no valid header. Both the number of seconds and the http date forms are understood.
+        """
+        value = headers.get('Retry-After') if headers is not None else None
+        if value is None:
+            return None
+        value = value.strip()
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                date = email.utils.parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+            if date is None or date.tzinfo is None:
+                return None
+            seconds = date.timestamp() - time.time()
+        return min(max(seconds, 0.0), self.max_retry_after)
+
+    def is_retry(self, method: str, status: int, has_retry_after: bool = False) -> bool:
+        """
+        Returns whether a response with `status` to a `method` request should be sent again.
+
+        Arguments:
+            method: Http method of the request.
+            status: Status of the response.
+            has_retry_after: Whether the response has a `Retry-After` header.
+        """
+        if method.upper() not in self.allowed_methods:
+            return False
+        return status in self.status_forcelist or (has_retry_after and status in RETRY_AFTER_STATUSES)
+
+    def retry_delay(self, attempt: int, status: int = None, headers=None) -> float:
+        """
+        Returns the seconds to wait before the retry numbered `attempt` (from 0) and records it in
+        [`stats`][retry.RetryStats].
+
+        Arguments:
+            attempt: Number of the retry.
+            status: Status of the failed response, None if no response was received.
+            headers: Headers of the failed response.
+        """
+        delay = self.retry_after(headers) if status in RETRY_AFTER_STATUSES else None
+        rate_limited = delay is not None or status == 429
+        if delay is None:
+            delay = self.backoff_time(attempt)
+        self.stats._add_retry(delay, rate_limited)
+        return delay
+
+    def throttle(self) -> float:
+        """
+        Takes a token from the bucket for a request about to be sent.
+
+        Returns:
+            Seconds to wait before sending it, 0 if the rate is not limited.
+        """
+        if self.bucket is None:
+            return 0.0
+        delay = self.bucket.reserve()
+        if delay:
+            self.stats._add_throttle(delay)
+        return delay
+
+    def wait(self) -> None:
+        """
+        Blocks until a request may be sent under the rate limit.
+        """
+        delay = self.throttle()
+        if delay:
+            time.sleep(delay)
+
+    def urllib3_retry(self) -> Retry:
+        """
+        Returns the urllib3 `Retry` that applies this policy to a `requests` session.
+        """
+        return _PolicyRetry(
+            total=self.retries,
+            read=self.retries,
+            connect=self.retries,
+            status_forcelist=self.status_forcelist,
+            allowed_methods=self.allowed_methods,
+            policy=self
+        )
+
+
+class _PolicyRetry(Retry):
+    """
+    urllib3 `Retry` that takes its waits from a [`RetryPolicy`][retry.RetryPolicy].
+    """
+
+    def __init__(self, *args, policy: RetryPolicy = None, **kwargs):
+        self.policy = policy
+        super().__init__(*args, **kwargs)
+
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.policy = self.policy
+        return retry
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        return self.policy.is_retry(method, status_code, has_retry_after)
+
+    def sleep(self, response=None):
+        status = response.status if response is not None else None
+        headers = response.headers if response is not None else None
+        time.sleep(self.policy.retry_delay(len(self.history) - 1, status, headers))
+        self.policy.wait()
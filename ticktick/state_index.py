@@ -0,0 +1,460 @@
+"""
+Lookup tables for the lists held in the [`state`](api.md#state) dictionary.
+"""
+
+import bisect
+import datetime
+from collections.abc import Mapping
+
+from ticktick.helpers.time_methods import parse_tick_tick_date
+
+
+class _Table:
+    """
+    Lookup tables for a single list in `state`.
+    """
+
+    def __init__(self, objects: list):
+        # The list the tables were built from and its length at that time. Holding the reference keeps
+        # identity checks safe -> a replaced list can never be mistaken for this one.
+        self.objects = objects
+        self.length = len(objects)
+        self.by_id = {}
+        self.by_etag = {}
+        # id(object) -> sequence number increasing in list order, so objects can be put back in their place in
+        # the buckets below
+        self.order = {}
+        self._next = 0
+        # field -> {key -> [objects in list order]}, built the first time the field is queried. None marks a field
+        # holding values that can't be hashed, which has to be scanned instead.
+        self.secondary = {}
+        # Interval index over the dates of the objects, built on the first date range query and dropped whenever
+        # an object is added or removed
+        self.intervals = None
+        for obj in objects:
+            self.add(obj)
+
+    def matches(self, objects: list) -> bool:
+        """
+        Whether the tables still describe `objects`.
+        """
+        return self.objects is objects and self.length == len(objects)
+
+    def add(self, obj) -> None:
+        """
+        Adds an object appended to the list to the tables. The first object seen for a key wins, like a linear
+        search would.
+        """
+        if not isinstance(obj, Mapping):
+            return
+        self.order[id(obj)] = self._next
+        self._next += 1
+        self.file(obj)
+
+    def discard(self, obj) -> None:
+        """
+        Removes the object from the tables if it is the one stored for its keys.
+        """
+        if not isinstance(obj, Mapping):
+            return
+        self.unfile(obj)
+        self.order.pop(id(obj), None)
+
+    def discard_many(self, objs: list) -> None:
+        """
+        Removes all of `objs` from the tables, filtering every affected bucket once.
+        """
+        objs = [obj for obj in objs if isinstance(obj, Mapping)]
+        self.intervals = None
+        removed = {}
+        for obj in objs:
+            if self.by_id.get(obj.get('id')) is obj:
+                del self.by_id[obj['id']]
+            if self.by_etag.get(obj.get('etag')) is obj:
+                del self.by_etag[obj['etag']]
+            for field, buckets in self.secondary.items():
+                if buckets is None or field not in obj:
+                    continue
+                for key in _bucket_keys(obj[field]) or ():
+                    removed.setdefault((field, key), set()).add(id(obj))
+
+        for (field, key), ids in removed.items():
+            buckets = self.secondary.get(field)
+            if buckets is None:
+                continue
+            bucket = buckets.get(key, [])
+            kept = [item for item in bucket if id(item) not in ids]
+            if len(bucket) - len(kept) != len(ids):
+                # A field was edited in place, so some objects are filed under keys we can't work out
+                del self.secondary[field]
+            elif kept:
+                buckets[key] = kept
+            else:
+                del buckets[key]
+        for obj in objs:
+            self.order.pop(id(obj), None)
+
+    def file(self, obj) -> None:
+        """
+        Files an object the tables already know the position of under its current keys.
+        """
+        self.intervals = None
+        if 'id' in obj:
+            self.by_id.setdefault(obj['id'], obj)
+        if 'etag' in obj:
+            self.by_etag.setdefault(obj['etag'], obj)
+        for field, buckets in self.secondary.items():
+            if buckets is None or field not in obj:
+                continue
+            keys = _bucket_keys(obj[field])
+            if keys is None:
+                self.secondary[field] = None
+                continue
+            for key in keys:
+                bucket = buckets.setdefault(key, [])
+                bucket.insert(self._position(bucket, obj), obj)
+
+    def unfile(self, obj) -> None:
+        """
+        Takes the object out of the tables, keeping its position so it can be filed again.
+        """
+        self.intervals = None
+        if self.by_id.get(obj.get('id')) is obj:
+            del self.by_id[obj['id']]
+        if self.by_etag.get(obj.get('etag')) is obj:
+            del self.by_etag[obj['etag']]
+        if id(obj) not in self.order:
+            # Never filed, so it is in none of the buckets
+            return
+        for field, buckets in list(self.secondary.items()):
+            if buckets is None or field not in obj:
+                continue
+            for key in _bucket_keys(obj[field]) or ():
+                bucket = buckets.get(key, [])
+                position = self._position(bucket, obj)
+                if position == len(bucket) or bucket[position] is not obj:
+                    # The field was edited in place, so the object is filed under a key we can't work out
+                    del self.secondary[field]
+                    break
+                del bucket[position]
+                if not bucket:
+                    del buckets[key]
+
+    def _position(self, bucket: list, obj) -> int:
+        """
+        Returns where `obj` is, or belongs, in `bucket` by list order.
+        """
+        order = self.order
+        sequence = order[id(obj)]
+        low, high = 0, len(bucket)
+        if not high or order[id(bucket[-1])] < sequence:
+            # Appended objects go last
+            return high
+        while low < high:
+            middle = (low + high) // 2
+            if order[id(bucket[middle])] < sequence:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def buckets(self, field: str):
+        """
+        Returns the `key -> objects` table for `field`, building it if needed, or None if the field can't be
+        indexed.
+        """
+        if field not in self.secondary:
+            buckets = {}
+            for obj in self.objects:
+                if not isinstance(obj, Mapping) or field not in obj:
+                    continue
+                keys = _bucket_keys(obj[field])
+                if keys is None:
+                    buckets = None
+                    break
+                for key in keys:
+                    buckets.setdefault(key, []).append(obj)
+            self.secondary[field] = buckets
+        return self.secondary[field]
+
+
+class _Intervals:
+    """
+    Static interval index -> the intervals sorted by start, with a max tree over their ends. Finding the intervals
+    that overlap a range takes O(log n) plus O(log n) per interval found.
+    """
+
+    def __init__(self, intervals: list):
+        # (start, end, object), already sorted by start
+        self.starts = [start for start, end, obj in intervals]
+        self.objects = [obj for start, end, obj in intervals]
+        self.size = 1
+        while self.size < len(intervals):
+            self.size *= 2
+        # Leaves hold the ends, every other node the latest end below it
+        self.tree = [datetime.datetime.min] * (2 * self.size)
+        for position, (start, end, obj) in enumerate(intervals):
+            self.tree[self.size + position] = end
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def overlapping(self, start: datetime.datetime, end: datetime.datetime) -> list:
+        """
+        Returns the objects whose interval overlaps `[start, end]`, ordered by their start.
+        """
+        # Only intervals that start before the range ends can overlap it
+        count = bisect.bisect_right(self.starts, end)
+        found = []
+        # Depth first, left to right -> results come out in start order
+        stack = [(1, 0, self.size)]
+        while stack:
+            node, low, high = stack.pop()
+            if low >= count or self.tree[node] < start:
+                continue
+            if node >= self.size:
+                found.append(self.objects[low])
+                continue
+            middle = (low + high) // 2
+            stack.append((2 * node + 1, middle, high))
+            stack.append((2 * node, low, middle))
+        return found
+
+
+def _task_interval(obj):
+    """
+    Returns the UTC `(start, end)` a task covers, or None if it has no dates. A task with only one date covers that
+    moment. The due date of an all day task is the start of the next day, so it is excluded.
+    """
+    try:
+        start = parse_tick_tick_date(obj.get('startDate'))
+        end = parse_tick_tick_date(obj.get('dueDate'))
+    except (TypeError, ValueError):
+        return None
+    if start is None:
+        start = end
+    if start is None:
+        return None
+    if end is None or end < start:
+        end = start
+    elif obj.get('isAllDay') and end > start:
+        end -= datetime.timedelta(microseconds=1)
+    return start, end
+
+
+def _bucket_keys(value):
+    """
+    Returns the keys an object whose field holds `value` is filed under, or None if `value` can't be hashed.
+
+    Lists are filed under each of their elements so that multi valued fields like `tags` can be searched by any
+    element. The first key is always the one an equality search for `value` looks in.
+    """
+    try:
+        if isinstance(value, list):
+            if not value:
+                return [('empty',)]
+            return list(dict.fromkeys(('item', item) for item in value))
+        hash(value)
+    except TypeError:
+        return None
+    return [('value', value)]
+
+
+class StateIndex:
+    """
+    Keeps `id -> object` and `etag -> object` tables for every list in the client's `state` dictionary so lookups
+    don't have to walk the lists. Fields that are searched often, like a task's `projectId` or a tag's `name`, also
+    get `value -> objects` tables for [`get_by_fields`][api.TickTickClient.get_by_fields].
+
+    Tables are built lazily the first time a list is searched and are rebuilt whenever the list is replaced (like
+    [`sync`][api.TickTickClient.sync] does) or its length changes. Changes made through
+    [`add`][state_index.StateIndex.add], [`discard`][state_index.StateIndex.discard] and
+    [`replace`][state_index.StateIndex.replace] are applied to the tables directly.
+
+    !!! warning
+        Editing the `id`, `etag` or another indexed field of an object inside `state` by hand is not tracked. Call
+        [`invalidate`][state_index.StateIndex.invalidate] afterwards.
+    """
+
+    FIELDS = ('id', 'etag')
+
+    # Fields of each `state` list that get_by_fields can answer from an index
+    SECONDARY_FIELDS = {
+        'tasks': ('id', 'projectId', 'parentId', 'tags', 'status'),
+        'projects': ('id', 'groupId', 'name'),
+        'project_folders': ('id', 'name'),
+        'tags': ('name', 'parent', 'label'),
+    }
+
+    def __init__(self, client_class):
+        # ._client is a reference to the original client_class
+        self._client = client_class
+        self._tables = {}
+
+    def _table(self, search: str):
+        """
+        Returns the up to date table for `state[search]`, or None if it is not a list.
+        """
+        objects = self._client.state.get(search)
+        if not isinstance(objects, list):
+            self._tables.pop(search, None)
+            return None
+
+        table = self._tables.get(search)
+        if table is None or not table.matches(objects):
+            table = _Table(objects)
+            self._tables[search] = table
+        return table
+
+    def _stale_by(self, search: str, change: int):
+        """
+        Returns the table for `state[search]` if the only difference from the list is a length change of `change`.
+        Any other table for the list is dropped, since it can't be patched safely.
+        """
+        table = self._tables.get(search)
+        objects = self._client.state.get(search)
+        if table is None:
+            return None
+        if table.objects is not objects or table.length + change != len(objects):
+            del self._tables[search]
+            return None
+        return table
+
+    def lookup(self, search: str, field: str, value):
+        """
+        Returns the object in `state[search]` whose `field` equals `value`.
+
+        Arguments:
+            search: Key of the list in `state`.
+            field: 'id' or 'etag'.
+            value: The value to look for.
+
+        Returns:
+            The object if found, else None.
+        """
+        if field not in self.FIELDS:
+            raise ValueError(f"Field '{field}' Is Not Indexed")
+
+        table = self._table(search)
+        if table is None:
+            return None
+
+        found = getattr(table, 'by_' + field).get(value)
+        if found is not None and found.get(field) != value:
+            # The object was edited in place -> rebuild once and try again
+            self.invalidate(search)
+            table = self._table(search)
+            found = getattr(table, 'by_' + field).get(value)
+        return found
+
+    def candidates(self, search: str, fields: dict):
+        """
+        Returns the objects in `state[search]` that could match all of `fields`, in list order, using the most
+        selective index that fits. Every object that matches is included, but not every object included matches.
+
+        Arguments:
+            search: Key of the list in `state`.
+            fields: The field values being searched for.
+
+        Returns:
+            A list of objects, or None if no index fits and the list has to be scanned.
+        """
+        indexed = [field for field in self.SECONDARY_FIELDS.get(search, ()) if field in fields]
+        if not indexed:
+            return None
+        table = self._table(search)
+        if table is None:
+            return None
+
+        best = None
+        for field in indexed:
+            buckets = table.buckets(field)
+            keys = _bucket_keys(fields[field])
+            if buckets is None or keys is None:
+                continue
+            bucket = buckets.get(keys[0], [])
+            if best is None or len(bucket) < len(best):
+                best = bucket
+        return best
+
+    def overlapping(self, search: str, start: datetime.datetime, end: datetime.datetime) -> list:
+        """
+        Returns the tasks in `state[search]` whose dates overlap the UTC range `[start, end]`, ordered by start
+        date. The interval index is built on the first call after `state[search]` changed.
+
+        Arguments:
+            search: Key of a list of tasks in `state`.
+            start: Start of the range, UTC with no time zone information attached.
+            end: End of the range, UTC with no time zone information attached.
+
+        Returns:
+            A list of tasks.
+        """
+        table = self._table(search)
+        if table is None:
+            return []
+        if table.intervals is None:
+            intervals = []
+            for obj in table.objects:
+                interval = _task_interval(obj) if isinstance(obj, Mapping) else None
+                if interval is not None:
+                    intervals.append((interval[0], interval[1], obj))
+            # Stable -> objects with the same start stay in list order
+            intervals.sort(key=lambda interval: interval[0])
+            table.intervals = _Intervals(intervals)
+        return table.intervals.overlapping(start, end)
+
+    def add(self, search: str, obj) -> None:
+        """
+        Records that `obj` was appended to `state[search]`.
+        """
+        table = self._stale_by(search, 1)
+        if table is not None:
+            table.add(obj)
+            table.length += 1
+
+    def discard(self, search: str, obj) -> None:
+        """
+        Records that `obj` was removed from `state[search]`.
+        """
+        self.discard_all(search, [obj])
+
+    def discard_all(self, search: str, objs: list) -> None:
+        """
+        Records that all of `objs` were removed from `state[search]`.
+        """
+        table = self._stale_by(search, -len(objs))
+        if table is not None:
+            if len(objs) > 1:
+                table.discard_many(objs)
+            else:
+                for obj in objs:
+                    table.discard(obj)
+            table.length -= len(objs)
+
+    def replace(self, search: str, obj, fields) -> None:
+        """
+        Replaces the contents of `obj`, an object in `state[search]`, with `fields` and updates the tables. The
+        object keeps its identity and its position in the list.
+        """
+        table = self._stale_by(search, 0)
+        if table is not None and id(obj) not in table.order:
+            # Not an object of the list the table was built from
+            self.invalidate(search)
+            table = None
+        if table is not None:
+            table.unfile(obj)
+        obj.clear()
+        obj.update(fields)
+        if table is not None:
+            # Filed back at its place in the list, so the buckets stay in list order
+            table.file(obj)
+
+    def invalidate(self, search: str = None) -> None:
+        """
+        Drops the tables for `state[search]`, or for every list if `search` is not specified. They are rebuilt on
+        the next lookup.
+        """
+        if search is None:
+            self._tables = {}
+        else:
+            self._tables.pop(search, None)